@@ -2,13 +2,29 @@ import random
 import numpy as np
 from collections import deque, defaultdict
 
+from inference import FrontierInference
+from planner import DStarLitePlanner, frontier_search
+from state_encoding import world_state
+from storage import AgentKnowledgeArray, SparseAgentKnowledge, STORAGE_ENGINES
+from vector_env import PERCEPT_BITS
+
 class WumpusAgent:
-    def __init__(self, world):
+    def __init__(self, world, storage=None):
         self.world = world
+        self.storage = storage or getattr(world, 'storage', 'dict')
+        if self.storage not in STORAGE_ENGINES:
+            raise ValueError(f"Unknown storage engine: {self.storage}")
         self.visited = set([(0, 0)])
         self.safe_cells = set([(0, 0)])
+        # Safe but unvisited cells, kept in step with the two sets above
+        self.frontier = set()
         self.planned_path = []
+        # Incremental planner and the cells whose move cost changed since it last ran
+        self._planner = None
+        self._planned_from = None
+        self._changed_cells = set()
         self.knowledge_base = self._init_knowledge_base()
+        self.inference = FrontierInference(world.grid_size)
         self.action_history = []
         
         # Training and metrics
@@ -26,7 +42,57 @@ class WumpusAgent:
         self.exploration_rate = 0.3
         self.conservatism = 0.5  # 0=risk neutral, 1=extremely cautious
 
+    def reset(self):
+        """Start a new episode in the (already reset) world, reusing this agent.
+
+        Sets, knowledge base and metrics are cleared in place, and the
+        inference cache carries over. Hyperparameters such as conservatism
+        are kept.
+        """
+        self.visited.clear()
+        self.visited.add((0, 0))
+        self.safe_cells.clear()
+        self.safe_cells.add((0, 0))
+        self.frontier.clear()
+        self.planned_path = []
+        self._planner = None
+        self._planned_from = None
+        self._changed_cells.clear()
+        self._reset_knowledge_base()
+        self.inference.reset()
+        self.action_history.clear()
+        action_counts = self.metrics['action_counts']
+        action_counts.clear()
+        self.metrics.clear()
+        self.metrics.update(cells_explored=0, safe_moves=0, risky_moves=0, gold_grabbed=0,
+                            wumpus_shots=0, total_reward=0, action_counts=action_counts)
+        return self
+
+    def _reset_knowledge_base(self):
+        kb = self.knowledge_base
+        if isinstance(kb, AgentKnowledgeArray):
+            kb.pit_prob.fill(0.2)
+            kb.wumpus_prob.fill(1.0 / (self.world.grid_size ** 2 - 1))
+            kb.flags.fill(0)
+            kb.pit_prob[0, 0] = 0.0
+            kb.wumpus_prob[0, 0] = 0.0
+            return
+        if isinstance(kb, SparseAgentKnowledge):
+            kb.clear()
+            return
+        wumpus_prior = 1.0 / (self.world.grid_size ** 2 - 1)
+        for cell in kb.values():
+            cell['pit_prob'] = 0.2
+            cell['wumpus_prob'] = wumpus_prior
+            cell['visited'] = False
+        kb[(0, 0)]['pit_prob'] = 0.0
+        kb[(0, 0)]['wumpus_prob'] = 0.0
+
     def _init_knowledge_base(self):
+        if self.storage == 'array':
+            return AgentKnowledgeArray(self.world.grid_size)
+        if self.storage == 'sparse':
+            return SparseAgentKnowledge(self.world.grid_size)
         kb = {}
         for x in range(self.world.grid_size):
             for y in range(self.world.grid_size):
@@ -41,15 +107,21 @@ class WumpusAgent:
         x, y = self.world.agent_pos
         self.visited.add((x, y))
         self.safe_cells.add((x, y))
+        self.frontier.discard((x, y))
         self.knowledge_base[(x, y)]['visited'] = True
-        self.knowledge_base[(x, y)]['pit_prob'] = 0.0
-        self.knowledge_base[(x, y)]['wumpus_prob'] = 0.0
+        self._set_belief((x, y), 'pit_prob', 0.0)
+        self._set_belief((x, y), 'wumpus_prob', 0.0)
 
         # Update based on current percepts
+        stench = self.world.percepts['stench'] and self.world.wumpus_alive
         if not self.world.percepts['breeze']:
             self._mark_adjacent_pit_free(x, y)
-        if not self.world.percepts['stench']:
+        if not stench:
             self._mark_adjacent_wumpus_free(x, y)
+        self.inference.observe((x, y), self.world.percepts['breeze'], stench)
+        if not self.world.wumpus_alive:
+            self.inference.kill_wumpus()
+        self._apply_posteriors()
             
         # Update metrics
         self._update_metrics()
@@ -58,17 +130,41 @@ class WumpusAgent:
         for dx, dy in [(0,1), (1,0), (0,-1), (-1,0)]:
             nx, ny = x + dx, y + dy
             if 0 <= nx < self.world.grid_size and 0 <= ny < self.world.grid_size:
-                self.knowledge_base[(nx, ny)]['pit_prob'] = 0.0
+                self._set_belief((nx, ny), 'pit_prob', 0.0)
                 if self.knowledge_base[(nx, ny)]['wumpus_prob'] == 0:
-                    self.safe_cells.add((nx, ny))
+                    self._mark_safe((nx, ny))
 
     def _mark_adjacent_wumpus_free(self, x, y):
         for dx, dy in [(0,1), (1,0), (0,-1), (-1,0)]:
             nx, ny = x + dx, y + dy
             if 0 <= nx < self.world.grid_size and 0 <= ny < self.world.grid_size:
-                self.knowledge_base[(nx, ny)]['wumpus_prob'] = 0.0
+                self._set_belief((nx, ny), 'wumpus_prob', 0.0)
                 if self.knowledge_base[(nx, ny)]['pit_prob'] == 0:
-                    self.safe_cells.add((nx, ny))
+                    self._mark_safe((nx, ny))
+
+    def _apply_posteriors(self):
+        """Copy frontier posteriors into the knowledge base"""
+        for pos, prob in self.inference.pit_posteriors().items():
+            self._set_belief(pos, 'pit_prob', prob)
+        for pos, prob in self.inference.wumpus_posteriors().items():
+            self._set_belief(pos, 'wumpus_prob', prob)
+            if prob == 0 and self.knowledge_base[pos]['pit_prob'] == 0:
+                self._mark_safe(pos)
+
+    def _mark_safe(self, pos):
+        self.safe_cells.add(pos)
+        if pos not in self.visited:
+            self.frontier.add(pos)
+
+    def _set_belief(self, pos, key, value):
+        """Write a probability, remembering the cell for the incremental planner"""
+        cell = self.knowledge_base[pos]
+        if isinstance(self.knowledge_base, AgentKnowledgeArray):
+            # Compare at the stored float32 precision, or every rewrite reads as a change
+            value = float(np.float32(value))
+        if cell[key] != value:
+            cell[key] = value
+            self._changed_cells.add(pos)
 
     def _update_metrics(self):
         x, y = self.world.agent_pos
@@ -126,60 +222,71 @@ class WumpusAgent:
         return False
 
     def _plan_path_home(self):
-        path = self._find_path((0, 0))
+        path = self._replan((0, 0))
         if path:
             return self._next_move_from_path(path)
         return None
 
     def _explore(self):
-        # Find safest unexplored cell
-        target = self._select_exploration_target()
-        if target:
-            path = self._find_path(target)
-            if path:
-                return self._next_move_from_path(path)
+        # Cheapest reachable unexplored cell, with the first step of its path
+        choice = self._select_exploration_target()
+        if choice:
+            target, first_step = choice
+            return self._next_move_from_path([first_step])
         return None
 
+    def _replan(self, target):
+        """Path to target from the incremental planner.
+
+        The planner keeps its search tree while the goal stays the same, so a
+        step along planned_path or a few changed cells only repair part of it.
+        """
+        start = self.world.agent_pos
+        if self._planner is None or self._planner.goal != target:
+            self._planner = DStarLitePlanner(self.world.grid_size, target, self._cost_lookup())
+        elif not self._changed_cells:
+            # Nothing changed: stay on the current path without touching the planner
+            if start == self._planned_from:
+                return self.planned_path
+            if self.planned_path and start == self.planned_path[0]:
+                self._planned_from = start
+                self.planned_path = self.planned_path[1:]
+                return self.planned_path
+        else:
+            self._planner.update_cells(self._changed_cells)
+        self._changed_cells.clear()
+        self._planned_from = start
+        self.planned_path = self._planner.plan(start) or []
+        return self.planned_path
+
     def _select_exploration_target(self):
-        unexplored = [pos for pos in self.safe_cells if pos not in self.visited]
-        if not unexplored:
+        """Pick the unexplored safe cell with the cheapest path.
+
+        A single flood from the agent gives distance, risk-weighted cost and
+        first step for every candidate, so the choice trades distance against
+        the risk along the way. Returns (target, first_step) or None.
+        """
+        if not self.frontier:
             return None
-            
-        # Select target with lowest risk
-        return min(unexplored, 
-                  key=lambda p: self.knowledge_base[p]['pit_prob'] + self.knowledge_base[p]['wumpus_prob'])
 
-    def _find_path(self, target):
-        """A* pathfinding with risk awareness"""
-        start = self.world.agent_pos
-        open_set = {start}
-        came_from = {}
-        
-        g_score = defaultdict(lambda: float('inf'))
-        g_score[start] = 0
-        
-        f_score = defaultdict(lambda: float('inf'))
-        f_score[start] = self._heuristic(start, target)
-        
-        while open_set:
-            current = min(open_set, key=lambda p: f_score[p])
-            
-            if current == target:
-                return self._reconstruct_path(came_from, current)
-                
-            open_set.remove(current)
-            
-            for neighbor in self._get_neighbors(current):
-                tentative_g = g_score[current] + self._move_cost(current, neighbor)
-                
-                if tentative_g < g_score[neighbor]:
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g
-                    f_score[neighbor] = tentative_g + self._heuristic(neighbor, target)
-                    if neighbor not in open_set:
-                        open_set.add(neighbor)
-                        
-        return None
+        reachable = frontier_search(self.world.agent_pos, self.frontier, self.world.grid_size,
+                                    cost=self._cost_lookup())
+        if not reachable:
+            return None
+        target = min(reachable, key=lambda p: (reachable[p][1], reachable[p][0], p))
+        return target, reachable[target][2]
+
+    def _cost_lookup(self):
+        """Callable giving _move_cost into a cell from its flat index"""
+        kb = self.knowledge_base
+        if isinstance(kb, AgentKnowledgeArray):
+            # Read the probability grids directly instead of through cell views
+            pit, wumpus = kb.pit_prob.ravel(), kb.wumpus_prob.ravel()
+            return lambda idx: 1 + 10 * self.conservatism * float(pit[idx] + wumpus[idx])
+        n = self.world.grid_size
+        if isinstance(kb, SparseAgentKnowledge):
+            return lambda idx: 1 + 10 * self.conservatism * kb.risk(divmod(idx, n))
+        return lambda idx: self._move_cost(None, divmod(idx, n))
 
     def _move_cost(self, pos1, pos2):
         """Cost function considering risk"""
@@ -187,12 +294,6 @@ class WumpusAgent:
         risk = self.knowledge_base[pos2]['pit_prob'] + self.knowledge_base[pos2]['wumpus_prob']
         return base_cost + (10 * risk * self.conservatism)
 
-    def _heuristic(self, pos, target):
-        """Manhattan distance with small noise for exploration"""
-        dx = abs(pos[0] - target[0])
-        dy = abs(pos[1] - target[1])
-        return dx + dy + random.uniform(0, 0.1)
-
     def _get_neighbors(self, pos):
         x, y = pos
         neighbors = []
@@ -202,14 +303,6 @@ class WumpusAgent:
                 neighbors.append((nx, ny))
         return neighbors
 
-    def _reconstruct_path(self, came_from, current):
-        path = []
-        while current in came_from:
-            path.append(current)
-            current = came_from[current]
-        path.reverse()
-        return path
-
     def _next_move_from_path(self, path):
         if len(path) < 1:
             return None
@@ -271,9 +364,13 @@ class WumpusAgent:
             self.world.agent_dir,
             int(self.world.has_gold),
             int(self.world.has_arrow),
-            tuple(self.world.percepts.values())
+            tuple(self.world.percepts[name] for name in PERCEPT_BITS)
         )
 
+    def get_state_index(self):
+        """get_state_representation() as a dense integer (see state_encoding)"""
+        return world_state(self.world)
+
     def receive_reward(self, reward):
         """Allow the agent to process rewards during training"""
         self.metrics['total_reward'] += reward
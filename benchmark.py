@@ -0,0 +1,284 @@
+import argparse
+import itertools
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from agent import WumpusAgent
+from headless import apply_action
+from storage import STORAGE_ENGINES
+from wumpus_world import WumpusWorld
+
+DEFAULT_SIZES = (4, 16, 64, 256)
+
+
+def _world(grid_size, storage, seed=0):
+    return WumpusWorld(grid_size=grid_size, storage=storage, seed=seed)
+
+
+def _walk(world):
+    """Move forward, turning away from walls so the walk keeps going"""
+    if not world.move_forward():
+        world.turn_right()
+
+
+class _Walk:
+    """Seeded play through successive episodes, so timed calls keep seeing
+    new states. A finished (or overlong) episode carries on in the next
+    seeded world, with the agent reset alongside it."""
+
+    ACTIONS = ('forward', 'forward', 'turn_left', 'turn_right', 'grab', 'shoot')
+
+    def __init__(self, grid_size, storage, agent=False, max_steps=200):
+        self.seeds = itertools.count()
+        self.world = _world(grid_size, storage, seed=next(self.seeds))
+        self.agent = WumpusAgent(self.world) if agent else None
+        self.rng = random.Random(0)
+        self.max_steps = max_steps
+        self.steps = 0
+
+    def act(self, action=None):
+        """Take an action, a random one by default"""
+        apply_action(self.world, action or self.rng.choice(self.ACTIONS))
+        self.steps += 1
+        if self.world.is_game_over() != "continue" or self.steps >= self.max_steps:
+            self.world.reset(next(self.seeds))
+            self.steps = 0
+            if self.agent is not None:
+                self.agent.reset()
+
+
+# Each case maps (grid_size, storage) to a zero-argument callable, built
+# outside the timed region. The callable is one measured operation. A case
+# may instead return a (step, op) pair: step runs untimed before every op,
+# to move on to a state op has not seen yet.
+
+def case_world_get_percepts(grid_size, storage):
+    world = _world(grid_size, storage)
+    return world.get_percepts
+
+
+def case_world_move_forward(grid_size, storage):
+    world = _world(grid_size, storage)
+    return lambda: _walk(world)
+
+
+def case_world_update_knowledge_base(grid_size, storage):
+    walk = _Walk(grid_size, storage)
+    return walk.act, walk.world.update_knowledge_base
+
+
+def case_world_rederive_knowledge_base(grid_size, storage):
+    # What update_knowledge_base saves: deriving the knowledge base again
+    # from every cell observed so far in the episode
+    walk = _Walk(grid_size, storage)
+    scratch = _world(grid_size, storage)
+    layout = walk.world.layout()
+    observed = {(0, 0): dict(walk.world.percepts)}
+
+    def step():
+        nonlocal layout
+        walk.act()
+        if walk.steps == 0:
+            layout = walk.world.layout()
+            observed.clear()
+        observed[walk.world.agent_pos] = dict(walk.world.percepts)
+
+    def rederive():
+        scratch.reset(cells=layout)
+        for pos, percepts in observed.items():
+            scratch.agent_pos, scratch.percepts = pos, percepts
+            scratch.update_knowledge_base()
+    return step, rederive
+
+
+def case_agent_update_knowledge(grid_size, storage):
+    walk = _Walk(grid_size, storage, agent=True)
+    agent = walk.agent
+    agent.update_knowledge()
+    return lambda: walk.act(agent.decide_action()), agent.update_knowledge
+
+
+def case_agent_decide_action(grid_size, storage):
+    walk = _Walk(grid_size, storage, agent=True)
+    agent = walk.agent
+    agent.update_knowledge()
+    decided = []
+
+    def step():
+        # Play the last timed decision and observe where it led
+        if decided:
+            walk.act(decided.pop())
+            agent.update_knowledge()
+    return step, lambda: decided.append(agent.decide_action())
+
+
+def case_agent_replan_home(grid_size, storage):
+    # D* Lite repairs the path home as the beliefs change along the walk
+    walk = _Walk(grid_size, storage, agent=True)
+    agent = walk.agent
+    agent.update_knowledge()
+
+    def step():
+        # Act until the agent moves, so each plan starts somewhere new
+        start = walk.world.agent_pos
+        for _ in range(8):
+            walk.act(agent.decide_action())
+            agent.update_knowledge()
+            if walk.world.agent_pos != start:
+                break
+    return step, lambda: agent._replan((0, 0))
+
+
+def case_trainer_episode(grid_size, storage):
+    from trainer_agent import WumpusAgentTrainer
+
+    trainer = WumpusAgentTrainer(grid_size=grid_size, num_episodes=1, metrics_dir=None)
+    heatmap = np.zeros((grid_size, grid_size))
+    seeds = iter(range(1 << 30))
+
+    def episode():
+        world = _world(grid_size, storage, seed=next(seeds))
+        agent = WumpusAgent(world)
+        agent.conservatism = trainer.hyperparams['conservatism']
+        trainer._run_episode(world, agent, trainer.hyperparams['initial_exploration'], heatmap)
+    return episode
+
+
+CASES = {
+    'world.get_percepts': case_world_get_percepts,
+    'world.move_forward': case_world_move_forward,
+    'world.update_knowledge_base': case_world_update_knowledge_base,
+    'world.rederive_knowledge_base': case_world_rederive_knowledge_base,
+    'agent.update_knowledge': case_agent_update_knowledge,
+    'agent.decide_action': case_agent_decide_action,
+    'agent._replan': case_agent_replan_home,
+    'trainer.episode': case_trainer_episode,
+}
+
+
+def _prepare(make_op, grid_size, storage):
+    """(step, op) for a case, with a no-op step if it has none"""
+    op = make_op(grid_size, storage)
+    if isinstance(op, tuple):
+        return op
+    return (lambda: None), op
+
+
+def measure(make_op, grid_size, storage, min_time, min_iterations=5, max_iterations=100_000):
+    """Time one case; returns ops/sec, latency percentiles and peak memory"""
+    random.seed(0)
+    step, op = _prepare(make_op, grid_size, storage)
+    step()
+    op()  # Warm-up
+
+    timings = []
+    deadline = time.perf_counter() + min_time
+    while len(timings) < max_iterations and (len(timings) < min_iterations or
+                                            time.perf_counter() < deadline):
+        step()
+        start = time.perf_counter_ns()
+        op()
+        timings.append(time.perf_counter_ns() - start)
+
+    # Memory is traced in a separate, short pass so tracing doesn't skew timings
+    step, op = _prepare(make_op, grid_size, storage)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    for _ in range(min(min_iterations, len(timings))):
+        step()
+        op()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+
+    timings = np.array(timings, dtype=np.float64)
+    return {
+        'iterations': len(timings),
+        'ops_per_sec': 1e9 / timings.mean(),
+        'p50_us': float(np.percentile(timings, 50)) / 1e3,
+        'p99_us': float(np.percentile(timings, 99)) / 1e3,
+        'peak_memory_bytes': int(peak),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(cases, sizes, storage, min_time):
+    results = []
+    for name in cases:
+        for grid_size in sizes:
+            result = {'name': name, 'grid_size': grid_size, 'storage': storage,
+                      **measure(CASES[name], grid_size, storage, min_time)}
+            print(f"{name:30s} n={grid_size:<4d} {result['ops_per_sec']:>12.1f} ops/s  "
+                  f"p50 {result['p50_us']:>10.1f} us  p99 {result['p99_us']:>10.1f} us  "
+                  f"peak {result['peak_memory_bytes'] / 1024:>9.1f} KiB")
+            results.append(result)
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'commit': _git_commit(),
+        },
+        'results': results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """Print cases whose throughput dropped by more than `threshold`; returns their count"""
+    previous = {(r['name'], r['grid_size'], r['storage']): r for r in baseline['results']}
+    regressions = 0
+    for result in report['results']:
+        old = previous.get((result['name'], result['grid_size'], result['storage']))
+        if old is None:
+            continue
+        change = result['ops_per_sec'] / old['ops_per_sec'] - 1
+        if change < -threshold:
+            regressions += 1
+            print(f"REGRESSION {result['name']} n={result['grid_size']}: {change:+.1%} ops/s")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the Wumpus World hot paths")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), default=list(CASES))
+    parser.add_argument('--storage', choices=STORAGE_ENGINES, default='dict')
+    parser.add_argument('--min-time', type=float, default=0.5,
+                        help="seconds to spend timing each case")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="earlier JSON report to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative ops/s drop that counts as a regression")
+    args = parser.parse_args(argv)
+
+    report = run(args.cases, args.sizes, args.storage, args.min_time)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import glob
+import os
+import pickle
+import queue
+import re
+import threading
+
+import numpy as np
+
+
+def write_atomic(path, payload):
+    """Pickle payload to path through a temp file, so readers never see a partial file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class CheckpointWriter:
+    """Writes checkpoints on a background thread.
+
+    save() only queues the payload, so the caller must not mutate it
+    afterwards. At most max_pending checkpoints wait in the queue; beyond
+    that save() blocks until the writer catches up. A failed write is raised
+    from the next save(), flush() or close().
+    """
+
+    def __init__(self, max_pending=4):
+        self._queue = queue.Queue(max_pending)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def save(self, path, payload):
+        self._raise_error()
+        self._queue.put((path, payload))
+
+    def flush(self):
+        """Wait until everything queued so far is on disk"""
+        self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                write_atomic(*item)
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+
+def load_training_metrics(directory="saved_models"):
+    """Rebuild the per-episode training columns from a run's delta checkpoints.
+
+    Each agent_episode_<n>.pkl holds the rows of episodes [first_episode, n)
+    as one array per column; the result maps each column to one array.
+    Deltas are chained from episode 0 and the chain stops at the first gap,
+    so leftovers from an older, longer run are not mixed in.
+    """
+    checkpoints = []
+    for path in glob.glob(os.path.join(directory, "agent_episode_*.pkl")):
+        match = re.search(r"agent_episode_(\d+)\.pkl$", path)
+        if match:
+            checkpoints.append((int(match.group(1)), path))
+
+    series = {}
+    episodes = 0
+    for _, path in sorted(checkpoints):
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        if data.get('first_episode') != episodes:
+            break
+        for key, rows in data['training_metrics_delta'].items():
+            series.setdefault(key, []).append(rows)
+        episodes = data['episode']
+    return {key: np.concatenate(parts) for key, parts in series.items()}
@@ -0,0 +1,135 @@
+"""Single entry point: python cli.py {train,eval,play,bench} [options].
+
+Only argparse is imported up front. Each subcommand imports what it needs
+when it is chosen, so e.g. `eval` never loads pygame or matplotlib. Pass
+--startup-time to print how long it took to get to the actual work.
+"""
+import argparse
+import sys
+import time
+
+_START = time.perf_counter()
+
+
+# Each loader does the subcommand's imports and returns the function that runs it
+
+def _load_train(args):
+    from trainer_agent import WumpusAgentTrainer
+
+    def run():
+        trainer = WumpusAgentTrainer(grid_size=args.grid_size, num_episodes=args.episodes,
+                                     seed=args.seed, world_bank=args.world_bank,
+                                     trace_path=args.trace)
+        if args.q_learning:
+            trainer.train_q_learning(num_envs=args.envs, replay=not args.no_replay)
+        else:
+            trainer.train(workers=args.workers)
+    return run
+
+
+def _load_eval(args):
+    from headless import load_agent_data, run_headless
+
+    def run():
+        agent_data = None
+        if args.model:
+            try:
+                agent_data = load_agent_data(args.model)
+            except Exception as e:
+                print(f"Error loading agent: {e}")
+                return 1
+        run_headless(args.episodes, agent_data, grid_size=args.grid_size,
+                     max_steps=args.max_steps, seed=args.seed, trace_path=args.trace)
+    return run
+
+
+def _load_play(args):
+    import pygame
+
+    if args.replay:
+        from episode_trace import TraceReader
+        from visualization import GameVisualization
+
+        def run():
+            episode = TraceReader(args.replay)[args.episode]
+            GameVisualization(episode.frame(0)).replay(episode, speed=args.speed)
+            pygame.quit()
+        return run
+    if args.model:
+        from run_agent import run_trained_agent
+        return lambda: run_trained_agent(args.model, args.sim_rate)
+    from main import play
+    return lambda: play(args.sim_rate)
+
+
+def _load_bench(args):
+    import benchmark
+    return lambda: benchmark.main(args.bench_args)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Wumpus World agent")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="print the time spent starting up (imports included) to stderr")
+    parser.add_argument("--startup-only", action="store_true",
+                        help="do the imports for the command, then exit (for measuring startup)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train = commands.add_parser("train", help="train the agent")
+    train.add_argument("--episodes", type=int, default=1000)
+    train.add_argument("--grid-size", type=int, default=4)
+    train.add_argument("--seed", type=int, default=None)
+    train.add_argument("--workers", type=int, default=1)
+    train.add_argument("--q-learning", action="store_true",
+                       help="learn a Q-table on the vector environment instead")
+    train.add_argument("--envs", type=int, default=4096,
+                       help="worlds stepped together with --q-learning")
+    train.add_argument("--no-replay", action="store_true",
+                       help="with --q-learning, learn from fresh transitions only")
+    train.add_argument("--world-bank", default=None, help="world bank file to draw worlds from")
+    train.add_argument("--trace", default=None, help="append every episode to this trace file")
+    train.set_defaults(load=_load_train)
+
+    evaluate = commands.add_parser("eval", help="run episodes headless and print a summary")
+    evaluate.add_argument("--model", default=None, help="saved agent to load (e.g. "
+                                                        "saved_models/final_agent.pkl)")
+    evaluate.add_argument("--episodes", type=int, default=100)
+    evaluate.add_argument("--grid-size", type=int, default=4)
+    evaluate.add_argument("--max-steps", type=int, default=200)
+    evaluate.add_argument("--seed", type=int, default=None)
+    evaluate.add_argument("--trace", default=None, help="append every episode to this trace file")
+    evaluate.set_defaults(load=_load_eval)
+
+    play = commands.add_parser("play", help="watch the agent in a pygame window")
+    play.add_argument("--model", default=None, help="saved agent to run")
+    play.add_argument("--sim-rate", type=float, default=None,
+                      help="step on a separate thread at this many steps/s (0 = unlimited)")
+    play.add_argument("--replay", default=None, help="replay an episode from a trace file")
+    play.add_argument("--episode", type=int, default=0, help="episode index to replay")
+    play.add_argument("--speed", type=float, default=5.0, help="replay speed in steps/s")
+    play.set_defaults(load=_load_play)
+
+    # Everything after "bench" goes to benchmark.main, --help included
+    bench = commands.add_parser("bench", help="run the microbenchmarks (options as benchmark.py)",
+                                add_help=False)
+    bench.set_defaults(load=_load_bench)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == "bench":
+        args.bench_args = extra[1:] if extra[:1] == ["--"] else extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    run = args.load(args)
+    if args.startup_time:
+        print(f"startup: {(time.perf_counter() - _START) * 1e3:.1f} ms", file=sys.stderr)
+    if args.startup_only:
+        return 0
+    return run() or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
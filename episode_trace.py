@@ -0,0 +1,260 @@
+import argparse
+import os
+import struct
+
+import numpy as np
+
+from storage import PIT, WUMPUS, GOLD
+from vector_env import (ACTION_IDS, ACTIONS, DIRECTION_IDS, DIRECTIONS, PERCEPT_BITS, GRAB, SHOOT,
+                        STENCH, BREEZE, SCREAM, WIN, LOSE, TIMEOUT, percepts_to_dict)
+
+MAGIC = b"WUMPTRCE"
+VERSION = 1
+FILE_HEADER = struct.Struct("<8sI")  # magic, version
+# Per episode: tag, episode number, seed (-1 if none), grid size, frames, status
+EPISODE_TAG = b"EPIS"
+EPISODE_HEADER = struct.Struct("<4sIqHIB")
+# Per frame: the action that led to it, then the agent state and percepts it produced
+STEP = np.dtype([("action", "u1"), ("x", "<u2"), ("y", "<u2"), ("dir", "u1"), ("percepts", "u1")])
+_STEP = struct.Struct("<BHHBB")
+NO_ACTION = 255  # Action of the initial frame
+STATUS_CODES = {"win": WIN, "lose": LOSE}
+STATUS_NAMES = {WIN: "win", LOSE: "lose", TIMEOUT: "timeout"}
+
+
+class TraceWriter:
+    """Append-only writer of episode traces.
+
+    An episode is the world layout plus one 7-byte frame per step (action,
+    position, direction, percept bits). Frames are collected in memory and
+    the whole episode goes out as one block through a buffered file when it
+    ends, so a crash can only lose the episode in progress. `target` is a
+    path, or a binary file object that receives the episode blocks only
+    (e.g. a BytesIO whose contents are later passed to write_raw).
+    """
+
+    def __init__(self, target, buffer_size=1 << 20):
+        if isinstance(target, (str, os.PathLike)):
+            new = not os.path.exists(target) or os.path.getsize(target) == 0
+            self._file = open(target, "ab", buffering=buffer_size)
+            self._owns_file = True
+            if new:
+                self._file.write(FILE_HEADER.pack(MAGIC, VERSION))
+        else:
+            self._file = target
+            self._owns_file = False
+        self._frames = bytearray()
+        self._count = 0
+        self._episode = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def begin_episode(self, world, episode=0, seed=None):
+        """Start an episode; records the layout and the initial frame"""
+        self._episode = (episode, -1 if seed is None else seed, world.grid_size,
+                         world.layout().tobytes())
+        self._frames.clear()
+        self._count = 0
+        self.record(world, None)
+
+    def record(self, world, action):
+        """Record the world state right after `action` was carried out"""
+        x, y = world.agent_pos
+        percepts = world.percepts
+        bits = 0
+        for name, bit in PERCEPT_BITS.items():
+            if percepts[name]:
+                bits |= bit
+        self._frames += _STEP.pack(NO_ACTION if action is None else ACTION_IDS[action],
+                                   x, y, DIRECTION_IDS[world.agent_dir], bits)
+        self._count += 1
+
+    def end_episode(self, status):
+        """Write the episode; status is "win", "lose" or anything else for a timeout"""
+        episode, seed, grid_size, layout = self._episode
+        self._file.write(EPISODE_HEADER.pack(EPISODE_TAG, episode, seed, grid_size, self._count,
+                                             STATUS_CODES.get(status, TIMEOUT)))
+        self._file.write(layout)
+        self._file.write(self._frames)
+        self._episode = None
+
+    def write_raw(self, blocks):
+        """Append episode blocks produced by another writer"""
+        self._file.write(blocks)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+class TraceReader:
+    """Memory-mapped reader of a trace file; trace[i] is the i-th episode.
+
+    A partially written last episode is ignored.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._data = data = np.memmap(path, dtype=np.uint8, mode="r")
+        if len(data) < FILE_HEADER.size:
+            raise ValueError(f"{path} is not an episode trace")
+        magic, version = FILE_HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an episode trace")
+        if version != VERSION:
+            raise ValueError(f"Unsupported trace version: {version}")
+
+        self._index = []
+        offset = FILE_HEADER.size
+        while offset + EPISODE_HEADER.size <= len(data):
+            tag, episode, seed, grid_size, count, status = EPISODE_HEADER.unpack_from(data, offset)
+            if tag != EPISODE_TAG:
+                raise ValueError(f"Corrupt trace at byte {offset}")
+            layout_at = offset + EPISODE_HEADER.size
+            frames_at = layout_at + grid_size * grid_size
+            end = frames_at + count * STEP.itemsize
+            if end > len(data):
+                break
+            self._index.append((episode, seed, grid_size, status, layout_at, frames_at, end))
+            offset = end
+
+    def __len__(self):
+        return len(self._index)
+
+    def __getitem__(self, i):
+        episode, seed, grid_size, status, layout_at, frames_at, end = self._index[i]
+        layout = self._data[layout_at:frames_at].reshape(grid_size, grid_size)
+        frames = self._data[frames_at:end].view(STEP)
+        return TraceEpisode(episode, None if seed < 0 else seed, STATUS_NAMES[status],
+                            layout, frames)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class TraceEpisode:
+    """One recorded episode; frame(i) rebuilds the world as it was at step i"""
+
+    def __init__(self, episode, seed, status, layout, frames):
+        self.episode = episode
+        self.seed = seed
+        self.status = status
+        self.layout = layout
+        self.frames = frames
+        self.grid_size = layout.shape[0]
+
+        n = self.grid_size
+        never = len(frames)
+        actions = frames["action"]
+        xs = frames["x"].astype(np.int64)
+        ys = frames["y"].astype(np.int64)
+        self._cells, self._first_visit = np.unique(xs * n + ys, return_index=True)
+        self._grabbed_at = _first(
+            (actions == GRAB) & ((layout[xs, ys] & GOLD) != 0), never)
+        self._shot_at = _first(actions == SHOOT, never)
+        self._killed_at = _first((frames["percepts"] & SCREAM) != 0, never)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def actions(self):
+        """Action names, one per frame (None for the initial frame)"""
+        return [None if a == NO_ACTION else ACTIONS[a] for a in self.frames["action"]]
+
+    def frame(self, i):
+        return TraceFrame(self, i)
+
+
+def _first(mask, default):
+    hits = np.flatnonzero(mask)
+    return int(hits[0]) if len(hits) else default
+
+
+class TraceFrame:
+    """World-like view of one frame of a TraceEpisode, drawable by GameVisualization"""
+
+    def __init__(self, episode, i):
+        n = episode.grid_size
+        frame = episode.frames[i]
+        self.step = i
+        self.grid_size = n
+        self.agent_pos = (int(frame["x"]), int(frame["y"]))
+        self.agent_dir = DIRECTIONS[frame["dir"]]
+        self.percepts = percepts_to_dict(frame["percepts"])
+        self.has_gold = i >= episode._grabbed_at
+        self.has_arrow = i < episode._shot_at
+        self.wumpus_alive = i < episode._killed_at
+
+        layout = episode.layout
+        self.world = [[{"pit": bool(layout[x, y] & PIT),
+                        "wumpus": bool(layout[x, y] & WUMPUS),
+                        "gold": bool(layout[x, y] & GOLD) and not self.has_gold}
+                       for y in range(n)] for x in range(n)]
+
+        cells = episode._cells[episode._first_visit <= i]
+        self.visited = {(int(c) // n, int(c) % n) for c in cells}
+        seen = episode.frames[:i + 1]
+        percepts = seen["percepts"]
+        self.stenchy_cells = {(int(f["x"]), int(f["y"])) for f in seen[(percepts & STENCH) != 0]}
+        self.breezy_cells = {(int(f["x"]), int(f["y"])) for f in seen[(percepts & BREEZE) != 0]}
+        # Safe as far as the percepts go: visited, or next to a cell with neither
+        # a breeze nor (while the Wumpus lives) a stench
+        self.safe_cells = set(self.visited)
+        for x, y in self.visited:
+            if (x, y) in self.breezy_cells:
+                continue
+            if self.wumpus_alive and (x, y) in self.stenchy_cells:
+                continue
+            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if 0 <= nx < n and 0 <= ny < n:
+                    self.safe_cells.add((nx, ny))
+
+    def is_game_over(self):
+        x, y = self.agent_pos
+        cell = self.world[x][y]
+        if cell["pit"] or (cell["wumpus"] and self.wumpus_alive):
+            return "lose"
+        if self.has_gold and self.agent_pos == (0, 0):
+            return "win"
+        return "continue"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or replay an episode trace")
+    parser.add_argument("path")
+    parser.add_argument("--episode", type=int, default=None,
+                        help="replay this episode (index in the file); lists episodes if omitted")
+    parser.add_argument("--speed", type=float, default=5.0, help="replay speed in steps/s")
+    parser.add_argument("--start", type=int, default=0, help="step to start the replay at")
+    args = parser.parse_args()
+
+    trace = TraceReader(args.path)
+    if args.episode is None:
+        for i, episode in enumerate(trace):
+            seed = "-" if episode.seed is None else episode.seed
+            print(f"{i:6d}  episode {episode.episode:6d}  seed {seed}  "
+                  f"{episode.grid_size}x{episode.grid_size}  {len(episode) - 1:4d} steps  "
+                  f"{episode.status}")
+        return
+
+    import pygame
+    from visualization import GameVisualization
+
+    episode = trace[args.episode]
+    game = GameVisualization(episode.frame(0))
+    game.replay(episode, speed=args.speed, start=args.start)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
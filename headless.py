@@ -0,0 +1,125 @@
+import copy
+import pickle
+import time
+from collections import Counter
+
+from agent import WumpusAgent
+from wumpus_world import WumpusWorld
+
+
+def apply_action(world, action):
+    """Carry out one of the agent's actions on the world"""
+    if action == "forward":
+        world.move_forward()
+    elif action == "turn_left":
+        world.turn_left()
+    elif action == "turn_right":
+        world.turn_right()
+    elif action == "grab":
+        world.grab_gold()
+    elif action == "shoot":
+        world.shoot_arrow()
+    elif action == "climb":
+        world.climb()
+
+
+def step_agent(world, agent):
+    """One decide_action -> action -> update_knowledge step; returns the action"""
+    action = agent.decide_action()
+    apply_action(world, action)
+    agent.update_knowledge()
+    return action
+
+
+def load_agent_data(model_path="saved_models/final_agent.pkl"):
+    with open(model_path, 'rb') as f:
+        return pickle.load(f)
+
+
+def make_agent(world, agent_data=None):
+    """Agent for a world, primed with a saved model's knowledge if given.
+    A Q-learning model gives a QTableAgent playing its table greedily."""
+    if agent_data is not None and 'q_table' in agent_data:
+        from q_learning import QTableAgent
+        return QTableAgent(world, agent_data)
+    agent = WumpusAgent(world)
+    if agent_data is not None:
+        agent.knowledge_base = copy.deepcopy(agent_data['knowledge_base'])
+        if 'hyperparameters' in agent_data:
+            agent.conservatism = agent_data['hyperparameters'].get('conservatism', 0.5)
+    return agent
+
+
+def reset_agent(agent, agent_data=None):
+    """Reset an agent from make_agent for the next episode of its (reset) world"""
+    agent.reset()
+    if agent_data is not None and 'knowledge_base' in agent_data:
+        agent.knowledge_base = copy.deepcopy(agent_data['knowledge_base'])
+    return agent
+
+
+def run_episode(world, agent, max_steps=200, trace=None):
+    """Play step_agent until the game ends, recording frames to `trace` if given
+    (an episode_trace.TraceWriter whose episode has been begun).
+
+    Returns (status, steps) where status is "win", "lose" or "timeout".
+    """
+    steps = 0
+    status = world.is_game_over()
+    while status == "continue" and steps < max_steps:
+        action = step_agent(world, agent)
+        if trace is not None:
+            trace.record(world, action)
+        steps += 1
+        status = world.is_game_over()
+    return ("timeout" if status == "continue" else status), steps
+
+
+def run_headless(episodes, agent_data=None, grid_size=4, max_steps=200, seed=None,
+                 trace_path=None):
+    """Run episodes without a display and print a win/loss/step summary.
+
+    With trace_path every episode is appended to that episode trace file.
+    """
+    trace = None
+    if trace_path:
+        from episode_trace import TraceWriter
+        trace = TraceWriter(trace_path)
+
+    outcomes = Counter()
+    total_steps = 0
+    start = time.perf_counter()
+    world = agent = None
+    for episode in range(episodes):
+        episode_seed = None if seed is None else (seed, episode)
+        if world is None:
+            world = WumpusWorld(grid_size=grid_size, seed=episode_seed)
+            agent = make_agent(world, agent_data)
+        else:
+            world.reset(episode_seed)
+            reset_agent(agent, agent_data)
+        if trace is not None:
+            trace.begin_episode(world, episode, seed)
+        status, steps = run_episode(world, agent, max_steps, trace)
+        if trace is not None:
+            trace.end_episode(status)
+        outcomes[status] += 1
+        total_steps += steps
+    elapsed = time.perf_counter() - start
+    if trace is not None:
+        trace.close()
+
+    summary = {
+        'episodes': episodes,
+        'wins': outcomes['win'],
+        'losses': outcomes['lose'],
+        'timeouts': outcomes['timeout'],
+        'mean_steps': total_steps / episodes if episodes else 0.0,
+        'steps_per_sec': total_steps / elapsed if elapsed > 0 else 0.0,
+    }
+    print(f"Episodes: {episodes} | "
+          f"Wins: {summary['wins']} ({summary['wins'] / max(episodes, 1):.1%}) | "
+          f"Losses: {summary['losses']} | Timeouts: {summary['timeouts']}")
+    print(f"Mean steps: {summary['mean_steps']:.1f} | "
+          f"{summary['steps_per_sec']:.0f} steps/s over {elapsed:.2f}s")
+    return summary
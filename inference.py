@@ -0,0 +1,222 @@
+import itertools
+from collections import OrderedDict
+
+import numpy as np
+
+# Components with more unknown cells than this fall back to an approximation
+MAX_EXACT_CELLS = 18
+# Solved component structures kept, least recently used first out
+CACHE_SIZE = 4096
+
+
+class FrontierInference:
+    """Posterior pit and Wumpus probabilities from observed breezes and stenches.
+
+    Pits are independent with probability pit_prior per cell and there is
+    exactly one Wumpus, uniformly placed away from (0, 0). Only the frontier
+    (unknown cells next to visited ones) is enumerated: breeze constraints
+    are split into connected components, each component is solved by
+    exhaustive (vectorised) enumeration, and component results are memoised
+    by their constraint structure, which repeats constantly as the agent
+    walks around. Cells away from the frontier keep their prior.
+
+    Components are kept between calls, and an observation only re-splits
+    and re-solves the components its breeze constraints touch.
+    """
+
+    def __init__(self, grid_size, pit_prior=0.2):
+        self.grid_size = grid_size
+        self.pit_prior = pit_prior
+        self.breezy = set()
+        self.stenchy = set()
+        self.pit_free = {(0, 0)}
+        self.wumpus_free = {(0, 0)}
+        self.boundary = set()  # Unknown cells next to an observed cell
+        self.wumpus_dead = False
+        self._observed = set()
+        self._constraints = {}  # Breezy cell -> its neighbours not known pit-free
+        self._components = {}  # id -> (cells, breezy cells)
+        self._component_of = {}  # Unknown cell -> id of its component
+        self._marginals = {}  # Unknown cell -> P(pit) from its component
+        self._dirty = set()  # Breezy cells whose constraint may have changed
+        self._ids = itertools.count()
+        self._cache = OrderedDict()
+
+    def reset(self):
+        """Forget all observations; solved components stay memoised for the next episode"""
+        self.breezy.clear()
+        self.stenchy.clear()
+        self.pit_free.clear()
+        self.pit_free.add((0, 0))
+        self.wumpus_free.clear()
+        self.wumpus_free.add((0, 0))
+        self.boundary.clear()
+        self.wumpus_dead = False
+        self._observed.clear()
+        self._constraints.clear()
+        self._components.clear()
+        self._component_of.clear()
+        self._marginals.clear()
+        self._dirty.clear()
+
+    def _neighbors(self, x, y):
+        n = self.grid_size
+        for nx, ny in ((x, y + 1), (x + 1, y), (x, y - 1), (x - 1, y)):
+            if 0 <= nx < n and 0 <= ny < n:
+                yield (nx, ny)
+
+    def observe(self, pos, breeze, stench):
+        """Record the percepts of a visited cell (repeat visits are ignored)"""
+        if pos in self._observed:
+            return
+        self._observed.add(pos)
+        neighbors = list(self._neighbors(*pos))
+        self._mark_pit_free([pos] if breeze else [pos] + neighbors)
+        self.wumpus_free.add(pos)
+        self.boundary.discard(pos)
+        if breeze:
+            self.breezy.add(pos)
+            self._dirty.add(pos)
+        if stench:
+            self.stenchy.add(pos)
+        else:
+            self.wumpus_free.update(neighbors)
+        self.boundary.update(c for c in neighbors if c not in self._observed)
+
+    def _mark_pit_free(self, cells):
+        """Rule out pits, flagging the breeze constraints that mention the cells"""
+        for cell in cells:
+            if cell not in self.pit_free:
+                self.pit_free.add(cell)
+                self._dirty.update(c for c in self._neighbors(*cell) if c in self.breezy)
+
+    def kill_wumpus(self):
+        self.wumpus_dead = True
+
+    def pit_posteriors(self):
+        """{cell: P(pit)} for every boundary cell"""
+        if self._dirty:
+            self._update_components()
+        posteriors = {cell: (0.0 if cell in self.pit_free else self.pit_prior)
+                      for cell in self.boundary}
+        posteriors.update(self._marginals)
+        return posteriors
+
+    def _update_components(self):
+        """Re-split and re-solve the components holding a changed breeze constraint.
+
+        Constraints only lose cells or get added, so every other component
+        keeps its cells and its solution.
+        """
+        touched, cells = set(self._dirty), set()
+        for pos in self._dirty:
+            cells.update(self._constraints.pop(pos, ()))
+            unknown = [c for c in self._neighbors(*pos) if c not in self.pit_free]
+            if unknown:
+                self._constraints[pos] = unknown
+                cells.update(unknown)
+            # else inconsistent evidence, nothing to explain it with
+        self._dirty.clear()
+        for cid in {self._component_of[c] for c in cells if c in self._component_of}:
+            old_cells, breezy = self._components.pop(cid)
+            touched.update(breezy)
+            for c in old_cells:
+                del self._component_of[c]
+                del self._marginals[c]
+        for cells, breezy in self._pit_components(touched):
+            cid = next(self._ids)
+            self._components[cid] = (cells, breezy)
+            constraints = [self._constraints[pos] for pos in breezy]
+            for cell, prob in zip(cells, self._solve_component(cells, constraints)):
+                self._component_of[cell] = cid
+                self._marginals[cell] = prob
+
+    def _pit_components(self, breezy):
+        """Split the breeze constraints of the given cells into groups that
+        share no unknown cell; yields (cells, breezy cells) per group"""
+        parent = {}
+
+        def find(c):
+            while parent[c] != c:
+                parent[c] = parent[parent[c]]
+                c = parent[c]
+            return c
+
+        breezy = [pos for pos in breezy if pos in self._constraints]
+        for pos in breezy:
+            unknown = self._constraints[pos]
+            for c in unknown:
+                parent.setdefault(c, c)
+            root = find(unknown[0])
+            for c in unknown[1:]:
+                parent[find(c)] = root
+
+        groups = {}
+        for pos in breezy:
+            groups.setdefault(find(self._constraints[pos][0]), []).append(pos)
+        for group in groups.values():
+            cells = sorted({c for pos in group for c in self._constraints[pos]})
+            yield cells, group
+
+    def _solve_component(self, cells, constraints):
+        index = {c: i for i, c in enumerate(cells)}
+        structure = tuple(sorted({tuple(sorted(index[c] for c in unknown))
+                                  for unknown in constraints}))
+        key = (len(cells), structure, self.pit_prior)
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+            return result
+        if len(cells) <= MAX_EXACT_CELLS:
+            result = self._enumerate(len(cells), structure)
+        else:
+            result = self._approximate(len(cells), structure)
+        self._cache[key] = result
+        if len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
+
+    def _enumerate(self, k, structure):
+        """Exact marginals: weigh every assignment that explains all breezes"""
+        p = self.pit_prior
+        assignments = np.arange(1 << k, dtype=np.uint32)
+        valid = np.ones(1 << k, dtype=bool)
+        for constraint in structure:
+            mask = sum(1 << i for i in constraint)
+            valid &= (assignments & mask) != 0
+        assignments = assignments[valid]
+        bits = ((assignments[:, None] >> np.arange(k, dtype=np.uint32)) & 1).astype(bool)
+        pits = bits.sum(axis=1)
+        weights = p ** pits * (1 - p) ** (k - pits)
+        total = weights.sum()
+        return tuple(float(x) for x in (weights @ bits) / total)
+
+    def _approximate(self, k, structure):
+        """Per-constraint posterior, taking the strongest one for each cell"""
+        p = self.pit_prior
+        result = [p] * k
+        for constraint in structure:
+            local = p / (1 - (1 - p) ** len(constraint))
+            for i in constraint:
+                result[i] = max(result[i], local)
+        return tuple(result)
+
+    def wumpus_posteriors(self):
+        """{cell: P(wumpus)} for every boundary cell"""
+        if self.wumpus_dead:
+            return {cell: 0.0 for cell in self.boundary}
+
+        if self.stenchy:
+            # The Wumpus is next to every stench, and not next to any clean cell
+            candidates = None
+            for pos in self.stenchy:
+                around = {c for c in self._neighbors(*pos) if c not in self.wumpus_free}
+                candidates = around if candidates is None else candidates & around
+            if candidates:
+                prob = 1.0 / len(candidates)
+                return {cell: (prob if cell in candidates else 0.0) for cell in self.boundary}
+
+        # No stench yet: uniform over every cell not ruled out
+        remaining = self.grid_size ** 2 - len(self.wumpus_free)
+        prob = 1.0 / remaining if remaining > 0 else 0.0
+        return {cell: (0.0 if cell in self.wumpus_free else prob) for cell in self.boundary}
@@ -0,0 +1,103 @@
+from collections import defaultdict
+
+
+class ClauseStore:
+    """Growing CNF knowledge base with watched-literal unit propagation.
+
+    Variables are positive ints and literals are +var / -var. Facts only
+    accumulate, so there is no backtracking: every assignment made here is
+    entailed by the clauses added so far. Each clause watches two literals
+    that are not false, and assigning a variable only visits the clauses
+    watching the literal it falsified, so adding a percept costs time
+    proportional to what it actually affects rather than to the whole board.
+    """
+
+    def __init__(self):
+        self.value = {}  # var -> bool
+        self.conflict = False
+        self._clauses = []
+        self._watches = defaultdict(list)  # literal -> ids of clauses watching it
+        self._queue = []
+
+    def clear(self):
+        """Forget every clause and assignment"""
+        self.value.clear()
+        self.conflict = False
+        self._clauses.clear()
+        self._watches.clear()
+        self._queue.clear()
+
+    def literal_value(self, lit):
+        """True/False if the literal is decided, else None"""
+        value = self.value.get(abs(lit))
+        if value is None:
+            return None
+        return value if lit > 0 else not value
+
+    def add_clause(self, literals):
+        """Add a disjunction and propagate.
+
+        Returns the literals that became true as a consequence (including a
+        unit clause's own literal). Contradictory clauses set `conflict` and
+        are otherwise ignored.
+        """
+        open_lits = []
+        for lit in dict.fromkeys(literals):
+            value = self.literal_value(lit)
+            if value:
+                return []  # Already satisfied
+            if value is None:
+                open_lits.append(lit)
+
+        if not open_lits:
+            self.conflict = True
+            return []
+        if len(open_lits) == 1:
+            return self._assign_and_propagate(open_lits[0])
+
+        clause_id = len(self._clauses)
+        self._clauses.append(open_lits)
+        self._watches[open_lits[0]].append(clause_id)
+        self._watches[open_lits[1]].append(clause_id)
+        return []
+
+    def _assign_and_propagate(self, lit):
+        derived = []
+        self._assign(lit, derived)
+        while self._queue:
+            self._propagate(-self._queue.pop(), derived)
+        return derived
+
+    def _assign(self, lit, derived):
+        self.value[abs(lit)] = lit > 0
+        derived.append(lit)
+        self._queue.append(lit)
+
+    def _propagate(self, false_lit, derived):
+        """Visit the clauses watching a literal that just became false"""
+        watching = self._watches.pop(false_lit, [])
+        keep = []
+        for clause_id in watching:
+            clause = self._clauses[clause_id]
+            # Keep the falsified watch in slot 1
+            if clause[0] == false_lit:
+                clause[0], clause[1] = clause[1], clause[0]
+            other = clause[0]
+            if self.literal_value(other):
+                keep.append(clause_id)
+                continue
+
+            # Look for a replacement watch that is not false
+            for j in range(2, len(clause)):
+                if self.literal_value(clause[j]) is not False:
+                    clause[1], clause[j] = clause[j], clause[1]
+                    self._watches[clause[1]].append(clause_id)
+                    break
+            else:
+                keep.append(clause_id)
+                if self.literal_value(other) is None:
+                    self._assign(other, derived)
+                else:
+                    self.conflict = True
+        if keep:
+            self._watches[false_lit].extend(keep)
@@ -1,15 +1,34 @@
 from wumpus_world import WumpusWorld
-from visualization import GameVisualization
 from agent import WumpusAgent
-from trainer_agent import AgentTrainer
-import pygame
+from headless import apply_action, run_headless, step_agent
+from functools import partial
+import argparse
 import sys
 
-def main():
+def play(sim_rate=None):
+    import pygame
+    from visualization import GameVisualization
+
     # Initialize game components
     world = WumpusWorld(grid_size=4)
     agent = WumpusAgent(world)
     game = GameVisualization(world)
+
+    if sim_rate is not None:
+        # Simulation on its own thread, drawn at 60 FPS
+        from simulation import Simulation
+
+        simulation = Simulation(world, partial(step_agent, world, agent), rate=sim_rate or None,
+                                metrics=lambda: {
+                                    'Cells Explored': agent.metrics['cells_explored'],
+                                    'Safe Moves': agent.metrics['safe_moves'],
+                                    'Risky Moves': agent.metrics['risky_moves'],
+                                })
+        status = game.run_simulation(simulation)
+        if status != "continue":
+            print(f"Game Over: {'Win!' if status == 'win' else 'Lose!'}")
+        pygame.quit()
+        sys.exit()
     
     # Game state control
     running = True
@@ -37,35 +56,12 @@ def main():
                         world.grab_gold()
                     elif event.key == pygame.K_s:
                         world.shoot_arrow()
-        def draw_metrics(self):
-            font = pygame.font.SysFont('Arial', 16)
-            metrics = [
-                f"Cells Explored: {self.agent.metrics['cells_explored']}",
-                f"Safe Moves: {self.agent.metrics['safe_moves_made']}",
-                f"Risky Moves: {self.agent.metrics['risky_moves_made']}",
-                f"Gold Found: {'Yes' if self.agent.metrics['gold_found'] else 'No'}"
-            ]
-    
-        for i, text in enumerate(metrics):
-            text_surface = font.render(text, True, (0, 0, 0))
-            self.screen.blit(text_surface, (10, 10 + i * 20))
-        
         # AI agent control
         if auto_play:
             action = agent.decide_action()
-            if action == "forward":
-                world.move_forward()
-            elif action == "turn_left":
-                world.turn_left()
-            elif action == "turn_right":
-                world.turn_right()
-            elif action == "grab":
-                world.grab_gold()
-            elif action == "shoot":
-                world.shoot_arrow()
-            elif action == "climb":
-                if world.has_gold and world.agent_pos == (0, 0):
-                    print("Agent climbed out with gold!")
+            apply_action(world, action)
+            if action == "climb" and world.has_gold and world.agent_pos == (0, 0):
+                print("Agent climbed out with gold!")
             
             agent.update_knowledge()
         
@@ -76,17 +72,15 @@ def main():
             running = False
         
         # Render the game
-        game.draw_world()
-        
-        # Display control mode
-        font = pygame.font.SysFont('Arial', 20)
-        mode_text = font.render(
-            f"Mode: {'AUTO' if auto_play else 'MANUAL'}",
-            True, 
-            (0, 0, 255))
-        game.screen.blit(mode_text, (10, 10))
+        game.draw_world(present=False)
+        game.draw_metrics({
+            'Mode': 'AUTO' if auto_play else 'MANUAL',
+            'Cells Explored': agent.metrics['cells_explored'],
+            'Safe Moves': agent.metrics['safe_moves'],
+            'Risky Moves': agent.metrics['risky_moves'],
+        })
         
-        pygame.display.flip()
+        game.present()
         clock.tick(5)  # Control game speed (5 FPS)
 
         
@@ -94,6 +88,29 @@ def main():
     pygame.quit()
     sys.exit()
 
+def main():
+    parser = argparse.ArgumentParser(description="Wumpus World")
+    parser.add_argument("--headless", action="store_true",
+                        help="run the agent at full speed without pygame and print a summary")
+    parser.add_argument("--episodes", type=int, default=100,
+                        help="episodes to run in headless mode")
+    parser.add_argument("--grid-size", type=int, default=4)
+    parser.add_argument("--max-steps", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--trace", default=None,
+                        help="append every headless episode to this episode trace file")
+    parser.add_argument("--sim-rate", type=float, default=None,
+                        help="step the agent on its own thread at this many steps/s "
+                             "(0 = unlimited) while drawing at 60 FPS")
+    args = parser.parse_args()
+
+    if args.headless:
+        run_headless(args.episodes, grid_size=args.grid_size,
+                     max_steps=args.max_steps, seed=args.seed,
+                     trace_path=args.trace)
+    else:
+        play(args.sim_rate)
+
 if __name__ == "__main__":
     main()
 
@@ -0,0 +1,399 @@
+import json
+import math
+import os
+from collections import Counter
+
+import numpy as np
+
+_ZERO = 1e-12  # Magnitudes below this count as zero in QuantileSketch
+
+
+class RunningStats:
+    """Count, mean, variance, min and max of a stream in O(1) memory (Welford)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def update(self, x):
+        x = float(x)
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    def update_many(self, values):
+        """Fold in a whole array at once (Chan et al.'s parallel update)"""
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        n = len(values)
+        mean = values.mean()
+        m2 = ((values - mean) ** 2).sum()
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean, 'std': self.std,
+                'min': self.min, 'max': self.max}
+
+
+class WindowedRate:
+    """Fraction of true values among the last `window` observations"""
+
+    def __init__(self, window=100):
+        self.window = window
+        self._values = np.zeros(window, dtype=np.uint8)
+        self._next = 0
+        self._count = 0
+        self._sum = 0
+
+    def update(self, value):
+        value = 1 if value else 0
+        self._sum += value - int(self._values[self._next])
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.window
+        self._count = min(self._count + 1, self.window)
+
+    @property
+    def rate(self):
+        return self._sum / self._count if self._count else 0.0
+
+
+class QuantileSketch:
+    """Streaming quantiles to within a relative error (a DDSketch-style sketch).
+
+    Values are counted in logarithmically sized buckets, so a quantile is
+    off by at most `relative_accuracy` of its value and memory only grows
+    with the logarithm of the value range. Unlike marker-based estimators it
+    copes with heavily tied values, such as episodes capped at the step limit.
+    """
+
+    def __init__(self, quantiles=(0.5, 0.9, 0.99), relative_accuracy=0.01):
+        self.quantiles = quantiles
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive = Counter()  # bucket index -> count
+        self._negative = Counter()  # same, for magnitudes of negative values
+        self._zeros = 0
+        self.count = 0
+
+    def _bucket(self, magnitude):
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, bucket):
+        return 2 * self._gamma ** bucket / (self._gamma + 1)
+
+    def update(self, x):
+        x = float(x)
+        self.count += 1
+        if x > _ZERO:
+            self._positive[self._bucket(x)] += 1
+        elif x < -_ZERO:
+            self._negative[self._bucket(-x)] += 1
+        else:
+            self._zeros += 1
+
+    def quantile(self, q):
+        if not self.count:
+            return float("nan")
+        rank = q * (self.count - 1)
+        seen = 0
+        for bucket in sorted(self._negative, reverse=True):
+            seen += self._negative[bucket]
+            if seen > rank:
+                return -self._value(bucket)
+        seen += self._zeros
+        if seen > rank:
+            return 0.0
+        for bucket in sorted(self._positive):
+            seen += self._positive[bucket]
+            if seen > rank:
+                return self._value(bucket)
+        return self._value(max(self._positive))
+
+    def to_dict(self):
+        return {f"p{q * 100:g}": self.quantile(q) for q in self.quantiles}
+
+
+class Downsampler:
+    """Constant-size min/mean/max summary of a series, for plotting.
+
+    Consecutive points are grouped into buckets of `width` points. Once
+    `capacity` buckets are full, neighbouring buckets are merged pairwise and
+    the width doubles, so memory stays fixed however long the series gets.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity - capacity % 2
+        self.width = 1
+        self.count = 0
+        self._sum = np.zeros(self.capacity)
+        self._min = np.zeros(self.capacity)
+        self._max = np.zeros(self.capacity)
+        self._counts = np.zeros(self.capacity, dtype=np.int64)
+        self._full = 0
+        self._reset_partial()
+
+    def _reset_partial(self):
+        self._p_sum = 0.0
+        self._p_min = float("inf")
+        self._p_max = float("-inf")
+        self._p_count = 0
+
+    def update(self, value):
+        value = float(value)
+        self.count += 1
+        self._p_sum += value
+        self._p_min = min(self._p_min, value)
+        self._p_max = max(self._p_max, value)
+        self._p_count += 1
+        if self._p_count < self.width:
+            return
+
+        i = self._full
+        self._sum[i] = self._p_sum
+        self._min[i] = self._p_min
+        self._max[i] = self._p_max
+        self._counts[i] = self._p_count
+        self._full += 1
+        self._reset_partial()
+        if self._full == self.capacity:
+            self._compact()
+
+    def _compact(self):
+        half = self.capacity // 2
+        self._sum[:half] = self._sum.reshape(half, 2).sum(axis=1)
+        self._min[:half] = self._min.reshape(half, 2).min(axis=1)
+        self._max[:half] = self._max.reshape(half, 2).max(axis=1)
+        self._counts[:half] = self._counts.reshape(half, 2).sum(axis=1)
+        self._full = half
+        self.width *= 2
+
+    def series(self):
+        """(x, mean, min, max) arrays, x being the centre index of each bucket"""
+        counts = self._counts[:self._full]
+        sums = self._sum[:self._full]
+        mins = self._min[:self._full]
+        maxs = self._max[:self._full]
+        if self._p_count:
+            counts = np.append(counts, self._p_count)
+            sums = np.append(sums, self._p_sum)
+            mins = np.append(mins, self._p_min)
+            maxs = np.append(maxs, self._p_max)
+        starts = np.cumsum(counts) - counts
+        return starts + (counts - 1) / 2, sums / np.maximum(counts, 1), mins, maxs
+
+
+class ColumnStore:
+    """Append-only table of per-episode columns kept on disk.
+
+    Rows are buffered in fixed-size chunks and each full chunk is appended
+    to one raw file per column, so memory is bounded by the chunk size.
+    A store opened on a directory that already holds the same columns
+    appends after the rows there; reset=True truncates them instead. Open
+    an existing store read-only with load_columns.
+    """
+
+    def __init__(self, directory, columns, chunk_size=1 << 16, reset=False):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.columns = {name: np.dtype(dtype) for name, dtype in columns.items()}
+        self.chunk_size = chunk_size
+        self._buffers = {name: np.empty(chunk_size, dtype=dtype)
+                         for name, dtype in self.columns.items()}
+        self._fill = 0
+        self._flushed = 0 if reset else self._existing_rows()
+        for name in self.columns:
+            # Cut every column to the same length, e.g. after a run died mid-flush
+            with open(self._path(name), 'ab') as f:
+                f.truncate(self._flushed * self.columns[name].itemsize)
+        with open(os.path.join(directory, "columns.json"), 'w') as f:
+            json.dump({name: dtype.str for name, dtype in self.columns.items()}, f)
+
+    def _existing_rows(self):
+        """Complete rows already in the directory (0 if it holds no store yet)"""
+        try:
+            with open(os.path.join(self.directory, "columns.json")) as f:
+                schema = json.load(f)
+        except FileNotFoundError:
+            return 0
+        if schema != {name: dtype.str for name, dtype in self.columns.items()}:
+            raise ValueError(f"{self.directory} holds different columns: {schema}")
+        return min((os.path.getsize(self._path(name)) // dtype.itemsize
+                    if os.path.exists(self._path(name)) else 0)
+                   for name, dtype in self.columns.items())
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def __len__(self):
+        return self._flushed + self._fill
+
+    def append(self, **row):
+        for name, value in row.items():
+            self._buffers[name][self._fill] = value
+        self._fill += 1
+        if self._fill == self.chunk_size:
+            self.flush()
+
+    def extend(self, **columns):
+        total = len(next(iter(columns.values())))
+        done = 0
+        while done < total:
+            take = min(self.chunk_size - self._fill, total - done)
+            for name, values in columns.items():
+                self._buffers[name][self._fill:self._fill + take] = values[done:done + take]
+            self._fill += take
+            done += take
+            if self._fill == self.chunk_size:
+                self.flush()
+
+    def flush(self):
+        if not self._fill:
+            return
+        for name, buffer in self._buffers.items():
+            with open(self._path(name), 'ab') as f:
+                f.write(buffer[:self._fill].tobytes())
+        self._flushed += self._fill
+        self._fill = 0
+
+    def read(self, name, start=0, stop=None):
+        """Rows [start, stop) of one column as an array"""
+        stop = len(self) if stop is None else min(stop, len(self))
+        dtype = self.columns[name]
+        parts = []
+        if start < self._flushed:
+            on_disk = np.memmap(self._path(name), dtype=dtype, mode='r', shape=(self._flushed,))
+            parts.append(np.array(on_disk[start:min(stop, self._flushed)]))
+        if stop > self._flushed:
+            parts.append(self._buffers[name][max(start - self._flushed, 0):stop - self._flushed].copy())
+        return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+
+def load_columns(directory):
+    """Memory-map every column a ColumnStore wrote to `directory` (after it was flushed)"""
+    with open(os.path.join(directory, "columns.json")) as f:
+        schema = json.load(f)
+    columns = {}
+    for name, dtype in schema.items():
+        path = os.path.join(directory, f"{name}.bin")
+        columns[name] = (np.memmap(path, dtype=dtype, mode='r') if os.path.getsize(path)
+                         else np.empty(0, dtype=dtype))
+    return columns
+
+
+# Raw per-episode columns of a training run
+EPISODE_COLUMNS = {
+    'reward': np.float32,
+    'steps': np.int32,
+    'gold': np.uint8,
+    'win': np.uint8,
+    'exploration': np.float32,
+}
+
+
+class TrainingMetrics:
+    """Per-episode training metrics in constant memory.
+
+    Keeps streaming aggregates (running mean/variance, quantile sketches,
+    a windowed success rate), downsampled series for plotting and, when a
+    directory is given, the raw rows in an on-disk ColumnStore. Rows go
+    after those of earlier runs in that directory; first_row is where this
+    run's start, and rows() counts from there.
+    """
+
+    def __init__(self, grid_size, directory=None, window=100, plot_points=1024,
+                 chunk_size=1 << 16):
+        self.store = ColumnStore(directory, EPISODE_COLUMNS, chunk_size) if directory else None
+        self.first_row = len(self.store) if self.store is not None else 0
+        self.episodes = 0
+        self.successes = 0
+        self.gold_retrievals = 0
+        self.pit_deaths = 0
+        self.wumpus_deaths = 0
+        self.heatmap = np.zeros((grid_size, grid_size))
+        self.stats = {'reward': RunningStats(), 'steps': RunningStats()}
+        self.quantiles = {'reward': QuantileSketch(), 'steps': QuantileSketch()}
+        self.recent_success = WindowedRate(window)
+        self.series = {name: Downsampler(plot_points) for name in
+                       ('reward', 'steps', 'success_rate', 'recent_success_rate', 'exploration')}
+
+    @property
+    def success_rate(self):
+        return self.successes / self.episodes if self.episodes else 0.0
+
+    @property
+    def gold_rate(self):
+        return self.gold_retrievals / self.episodes if self.episodes else 0.0
+
+    def record(self, reward, steps, gold, win, exploration):
+        """Add one episode"""
+        self._observe(reward, steps, gold, win, exploration)
+        if self.store is not None:
+            self.store.append(reward=reward, steps=steps, gold=gold, win=win,
+                              exploration=exploration)
+
+    def record_many(self, rewards, steps, gold, wins, exploration):
+        """Add a block of consecutive episodes given as arrays"""
+        for row in zip(rewards.tolist(), steps.tolist(), gold.tolist(), wins.tolist(),
+                       exploration.tolist()):
+            self._observe(*row)
+        if self.store is not None:
+            self.store.extend(reward=rewards, steps=steps, gold=gold, win=wins,
+                              exploration=exploration)
+
+    def _observe(self, reward, steps, gold, win, exploration):
+        self.episodes += 1
+        self.successes += bool(win)
+        self.gold_retrievals += bool(gold)
+        for name, value in (('reward', reward), ('steps', steps)):
+            self.stats[name].update(value)
+            self.quantiles[name].update(value)
+            self.series[name].update(value)
+        self.recent_success.update(win)
+        self.series['success_rate'].update(self.success_rate)
+        self.series['recent_success_rate'].update(self.recent_success.rate)
+        self.series['exploration'].update(exploration)
+
+    def rows(self, start, stop=None):
+        """Raw rows [start, stop) of this run per column; empty without an on-disk store"""
+        if self.store is None:
+            return {}
+        start += self.first_row
+        stop = None if stop is None else stop + self.first_row
+        return {name: self.store.read(name, start, stop) for name in EPISODE_COLUMNS}
+
+    def flush(self):
+        if self.store is not None:
+            self.store.flush()
+
+    def summary(self):
+        return {
+            'episodes': self.episodes,
+            'success_rate': self.success_rate,
+            'recent_success_rate': self.recent_success.rate,
+            'gold_retrieval_rate': self.gold_rate,
+            'pit_deaths': self.pit_deaths,
+            'wumpus_deaths': self.wumpus_deaths,
+            'reward': {**self.stats['reward'].to_dict(), **self.quantiles['reward'].to_dict()},
+            'steps': {**self.stats['steps'].to_dict(), **self.quantiles['steps'].to_dict()},
+        }
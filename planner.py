@@ -0,0 +1,184 @@
+import heapq
+
+INF = float('inf')
+
+
+class DStarLitePlanner:
+    """Incremental shortest paths to a fixed goal (D* Lite, Koenig & Likhachev).
+
+    The search runs backwards from the goal, so its tree stays valid while
+    the start moves. When the cost of entering some cells changes, only the
+    vertices whose best successor went through them are repaired. Cells are
+    addressed by flat index x * grid_size + y and g/rhs are kept sparsely,
+    so memory follows the part of the grid the search actually touched.
+    """
+
+    def __init__(self, grid_size, goal, cost):
+        self.grid_size = grid_size
+        self.goal = goal
+        self.cost = cost  # cost(idx) of entering cell idx
+        self._goal_idx = goal[0] * grid_size + goal[1]
+        self._g = {}
+        self._rhs = {self._goal_idx: 0.0}
+        self._open = {}  # idx -> key currently queued for it
+        self._heap = []
+        self._km = 0.0
+        self._last_start = None
+
+    def _h(self, idx):
+        """Manhattan distance from the current start (every step costs >= 1)"""
+        if self._last_start is None:
+            return 0
+        x, y = divmod(idx, self.grid_size)
+        sx, sy = self._last_start
+        return abs(x - sx) + abs(y - sy)
+
+    def _key(self, idx):
+        g = self._g.get(idx, INF)
+        rhs = self._rhs.get(idx, INF)
+        if g < rhs:
+            # Underconsistent vertices win ties and use the usual k2, since
+            # they can raise the g-values of everything routed through them
+            return (g + self._h(idx) + self._km, 0, g)
+        # Otherwise ties go to the vertex furthest from the goal, which keeps
+        # the backward search heading for the start across the equal-cost
+        # plateaus formed by explored (zero-risk) cells
+        return (rhs + self._h(idx) + self._km, 1, -rhs)
+
+    def _push(self, idx, key):
+        self._open[idx] = key
+        heapq.heappush(self._heap, (key, idx))
+
+    def _top(self):
+        heap = self._heap
+        while heap:
+            key, idx = heap[0]
+            if self._open.get(idx) == key:
+                return key, idx
+            heapq.heappop(heap)  # Stale entry
+        return None
+
+    def _neighbors(self, idx):
+        n = self.grid_size
+        x, y = divmod(idx, n)
+        if y + 1 < n:
+            yield idx + 1
+        if x + 1 < n:
+            yield idx + n
+        if y > 0:
+            yield idx - 1
+        if x > 0:
+            yield idx - n
+
+    def _update_vertex(self, idx):
+        if idx != self._goal_idx:
+            g, cost = self._g, self.cost
+            self._rhs[idx] = min((cost(s) + g.get(s, INF) for s in self._neighbors(idx)),
+                                 default=INF)
+        self._open.pop(idx, None)
+        if self._g.get(idx, INF) != self._rhs.get(idx, INF):
+            self._push(idx, self._key(idx))
+
+    def update_cells(self, cells):
+        """Tell the planner that entering these (x, y) cells now costs differently"""
+        n = self.grid_size
+        for x, y in cells:
+            idx = x * n + y
+            for pred in self._neighbors(idx):
+                self._update_vertex(pred)
+
+    def _compute_shortest_path(self, start_idx):
+        g, rhs = self._g, self._rhs
+        while True:
+            top = self._top()
+            if top is None:
+                break
+            k_old, u = top
+            start_key = self._key(start_idx)
+            if k_old >= start_key and rhs.get(start_idx, INF) == g.get(start_idx, INF):
+                break
+            k_new = self._key(u)
+            if k_old < k_new:
+                self._push(u, k_new)
+            elif g.get(u, INF) > rhs.get(u, INF):
+                g[u] = rhs[u]
+                del self._open[u]
+                for pred in self._neighbors(u):
+                    self._update_vertex(pred)
+            else:
+                g[u] = INF
+                self._update_vertex(u)
+                for pred in self._neighbors(u):
+                    self._update_vertex(pred)
+
+    def plan(self, start):
+        """Path from start to the goal, excluding start; None if unreachable"""
+        if self._last_start is None:
+            # The heuristic needs an origin before the goal can be queued
+            self._last_start = start
+            self._push(self._goal_idx, self._key(self._goal_idx))
+        elif start != self._last_start:
+            lx, ly = self._last_start
+            self._km += abs(start[0] - lx) + abs(start[1] - ly)
+            self._last_start = start
+
+        n = self.grid_size
+        current = start[0] * n + start[1]
+        self._compute_shortest_path(current)
+        if self._g.get(current, INF) == INF:
+            return None
+
+        path = []
+        g, cost = self._g, self.cost
+        while current != self._goal_idx and len(path) < n * n:
+            current = min(self._neighbors(current), key=lambda s: (cost(s) + g.get(s, INF), s))
+            path.append(divmod(current, n))
+        return path
+
+
+
+def frontier_search(start, targets, grid_size, cost=None, passable=None):
+    """Single Dijkstra flood from start that reaches every target at once.
+
+    cost(idx) is the price of entering a cell (1 when omitted, i.e. BFS) and
+    cells for which passable(idx) is false are never entered. targets only
+    needs len() and membership tests on (x, y), so a live set is used
+    as-is. The flood stops once every target is settled. Returns
+    {target: (distance, path_cost, first_step)} where distance counts moves
+    and first_step is the neighbour of start the path goes through. Equal
+    costs are settled in discovery order, so results are deterministic.
+    """
+    n = grid_size
+    start_idx = start[0] * n + start[1]
+    remaining = len(targets) - (start in targets)
+    results = {}
+
+    # idx -> (path_cost, distance, first_step idx) of the best path found so far
+    best = {start_idx: (0, 0, start_idx)}
+    settled = set()
+    heap = [(0, 0, start_idx)]
+    discovered = 0
+    while heap and remaining > 0:
+        path_cost, _, current = heapq.heappop(heap)
+        if current in settled:
+            continue
+        settled.add(current)
+        _, distance, first = best[current]
+        cx, cy = divmod(current, n)
+        if current != start_idx and (cx, cy) in targets:
+            remaining -= 1
+            results[(cx, cy)] = (distance, path_cost, divmod(first, n))
+
+        for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+            if not (0 <= nx < n and 0 <= ny < n):
+                continue
+            idx = nx * n + ny
+            if idx in settled or (passable is not None and not passable(idx)):
+                continue
+            new_cost = path_cost + (1 if cost is None else cost(idx))
+            known = best.get(idx)
+            if known is None or new_cost < known[0]:
+                best[idx] = (new_cost, distance + 1, idx if current == start_idx else first)
+                discovered += 1
+                heapq.heappush(heap, (new_cost, discovered, idx))
+    return results
@@ -0,0 +1,165 @@
+import os
+
+import numpy as np
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: `threshold` points that keep the shape of (x, y)"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], max(edges[i + 1], edges[i] + 1)
+        # Average of the next bucket is the third corner of the triangle
+        if i + 2 < len(edges):
+            next_start, next_stop = edges[i + 1], max(edges[i + 2], edges[i + 1] + 1)
+            cx, cy = x[next_start:next_stop].mean(), y[next_start:next_stop].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        areas = np.abs((x[a] - cx) * (y[start:stop] - y[a]) -
+                       (x[a] - x[start:stop]) * (cy - y[a]))
+        a = start + int(np.argmax(areas))
+        keep[i + 1] = a
+    return x[keep], y[keep]
+
+
+def minmax_downsample(x, low, high, buckets):
+    """Merge an envelope into at most `buckets` groups, keeping each group's extremes"""
+    n = len(x)
+    if buckets >= n:
+        return x, low, high
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    starts = edges[:-1]
+    centres = (x[starts] + x[edges[1:] - 1]) / 2
+    return centres, np.minimum.reduceat(low, starts), np.maximum.reduceat(high, starts)
+
+
+class PlotWorker:
+    """Renders training plots in a separate process.
+
+    submit() hands over a snapshot (plain arrays, see render_progress) and
+    returns straight away; if the previous snapshot is still being drawn the
+    new one is dropped instead, so plotting can never hold training up.
+    close() always renders the final snapshot it is given.
+    """
+
+    def __init__(self, directory="training_plots", points=500):
+        import multiprocessing
+
+        context = multiprocessing.get_context("spawn")
+        self._queue = context.Queue(maxsize=1)
+        self._idle = context.Event()
+        self._idle.set()
+        self._process = context.Process(target=_plot_loop, name="plot-worker", daemon=True,
+                                        args=(self._queue, self._idle, directory, points))
+        self._process.start()
+
+    def submit(self, snapshot):
+        """Queue a snapshot for plotting; returns False if it was skipped"""
+        if not self._idle.is_set():
+            return False
+        self._idle.clear()
+        self._queue.put(snapshot)
+        return True
+
+    def close(self, final_snapshot=None):
+        if not self._process.is_alive():
+            return
+        if final_snapshot is not None:
+            # Wait for the plot in progress, unless the worker has died meanwhile
+            while not self._idle.wait(0.1):
+                if not self._process.is_alive():
+                    return
+            self._queue.put(final_snapshot)
+        self._queue.put(None)
+        self._process.join()
+
+
+def _plot_loop(queue, idle, directory, points):
+    import matplotlib
+    matplotlib.use("Agg")
+
+    while True:
+        snapshot = queue.get()
+        if snapshot is None:
+            return
+        try:
+            render_progress(snapshot, directory, points)
+            if snapshot.get('heatmap') is not None:
+                render_heatmap(snapshot['heatmap'], directory)
+        except Exception as e:
+            print(f"Plotting failed: {e}")
+        finally:
+            idle.set()
+
+
+def _save(fig, path):
+    """Write through a temp file so the image on disk is never half-written"""
+    tmp_path = f"{path}.tmp.png"
+    fig.savefig(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def render_progress(snapshot, directory, points=500):
+    """Training curves from snapshot['series'][name] = (x, mean, min, max)"""
+    import matplotlib.pyplot as plt
+
+    series = snapshot['series']
+    fig = plt.figure(figsize=(15, 10))
+
+    def plot_band(name):
+        x, mean, low, high = series[name]
+        bx, blow, bhigh = minmax_downsample(x, low, high, points)
+        plt.fill_between(bx, blow, bhigh, alpha=0.3)
+        plt.plot(*lttb(x, mean, points))
+
+    # Reward tracking
+    plt.subplot(2, 2, 1)
+    plot_band('reward')
+    plt.title("Episode Rewards")
+    plt.xlabel("Episode")
+    plt.ylabel("Total Reward")
+
+    # Success rate
+    plt.subplot(2, 2, 2)
+    plt.plot(*lttb(*series['success_rate'][:2], points), label="Overall")
+    plt.plot(*lttb(*series['recent_success_rate'][:2], points),
+             label=f"Last {snapshot['window']}")
+    plt.legend()
+    plt.title("Success Rate")
+    plt.xlabel("Episode")
+    plt.ylabel("Win Percentage")
+    plt.ylim(0, 1)
+
+    # Steps per episode
+    plt.subplot(2, 2, 3)
+    plot_band('steps')
+    plt.title("Steps per Episode")
+    plt.xlabel("Episode")
+    plt.ylabel("Steps")
+
+    # Exploration rate
+    plt.subplot(2, 2, 4)
+    plt.plot(*lttb(*series['exploration'][:2], points))
+    plt.title("Exploration Rate")
+    plt.xlabel("Episode")
+    plt.ylabel("Rate")
+
+    plt.tight_layout()
+    _save(fig, os.path.join(directory, "training_progress.png"))
+    plt.close(fig)
+
+
+def render_heatmap(heatmap, directory):
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=(8, 8))
+    plt.imshow(heatmap, cmap='hot', interpolation='nearest')
+    plt.title("Exploration Heatmap")
+    plt.colorbar()
+    _save(fig, os.path.join(directory, "exploration_heatmap.png"))
+    plt.close(fig)
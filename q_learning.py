@@ -0,0 +1,83 @@
+import numpy as np
+
+from state_encoding import ENCODING_VERSION, check_encoding, num_states, world_state
+from vector_env import ACTIONS
+
+
+class QLearner:
+    """Tabular Q-learning over a dense (num_states, num_actions) float32 table,
+    indexed by state_encoding indices.
+
+    act() and update() work on whole batches of transitions, e.g. one step of
+    a VectorWumpusWorld. Repeated (state, action) pairs in a batch move their
+    entry by their mean TD error; summing them would scale the learning rate
+    by the number of copies (every world starts in the same state).
+    """
+
+    def __init__(self, grid_size, learning_rate=0.1, discount_factor=0.95, seed=None,
+                 q_table=None):
+        self.grid_size = grid_size
+        self.learning_rate = learning_rate
+        self.discount_factor = discount_factor
+        self.rng = np.random.default_rng(seed)
+        if q_table is None:
+            q_table = np.zeros((num_states(grid_size), len(ACTIONS)), dtype=np.float32)
+        self.q_table = q_table
+
+    def act(self, states, exploration_rate=0.0):
+        """Epsilon-greedy action ids for a batch of states"""
+        actions = self.q_table[states].argmax(axis=1)
+        if exploration_rate > 0:
+            explore = self.rng.random(len(actions)) < exploration_rate
+            actions[explore] = self.rng.integers(0, len(ACTIONS), size=int(explore.sum()))
+        return actions
+
+    def td_errors(self, states, actions, rewards, next_states, terminals):
+        """TD(0) errors; only terminal transitions (a win or a death) skip the
+        bootstrap, so episodes cut off by the step limit still bootstrap"""
+        targets = rewards + self.discount_factor * np.where(
+            terminals, 0.0, self.q_table[next_states].max(axis=1))
+        return targets - self.q_table[states, actions]
+
+    def update(self, states, actions, rewards, next_states, terminals, weights=None):
+        """One TD(0) step for a batch of transitions; returns their TD errors.
+        weights scale each transition's error (importance weights of a replay)."""
+        errors = self.td_errors(states, actions, rewards, next_states, terminals)
+        flat, inverse, counts = np.unique(states.astype(np.int64) * self.q_table.shape[1] + actions,
+                                          return_inverse=True, return_counts=True)
+        weighted = errors if weights is None else errors * weights
+        mean_errors = np.bincount(inverse, weights=weighted, minlength=len(flat)) / counts
+        self.q_table.reshape(-1)[flat] += (self.learning_rate * mean_errors).astype(np.float32)
+        return errors
+
+    def model(self):
+        """What gets pickled as the trained model"""
+        return {
+            'q_table': self.q_table,
+            'grid_size': self.grid_size,
+            'state_encoding': ENCODING_VERSION,
+            'actions': ACTIONS,
+        }
+
+
+class QTableAgent:
+    """Plays a WumpusWorld greedily from a saved Q-table (see QLearner.model).
+
+    Has the decide_action/update_knowledge/metrics surface of WumpusAgent,
+    so headless runs and the visualisation can drive it the same way.
+    """
+
+    def __init__(self, world, model):
+        check_encoding(model, world.grid_size)
+        self.world = world
+        self.q_table = model['q_table']
+        self.metrics = {'total_reward': 0}
+
+    def decide_action(self):
+        return ACTIONS[int(self.q_table[world_state(self.world)].argmax())]
+
+    def update_knowledge(self):
+        pass
+
+    def reset(self):
+        self.metrics['total_reward'] = 0
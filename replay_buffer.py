@@ -0,0 +1,119 @@
+import numpy as np
+
+
+class SumTree:
+    """Binary tree of priority sums over a fixed number of leaves, in one float32 array.
+
+    Node i has children 2i and 2i+1 and the root is node 1, so leaf j is
+    node leaves + j. Updates and lookups take whole index arrays and walk
+    the levels together, O(batch * log(capacity)) per call.
+    """
+
+    def __init__(self, capacity):
+        self.leaves = 1 << max(0, int(capacity - 1).bit_length())
+        self.depth = self.leaves.bit_length() - 1
+        self.nodes = np.zeros(2 * self.leaves, dtype=np.float32)
+
+    @property
+    def total(self):
+        return self.nodes[1]
+
+    def update(self, indices, priorities):
+        """Set leaf priorities (the last write wins for repeated indices)"""
+        nodes = np.asarray(indices, dtype=np.int64) + self.leaves
+        self.nodes[nodes] = priorities
+        for _ in range(self.depth):
+            # A parent listed twice gets the same sum twice, so repeats need no np.unique
+            nodes >>= 1
+            self.nodes[nodes] = self.nodes[2 * nodes] + self.nodes[2 * nodes + 1]
+
+    def find(self, values):
+        """Leaf holding each prefix-sum value in [0, total)"""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            left_sum = self.nodes[left]
+            # Rounding can leave a value just past the left sum; never step into an empty subtree
+            go_right = (values >= left_sum) & (self.nodes[left + 1] > 0)
+            values -= np.where(go_right, left_sum, 0.0)
+            nodes = left + go_right
+        return nodes - self.leaves
+
+
+class PrioritizedReplayBuffer:
+    """Fixed-size ring of transitions sampled in proportion to priority**alpha.
+
+    Transitions are stored column-wise in preallocated arrays, so memory is
+    fixed at construction (see nbytes); once full, the oldest are
+    overwritten. New transitions get the largest priority seen so far, so
+    every one is replayed at least about once. sample() returns importance
+    weights (N * P(i))**-beta normalised to a maximum of 1, and
+    update_priorities() sets priorities from the TD errors of a replay.
+    """
+
+    def __init__(self, capacity, alpha=0.6, beta=0.4, epsilon=1e-3, state_dtype=np.int64,
+                 seed=None):
+        self.capacity = capacity
+        self.alpha = alpha
+        self.beta = beta
+        self.epsilon = epsilon
+        self.rng = np.random.default_rng(seed)
+        self.states = np.zeros(capacity, dtype=state_dtype)
+        self.actions = np.zeros(capacity, dtype=np.uint8)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros(capacity, dtype=state_dtype)
+        self.terminals = np.zeros(capacity, dtype=bool)
+        self.tree = SumTree(capacity)
+        self.max_priority = 1.0
+        self.position = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.states, self.actions, self.rewards,
+                                      self.next_states, self.terminals, self.tree.nodes))
+
+    def add(self, states, actions, rewards, next_states, terminals):
+        """Append a batch of transitions given as equal-length arrays"""
+        count = len(states)
+        if count > self.capacity:
+            # Only the newest capacity transitions would survive anyway
+            skip = count - self.capacity
+            states, actions, rewards, next_states, terminals = (
+                a[skip:] for a in (states, actions, rewards, next_states, terminals))
+            count = self.capacity
+        slots = (self.position + np.arange(count)) % self.capacity
+        self.states[slots] = states
+        self.actions[slots] = actions
+        self.rewards[slots] = rewards
+        self.next_states[slots] = next_states
+        self.terminals[slots] = terminals
+        self.tree.update(slots, self.max_priority)
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+
+    def sample(self, batch_size):
+        """Stratified prioritised sample.
+
+        Returns (indices, weights, (states, actions, rewards, next_states, terminals)).
+        """
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+        total = self.tree.total
+        bounds = (np.arange(batch_size) + self.rng.random(batch_size)) * (total / batch_size)
+        indices = np.minimum(self.tree.find(bounds), self.size - 1)
+        probabilities = self.tree.nodes[indices + self.tree.leaves] / total
+        weights = (self.size * probabilities) ** -self.beta
+        weights /= weights.max()
+        return indices, weights, (self.states[indices], self.actions[indices],
+                                  self.rewards[indices], self.next_states[indices],
+                                  self.terminals[indices])
+
+    def update_priorities(self, indices, td_errors):
+        priorities = (np.abs(td_errors) + self.epsilon) ** self.alpha
+        self.tree.update(indices, priorities)
+        self.max_priority = max(self.max_priority, float(priorities.max()))
@@ -1,30 +1,46 @@
-import pickle
-import pygame
+import argparse
 import sys
+from functools import partial
 from wumpus_world import WumpusWorld
-from visualization import GameVisualization
-from agent import WumpusAgent
+from headless import apply_action, load_agent_data, make_agent, run_headless, step_agent
 
 def load_trained_agent(model_path="saved_models/final_agent.pkl"):
     try:
-        with open(model_path, 'rb') as f:
-            agent_data = pickle.load(f)
-        
+        agent_data = load_agent_data(model_path)
         world = WumpusWorld(grid_size=4)
-        agent = WumpusAgent(world)
-        agent.knowledge_base = agent_data['knowledge_base']
-        if 'hyperparameters' in agent_data:
-            agent.conservatism = agent_data['hyperparameters'].get('conservatism', 0.5)
+        agent = make_agent(world, agent_data)
         return agent, world
     except Exception as e:
         print(f"Error loading agent: {e}")
         sys.exit(1)
 
-def run_trained_agent():
+def _status_metrics(world, agent):
+    return {
+        'Position': world.agent_pos,
+        'Direction': world.agent_dir,
+        'Has Gold': str(world.has_gold),
+        'Arrows': str(world.has_arrow),
+        'Score': agent.metrics.get('total_reward', 0)
+    }
+
+def run_trained_agent(model_path="saved_models/final_agent.pkl", sim_rate=None):
+    import pygame
+    from visualization import GameVisualization
+
     try:
         pygame.init()
-        agent, world = load_trained_agent()
+        agent, world = load_trained_agent(model_path)
         game = GameVisualization(world)
+
+        if sim_rate is not None:
+            from simulation import Simulation
+
+            simulation = Simulation(world, partial(step_agent, world, agent), rate=sim_rate or None,
+                                    metrics=partial(_status_metrics, world, agent))
+            status = game.run_simulation(simulation)
+            if status != "continue":
+                print(f"Game Over: {'Win!' if status == 'win' else 'Lose!'}")
+            return
         
         running = True
         clock = pygame.time.Clock()
@@ -38,21 +54,10 @@ def run_trained_agent():
                         running = False
             
             action = agent.decide_action()
-            
-            if action == "forward":
-                world.move_forward()
-            elif action == "turn_left":
-                world.turn_left()
-            elif action == "turn_right":
-                world.turn_right()
-            elif action == "grab":
-                world.grab_gold()
-            elif action == "shoot":
-                world.shoot_arrow()
-            elif action == "climb":
-                if world.has_gold and world.agent_pos == (0, 0):
-                    print("Mission accomplished!")
-                    running = False
+            apply_action(world, action)
+            if action == "climb" and world.has_gold and world.agent_pos == (0, 0):
+                print("Mission accomplished!")
+                running = False
             
             agent.update_knowledge()
             
@@ -61,16 +66,10 @@ def run_trained_agent():
                 print(f"Game Over: {'Win!' if status == 'win' else 'Lose!'}")
                 running = False
             
-            game.draw_world()
-            game.draw_metrics({
-                'Position': world.agent_pos,
-                'Direction': world.agent_dir,
-                'Has Gold': str(world.has_gold),
-                'Arrows': str(world.has_arrow),
-                'Score': agent.metrics.get('total_reward', 0)
-            })
+            game.draw_world(present=False)
+            game.draw_metrics(_status_metrics(world, agent))
             
-            pygame.display.flip()
+            game.present()
             clock.tick(5)  # 5 FPS
         
     except Exception as e:
@@ -79,5 +78,32 @@ def run_trained_agent():
         pygame.quit()
         sys.exit()
 
+def main():
+    parser = argparse.ArgumentParser(description="Run a trained Wumpus World agent")
+    parser.add_argument("--model", default="saved_models/final_agent.pkl")
+    parser.add_argument("--headless", action="store_true",
+                        help="run at full speed without pygame and print a summary")
+    parser.add_argument("--episodes", type=int, default=100,
+                        help="episodes to run in headless mode")
+    parser.add_argument("--max-steps", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--trace", default=None,
+                        help="append every headless episode to this episode trace file")
+    parser.add_argument("--sim-rate", type=float, default=None,
+                        help="step the agent on its own thread at this many steps/s "
+                             "(0 = unlimited) while drawing at 60 FPS")
+    args = parser.parse_args()
+
+    if not args.headless:
+        run_trained_agent(args.model, args.sim_rate)
+        return
+    try:
+        agent_data = load_agent_data(args.model)
+    except Exception as e:
+        print(f"Error loading agent: {e}")
+        sys.exit(1)
+    run_headless(args.episodes, agent_data, max_steps=args.max_steps, seed=args.seed,
+                 trace_path=args.trace)
+
 if __name__ == "__main__":
-    run_trained_agent()
\ No newline at end of file
+    main()
\ No newline at end of file
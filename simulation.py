@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import deque
+
+
+class WorldSnapshot:
+    """Frozen copy of the parts of a WumpusWorld that GameVisualization draws.
+
+    It has the same attributes as the world (and is_game_over), so a
+    renderer can draw it in place of the live world while the simulation
+    keeps mutating the original on another thread.
+    """
+
+    def __init__(self, world, step, metrics=None):
+        n = world.grid_size
+        self.step = step
+        self.grid_size = n
+        self.world = [[dict(world.world[x][y]) for y in range(n)] for x in range(n)]
+        self.visited = frozenset(world.visited)
+        self.safe_cells = frozenset(world.safe_cells)
+        self.stenchy_cells = frozenset(world.stenchy_cells)
+        self.breezy_cells = frozenset(world.breezy_cells)
+        self.agent_pos = world.agent_pos
+        self.agent_dir = world.agent_dir
+        self.has_gold = world.has_gold
+        self.has_arrow = world.has_arrow
+        self.wumpus_alive = world.wumpus_alive
+        self.percepts = dict(world.percepts)
+        self.status = world.is_game_over()
+        self.metrics = metrics or {}
+
+    def is_game_over(self):
+        return self.status
+
+
+class Simulation:
+    """Steps a world on a worker thread, independently of any renderer.
+
+    `step` advances the world by one action. With rate=None the thread runs
+    as fast as it can, otherwise it aims for `rate` steps per second.
+    Snapshots are only taken when a reader has asked for one since the last
+    snapshot, so intermediate states cost nothing when nobody is watching
+    them. Everything that touches the world, including actions submitted
+    from other threads, runs on the simulation thread.
+    """
+
+    def __init__(self, world, step, rate=None, max_steps=None, metrics=None):
+        self.world = world
+        self._step = step
+        self.rate = rate
+        self.max_steps = max_steps
+        self._metrics = metrics
+        self.steps = 0
+        self.paused = False
+        self._pending = deque()
+        self._wanted = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._snapshot = WorldSnapshot(world, 0, metrics() if metrics else None)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def submit(self, action):
+        """Run a callable against the world on the simulation thread"""
+        self._pending.append(action)
+
+    def latest(self):
+        """Most recent snapshot; also asks for a fresh one to be taken"""
+        self._wanted.set()
+        return self._snapshot
+
+    def _publish(self):
+        self._wanted.clear()
+        metrics = self._metrics() if self._metrics else None
+        self._snapshot = WorldSnapshot(self.world, self.steps, metrics)
+
+    def _run(self):
+        interval = 1.0 / self.rate if self.rate else 0.0
+        deadline = time.perf_counter()
+        while not self._stop.is_set():
+            while self._pending:
+                self._pending.popleft()()
+                self._wanted.set()
+
+            finished = (self.world.is_game_over() != "continue" or
+                        (self.max_steps is not None and self.steps >= self.max_steps))
+            if finished:
+                self._publish()
+                return
+            if self.paused:
+                if self._wanted.is_set():
+                    self._publish()
+                self._stop.wait(0.01)
+                deadline = time.perf_counter()
+                continue
+
+            self._step()
+            self.steps += 1
+            if self._wanted.is_set():
+                self._publish()
+
+            if interval:
+                deadline += interval
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)
+                else:
+                    deadline = time.perf_counter()  # Fell behind; don't try to catch up
+        self._publish()
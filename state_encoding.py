@@ -0,0 +1,93 @@
+"""Dense integer encoding of the agent state of get_state_representation().
+
+An index packs, from the top bit down:
+
+    cell (x * grid_size + y) | direction (2 bits) | has_gold | has_arrow | percepts (5 bits)
+
+so a grid_size x grid_size world maps its states one-to-one onto
+[0, num_states(grid_size)). Indices address NumPy arrays (e.g. a Q-table)
+and serve as cache keys directly. Direction ids and percept bits are the
+ones of vector_env, so vectorised and single-world code agree.
+"""
+import numpy as np
+
+from vector_env import DIRECTIONS, DIRECTION_IDS, PERCEPT_BITS
+
+# Bump whenever the layout changes; saved models record it
+ENCODING_VERSION = 1
+
+PERCEPT_MASK = 0b11111
+ARROW_SHIFT = 5
+GOLD_SHIFT = 6
+DIRECTION_SHIFT = 7
+CELL_SHIFT = 9
+
+
+def num_states(grid_size):
+    return grid_size * grid_size << CELL_SHIFT
+
+
+def percept_bits(percepts):
+    """Bitmask of a WumpusWorld percepts dict"""
+    bits = 0
+    for name, bit in PERCEPT_BITS.items():
+        if percepts[name]:
+            bits |= bit
+    return bits
+
+
+def encode_state(grid_size, pos, direction, has_gold, has_arrow, percepts):
+    """Index of one state; direction is a name and percepts a dict or bitmask"""
+    if isinstance(percepts, (int, np.integer)):
+        percepts = int(percepts)
+    else:
+        percepts = percept_bits(percepts)
+    return (((pos[0] * grid_size + pos[1]) << CELL_SHIFT)
+            | (DIRECTION_IDS[direction] << DIRECTION_SHIFT)
+            | (bool(has_gold) << GOLD_SHIFT)
+            | (bool(has_arrow) << ARROW_SHIFT)
+            | percepts)
+
+
+def encode_states(grid_size, x, y, direction, has_gold, has_arrow, percepts):
+    """Indices for arrays of states (direction ids, percept bitmasks)"""
+    return (((np.asarray(x, dtype=np.int64) * grid_size + y) << CELL_SHIFT)
+            | (np.asarray(direction, dtype=np.int64) << DIRECTION_SHIFT)
+            | (np.asarray(has_gold, dtype=np.int64) << GOLD_SHIFT)
+            | (np.asarray(has_arrow, dtype=np.int64) << ARROW_SHIFT)
+            | np.asarray(percepts, dtype=np.int64))
+
+
+def decode_state(grid_size, index):
+    """Inverse of encode_state, laid out like get_state_representation()"""
+    index = int(index)
+    percepts = index & PERCEPT_MASK
+    return (
+        divmod(index >> CELL_SHIFT, grid_size),
+        DIRECTIONS[(index >> DIRECTION_SHIFT) & 3],
+        (index >> GOLD_SHIFT) & 1,
+        (index >> ARROW_SHIFT) & 1,
+        tuple(bool(percepts & bit) for bit in PERCEPT_BITS.values()),
+    )
+
+
+def world_state(world):
+    """Index of a WumpusWorld's current agent state"""
+    return encode_state(world.grid_size, world.agent_pos, world.agent_dir,
+                        world.has_gold, world.has_arrow, world.percepts)
+
+
+def env_states(env):
+    """Index of every world's agent state in a VectorWumpusWorld"""
+    return encode_states(env.grid_size, env.agent_x, env.agent_y, env.agent_dir,
+                         env.has_gold, env.has_arrow, env.percepts)
+
+
+def check_encoding(model, grid_size):
+    """Raise ValueError unless a saved model's state encoding matches this one"""
+    version = model.get('state_encoding')
+    if version != ENCODING_VERSION:
+        raise ValueError(f"Model uses state encoding {version}, expected {ENCODING_VERSION}")
+    if model.get('grid_size') != grid_size:
+        raise ValueError(f"Model was trained on a {model.get('grid_size')}x"
+                         f"{model.get('grid_size')} grid, not {grid_size}x{grid_size}")
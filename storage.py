@@ -0,0 +1,382 @@
+from abc import abstractmethod
+from collections.abc import Mapping, MutableMapping
+
+import numpy as np
+
+# World content bits
+PIT, WUMPUS, GOLD = 1, 2, 4
+CONTENT_BITS = {"pit": PIT, "wumpus": WUMPUS, "gold": GOLD}
+
+# World knowledge-base bits: each fact is "known" plus its value
+PIT_KNOWN, PIT_TRUE, WUMPUS_KNOWN, WUMPUS_TRUE, SAFE = 1, 2, 4, 8, 16
+_FACT_BITS = {"pit": (PIT_KNOWN, PIT_TRUE), "wumpus": (WUMPUS_KNOWN, WUMPUS_TRUE)}
+
+# Agent knowledge-base bits
+VISITED = 1
+
+STORAGE_ENGINES = ("dict", "array", "sparse")
+
+
+def neighbour_field(mask):
+    """Cells with a True 4-neighbour, computed by shifting the last two axes"""
+    field = np.zeros_like(mask, dtype=bool)
+    field[..., 1:, :] |= mask[..., :-1, :]
+    field[..., :-1, :] |= mask[..., 1:, :]
+    field[..., :, 1:] |= mask[..., :, :-1]
+    field[..., :, :-1] |= mask[..., :, 1:]
+    return field
+
+
+class _CellView(MutableMapping):
+    """Dict-like view of one cell of a BitfieldGrid"""
+
+    __slots__ = ("_grid", "_x", "_y")
+
+    def __init__(self, grid, x, y):
+        self._grid = grid
+        self._x = x
+        self._y = y
+
+    def __getitem__(self, key):
+        return bool(self._grid.cells[self._x, self._y] & CONTENT_BITS[key])
+
+    def __setitem__(self, key, value):
+        bit = CONTENT_BITS[key]
+        cells = self._grid.writable_cells()
+        if value:
+            cells[self._x, self._y] |= bit
+        else:
+            cells[self._x, self._y] &= ~bit & 0xFF
+
+    def __delitem__(self, key):
+        raise TypeError("cells have a fixed set of keys")
+
+    def __iter__(self):
+        return iter(CONTENT_BITS)
+
+    def __len__(self):
+        return len(CONTENT_BITS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class _ColumnView:
+    __slots__ = ("_grid", "_x")
+
+    def __init__(self, grid, x):
+        self._grid = grid
+        self._x = x
+
+    def __getitem__(self, y):
+        if not 0 <= y < len(self):
+            raise IndexError(y)
+        return _CellView(self._grid, self._x, y)
+
+    def __len__(self):
+        return self._grid.cells.shape[1]
+
+    def __iter__(self):
+        for y in range(len(self)):
+            yield _CellView(self._grid, self._x, y)
+
+
+class BitfieldGrid:
+    """World contents as one uint8 bitfield per cell.
+
+    Indexing as grid[x][y]["pit"] mirrors the list-of-dicts layout produced
+    by WumpusWorld.generate_world, so existing readers keep working while
+    hot paths use the `cells` array (or the pits/wumpus/gold masks) directly.
+    A read-only `cells` array (e.g. a WorldBank memmap slice) is copied on
+    the first write.
+    """
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    @classmethod
+    def empty(cls, grid_size):
+        return cls(np.zeros((grid_size, grid_size), dtype=np.uint8))
+
+    def writable_cells(self):
+        if not self.cells.flags.writeable:
+            self.cells = np.array(self.cells)
+        return self.cells
+
+    @property
+    def grid_size(self):
+        return self.cells.shape[0]
+
+    def mask(self, bit):
+        return (self.cells & bit).astype(bool)
+
+    @property
+    def pits(self):
+        return self.mask(PIT)
+
+    @property
+    def wumpus(self):
+        return self.mask(WUMPUS)
+
+    @property
+    def gold(self):
+        return self.mask(GOLD)
+
+    def to_dicts(self):
+        """Plain list-of-dicts copy, as used by the dict storage engine"""
+        return [[dict(cell) for cell in column] for column in self]
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.cells.shape[0]:
+            raise IndexError(x)
+        return _ColumnView(self, x)
+
+    def __len__(self):
+        return self.cells.shape[0]
+
+    def __iter__(self):
+        for x in range(len(self)):
+            yield _ColumnView(self, x)
+
+
+class _GridMapping(Mapping):
+    """Mapping keyed by (x, y) over every cell of a square grid"""
+
+    grid_size = 0
+
+    def _check(self, pos):
+        x, y = pos
+        if not (0 <= x < self.grid_size and 0 <= y < self.grid_size):
+            raise KeyError(pos)
+        return x, y
+
+    def __iter__(self):
+        for x in range(self.grid_size):
+            for y in range(self.grid_size):
+                yield (x, y)
+
+    def __len__(self):
+        return self.grid_size * self.grid_size
+
+
+class _FactView(MutableMapping):
+    """Dict-like view of one WorldKnowledgeArray cell"""
+
+    __slots__ = ("_flags", "_x", "_y")
+    _keys = ("pit", "wumpus", "safe")
+
+    def __init__(self, flags, x, y):
+        self._flags = flags
+        self._x = x
+        self._y = y
+
+    def __getitem__(self, key):
+        flags = int(self._flags[self._x, self._y])
+        if key == "safe":
+            return bool(flags & SAFE)
+        known, true = _FACT_BITS[key]
+        if not flags & known:
+            return "unknown"
+        return bool(flags & true)
+
+    def __setitem__(self, key, value):
+        flags = int(self._flags[self._x, self._y])
+        if key == "safe":
+            flags = flags | SAFE if value else flags & ~SAFE
+        else:
+            known, true = _FACT_BITS[key]
+            if value == "unknown":
+                flags &= ~(known | true)
+            elif value:
+                flags |= known | true
+            else:
+                flags = (flags | known) & ~true
+        self._flags[self._x, self._y] = flags
+
+    def __delitem__(self, key):
+        raise TypeError("cells have a fixed set of keys")
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class WorldKnowledgeArray(_GridMapping):
+    """WumpusWorld knowledge base packed into one uint8 flags array.
+
+    kb[(x, y)] returns a view with the same "pit"/"wumpus"/"safe" keys and
+    "unknown"/True/False values as the dict knowledge base.
+    """
+
+    def __init__(self, grid_size):
+        self.grid_size = grid_size
+        self.flags = np.zeros((grid_size, grid_size), dtype=np.uint8)
+
+    def __getitem__(self, pos):
+        x, y = self._check(pos)
+        return _FactView(self.flags, x, y)
+
+
+class _BeliefView(MutableMapping):
+    """Dict-like view of one AgentKnowledgeArray cell"""
+
+    __slots__ = ("_kb", "_x", "_y")
+    _keys = ("pit_prob", "wumpus_prob", "visited")
+
+    def __init__(self, kb, x, y):
+        self._kb = kb
+        self._x = x
+        self._y = y
+
+    def __getitem__(self, key):
+        if key == "pit_prob":
+            return float(self._kb.pit_prob[self._x, self._y])
+        if key == "wumpus_prob":
+            return float(self._kb.wumpus_prob[self._x, self._y])
+        if key == "visited":
+            return bool(self._kb.flags[self._x, self._y] & VISITED)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == "pit_prob":
+            self._kb.pit_prob[self._x, self._y] = value
+        elif key == "wumpus_prob":
+            self._kb.wumpus_prob[self._x, self._y] = value
+        elif key == "visited":
+            if value:
+                self._kb.flags[self._x, self._y] |= VISITED
+            else:
+                self._kb.flags[self._x, self._y] &= ~VISITED & 0xFF
+        else:
+            raise KeyError(key)
+
+    def __delitem__(self, key):
+        raise TypeError("cells have a fixed set of keys")
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class AgentKnowledgeArray(_GridMapping):
+    """WumpusAgent beliefs as float32 probability grids plus a flags grid.
+
+    kb[(x, y)] returns a view with the 'pit_prob', 'wumpus_prob' and
+    'visited' keys of the dict knowledge base.
+    """
+
+    def __init__(self, grid_size, pit_prior=0.2):
+        self.grid_size = grid_size
+        self.pit_prob = np.full((grid_size, grid_size), pit_prior, dtype=np.float32)
+        self.wumpus_prob = np.full((grid_size, grid_size),
+                                   1.0 / (grid_size ** 2 - 1), dtype=np.float32)
+        self.flags = np.zeros((grid_size, grid_size), dtype=np.uint8)
+        self.pit_prob[0, 0] = 0.0
+        self.wumpus_prob[0, 0] = 0.0
+
+    def __getitem__(self, pos):
+        x, y = self._check(pos)
+        return _BeliefView(self, x, y)
+
+
+class _LazyCellView(MutableMapping):
+    """A SparseKnowledge cell nothing has been written to yet: reads give the
+    prior, and the first write stores the cell"""
+
+    __slots__ = ("_kb", "_pos")
+
+    def __init__(self, kb, pos):
+        self._kb = kb
+        self._pos = pos
+
+    def __getitem__(self, key):
+        cell = self._kb.cells.get(self._pos)
+        return (cell if cell is not None else self._kb.prior(self._pos))[key]
+
+    def __setitem__(self, key, value):
+        self._kb.materialize(self._pos)[key] = value
+
+    def __delitem__(self, key):
+        raise TypeError("cells have a fixed set of keys")
+
+    def __iter__(self):
+        return iter(self._kb.prior(self._pos))
+
+    def __len__(self):
+        return len(self._kb.prior(self._pos))
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class SparseKnowledge(_GridMapping):
+    """Knowledge base that only stores cells something has been written to.
+
+    kb[(x, y)] gives the stored dict, or for any other cell a view that
+    reads prior((x, y)) and stores the cell on its first write. Memory and
+    setup therefore follow the cells with evidence, not the grid area.
+    Iteration still covers every cell of the grid.
+    """
+
+    def __init__(self, grid_size):
+        self.grid_size = grid_size
+        self.cells = {}
+
+    @abstractmethod
+    def prior(self, pos):
+        """Fresh dict of the values a cell without evidence has"""
+
+    def __getitem__(self, pos):
+        cell = self.cells.get(pos)
+        if cell is not None:
+            return cell
+        return _LazyCellView(self, self._check(pos))
+
+    def materialize(self, pos):
+        cell = self.cells.get(pos)
+        if cell is None:
+            cell = self.cells[pos] = self.prior(pos)
+        return cell
+
+    def clear(self):
+        """Forget all evidence"""
+        self.cells.clear()
+
+
+class SparseWorldKnowledge(SparseKnowledge):
+    """WumpusWorld knowledge base with the dict engine's keys and values"""
+
+    def prior(self, pos):
+        return {"pit": "unknown", "wumpus": "unknown", "safe": False}
+
+
+class SparseAgentKnowledge(SparseKnowledge):
+    """WumpusAgent beliefs; cells without evidence read the prior
+    probabilities (nothing at (0, 0), one Wumpus among the other cells)"""
+
+    def __init__(self, grid_size, pit_prior=0.2):
+        super().__init__(grid_size)
+        self.pit_prior = pit_prior
+        self.wumpus_prior = 1.0 / (grid_size ** 2 - 1)
+
+    def prior(self, pos):
+        if pos == (0, 0):
+            return {'pit_prob': 0.0, 'wumpus_prob': 0.0, 'visited': False}
+        return {'pit_prob': self.pit_prior, 'wumpus_prob': self.wumpus_prior, 'visited': False}
+
+    def risk(self, pos):
+        """pit_prob + wumpus_prob of one cell"""
+        cell = self.cells.get(pos)
+        if cell is not None:
+            return cell['pit_prob'] + cell['wumpus_prob']
+        return 0.0 if pos == (0, 0) else self.pit_prior + self.wumpus_prior
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from agent import WumpusAgent
+from headless import apply_action
+from wumpus_world import WumpusWorld
+
+
+def _play(storage, seed, steps=80):
+    """Actions of one seeded game and the cells each decision saw change"""
+    random.seed(seed)
+    world = WumpusWorld(grid_size=8, storage=storage, seed=seed)
+    agent = WumpusAgent(world)
+    agent.update_knowledge()
+    changed, actions = [], []
+    for _ in range(steps):
+        changed.append(len(agent._changed_cells))
+        action = agent.decide_action()
+        actions.append(action)
+        apply_action(world, action)
+        agent.update_knowledge()
+    return changed, actions
+
+
+@pytest.mark.parametrize("storage", ["array", "sparse"])
+def test_storage_engines_play_like_dict(storage):
+    for seed in range(20):
+        assert _play(storage, seed) == _play("dict", seed)
+
+
+@pytest.mark.parametrize("storage", ["dict", "array", "sparse"])
+def test_frontier_is_safe_cells_not_yet_visited(storage):
+    for seed in range(10):
+        random.seed(seed)
+        world = WumpusWorld(grid_size=6, storage=storage, seed=seed)
+        agent = WumpusAgent(world)
+        agent.update_knowledge()
+        world.update_knowledge_base()
+        for _ in range(60):
+            apply_action(world, agent.decide_action())
+            agent.update_knowledge()
+            world.update_knowledge_base()
+            assert agent.frontier == agent.safe_cells - agent.visited
+            assert world.frontier == world.safe_cells - world.visited
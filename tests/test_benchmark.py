@@ -0,0 +1,29 @@
+import benchmark
+from state_encoding import world_state
+
+
+def test_cases_run():
+    for name, make_op in benchmark.CASES.items():
+        result = benchmark.measure(make_op, 4, 'dict', min_time=0, min_iterations=3)
+        assert result['iterations'] == 3, name
+        assert result['ops_per_sec'] > 0, name
+
+
+def test_walk_keeps_moving_to_new_states():
+    walk = benchmark._Walk(4, 'dict', max_steps=50)
+    states, resets = set(), 0
+    for _ in range(500):
+        walk.act()
+        states.add(world_state(walk.world))
+        resets += walk.steps == 0
+    assert len(states) > 20
+    assert resets >= 10  # max_steps alone ends an episode every 50 steps
+
+
+def test_compare_flags_throughput_drops():
+    def report(ops):
+        return {'results': [{'name': 'case', 'grid_size': 4, 'storage': 'dict',
+                             'ops_per_sec': ops}]}
+    assert benchmark.compare(report(85.0), report(100.0), threshold=0.10) == 1
+    assert benchmark.compare(report(95.0), report(100.0), threshold=0.10) == 0
+    assert benchmark.compare(report(50.0), {'results': []}, threshold=0.10) == 0
@@ -0,0 +1,67 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from agent import WumpusAgent
+from checkpoint import CheckpointWriter, load_training_metrics
+from trainer_agent import WumpusAgentTrainer
+from wumpus_world import WumpusWorld
+
+
+def _train(trainer, agent, episodes, every=100):
+    rng = np.random.default_rng(0)
+    for episode in range(1, episodes + 1):
+        trainer.metrics.record(float(rng.normal()), int(rng.integers(1, 200)),
+                               bool(rng.random() < 0.5), bool(rng.random() < 0.1), 0.3)
+        if episode % every == 0:
+            trainer._save_model(agent, episode)
+    trainer._save_final_model(agent)
+
+
+def test_delta_checkpoints_chain_back_to_every_row(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    trainer = WumpusAgentTrainer(grid_size=4, num_episodes=350)
+    agent = WumpusAgent(WumpusWorld(4, seed=0))
+    _train(trainer, agent, 350)
+
+    chained = load_training_metrics()
+    expected = trainer.metrics.rows(0, 300)
+    assert chained.keys() == expected.keys()
+    for name, rows in expected.items():
+        assert len(rows) == 300
+        np.testing.assert_array_equal(chained[name], rows)
+    assert os.path.exists("saved_models/final_agent.pkl")
+    assert not [p for p in os.listdir("saved_models") if p.endswith(".tmp")]
+
+
+def test_chain_stops_at_a_gap(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    trainer = WumpusAgentTrainer(grid_size=4, num_episodes=300)
+    _train(trainer, WumpusAgent(WumpusWorld(4, seed=0)), 300)
+    # A leftover from an older, longer run that this run never reached
+    with open("saved_models/agent_episode_500.pkl", "wb") as f:
+        pickle.dump({'episode': 500, 'first_episode': 400,
+                     'training_metrics_delta': {'reward': np.zeros(100)}}, f)
+    os.remove("saved_models/agent_episode_200.pkl")
+    assert len(load_training_metrics()['reward']) == 100
+
+
+def test_checkpoints_keep_the_state_at_save_time(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    trainer = WumpusAgentTrainer(grid_size=4, num_episodes=100, metrics_dir=None)
+    agent = WumpusAgent(WumpusWorld(4, seed=0))
+    trainer._save_model(agent, 100)
+    agent.knowledge_base[(1, 1)]['pit_prob'] = 1.0
+    trainer._save_final_model(agent)
+    with open("saved_models/agent_episode_100.pkl", "rb") as f:
+        assert pickle.load(f)['knowledge_base'][(1, 1)]['pit_prob'] == pytest.approx(0.2)
+
+
+def test_writer_reports_failed_writes(tmp_path):
+    writer = CheckpointWriter()
+    writer.save(str(tmp_path / "missing" / "agent.pkl"), {})
+    with pytest.raises(OSError):
+        writer.flush()
+    writer.close()
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import benchmark
+import cli
+
+
+@pytest.mark.parametrize("argv", [
+    ["bench", "--sizes", "4", "8", "--min-time", "0.1"],
+    ["bench", "--", "--sizes", "4", "8", "--min-time", "0.1"],
+])
+def test_bench_passes_its_options_to_benchmark(monkeypatch, argv):
+    received = []
+    monkeypatch.setattr(benchmark, "main", lambda args: received.append(args))
+    assert cli.main(argv) == 0
+    assert received == [["--sizes", "4", "8", "--min-time", "0.1"]]
+
+
+def test_other_commands_reject_unknown_options():
+    with pytest.raises(SystemExit):
+        cli.main(["eval", "--sizes", "4"])
+
+
+def test_eval_and_train_start_without_pygame_or_matplotlib():
+    for command in ("eval", "train"):
+        code = ("import sys, cli; cli.main(['--startup-only', %r]); "
+                "print('pygame' in sys.modules, 'matplotlib' in sys.modules)" % command)
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(cli.__file__)), check=True).stdout
+        assert out.split() == ["False", "False"]
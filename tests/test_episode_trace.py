@@ -0,0 +1,59 @@
+import io
+import random
+
+import pytest
+
+from episode_trace import TraceReader, TraceWriter
+from headless import apply_action, run_headless
+from wumpus_world import WumpusWorld
+
+
+def test_replay_matches_resimulation(tmp_path, capsys):
+    path = tmp_path / "episodes.trace"
+    random.seed(0)
+    run_headless(15, grid_size=4, max_steps=60, seed=4, trace_path=str(path))
+    trace = TraceReader(path)
+    assert len(trace) == 15
+    for i, episode in enumerate(trace):
+        assert (episode.episode, episode.seed) == (i, 4)
+        world = WumpusWorld(4, seed=(4, i))
+        assert (episode.layout == world.layout()).all()
+        for step, action in enumerate(episode.actions()):
+            if action is not None:
+                apply_action(world, action)
+            frame = episode.frame(step)
+            assert (frame.agent_pos, frame.agent_dir, frame.percepts) == \
+                (world.agent_pos, world.agent_dir, world.percepts)
+            assert (frame.has_gold, frame.has_arrow, frame.wumpus_alive) == \
+                (world.has_gold, world.has_arrow, world.wumpus_alive)
+            assert frame.is_game_over() == world.is_game_over()
+            assert frame.visited == world.visited
+        status = world.is_game_over()
+        assert episode.status == ("timeout" if status == "continue" else status)
+
+
+def test_raw_blocks_and_partial_episodes(tmp_path):
+    world = WumpusWorld(4, seed=1)
+    buffer = io.BytesIO()
+    writer = TraceWriter(buffer)
+    for episode in range(3):
+        writer.begin_episode(world, episode)
+        world.turn_right()
+        writer.record(world, "turn_right")
+        writer.end_episode("timeout")
+    writer.close()
+
+    path = tmp_path / "episodes.trace"
+    with TraceWriter(path) as trace:
+        trace.write_raw(buffer.getvalue())
+    assert [e.episode for e in TraceReader(path)] == [0, 1, 2]
+    assert TraceReader(path)[2].actions() == [None, "turn_right"]
+
+    # A crash mid-write leaves a truncated last episode, which is skipped
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+    assert len(TraceReader(path)) == 2
+
+    path.write_bytes(b"NOTATRACE" * 4)
+    with pytest.raises(ValueError):
+        TraceReader(path)
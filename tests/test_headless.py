@@ -0,0 +1,37 @@
+import random
+
+from agent import WumpusAgent
+from headless import make_agent, reset_agent, run_headless
+from q_learning import QLearner, QTableAgent
+from wumpus_world import WumpusWorld
+
+
+def test_summary_counts_every_episode(capsys):
+    random.seed(0)
+    summary = run_headless(30, grid_size=4, max_steps=50, seed=1)
+    assert summary['episodes'] == 30
+    assert summary['wins'] + summary['losses'] + summary['timeouts'] == 30
+    assert 0 < summary['mean_steps'] <= 50
+    assert "Episodes: 30" in capsys.readouterr().out
+
+    random.seed(0)
+    again = run_headless(30, grid_size=4, max_steps=50, seed=1)
+    for key in ('wins', 'losses', 'timeouts', 'mean_steps'):
+        assert again[key] == summary[key]
+
+
+def test_make_agent_from_saved_models():
+    world = WumpusWorld(4, seed=0)
+    q_agent = make_agent(world, QLearner(4).model())
+    assert isinstance(q_agent, QTableAgent)
+    assert q_agent.decide_action() == 'forward'  # Argmax of an all-zero row
+
+    knowledge_base = WumpusAgent(WumpusWorld(4, seed=0)).knowledge_base
+    knowledge_base[(1, 1)]['pit_prob'] = 0.9
+    data = {'knowledge_base': knowledge_base, 'hyperparameters': {'conservatism': 0.7}}
+    agent = make_agent(world, data)
+    assert agent.conservatism == 0.7
+    assert agent.knowledge_base == knowledge_base and agent.knowledge_base is not knowledge_base
+    agent.knowledge_base[(1, 1)]['pit_prob'] = 0.0
+    reset_agent(agent, data)
+    assert agent.knowledge_base[(1, 1)]['pit_prob'] == 0.9
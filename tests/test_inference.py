@@ -0,0 +1,97 @@
+import random
+
+import numpy as np
+import pytest
+
+import inference as inference_module
+from inference import FrontierInference
+from storage import PIT, WUMPUS
+from wumpus_world import WumpusWorld
+
+N = 4
+
+
+def _neighbours(x, y):
+    return [(nx, ny) for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1))
+            if 0 <= nx < N and 0 <= ny < N]
+
+
+def _observations(seed, count):
+    """Percepts of some safe cells connected to (0, 0) in a seeded layout"""
+    rng = random.Random(seed)
+    layout = WumpusWorld(N, seed=seed).layout()
+    observed = [(0, 0)]
+    for _ in range(count):
+        options = sorted({c for pos in observed for c in _neighbours(*pos)
+                          if c not in observed and not layout[c] & (PIT | WUMPUS)})
+        if not options:
+            break
+        observed.append(rng.choice(options))
+    return [(pos, any(layout[c] & PIT for c in _neighbours(*pos)),
+             any(layout[c] & WUMPUS for c in _neighbours(*pos))) for pos in observed]
+
+
+def _brute_force(observations, pit_prior):
+    """P(pit) and P(wumpus) of every cell, enumerating every possible world"""
+    cells = [(x, y) for x in range(N) for y in range(N) if (x, y) != (0, 0)]
+    bits = (np.arange(1 << len(cells))[:, None] >> np.arange(len(cells))) & 1
+    pits = np.zeros((len(bits), N, N), dtype=bool)
+    pits[:, [c[0] for c in cells], [c[1] for c in cells]] = bits
+    pit_ok = np.ones(len(bits), dtype=bool)
+    wumpus_ok = np.ones(len(cells), dtype=bool)
+    for pos, breeze, stench in observations:
+        around = _neighbours(*pos)
+        pit_ok &= ~pits[:, pos[0], pos[1]]
+        pit_ok &= pits[:, [c[0] for c in around], [c[1] for c in around]].any(axis=1) == breeze
+        wumpus_ok &= np.array([c != pos and (c in around) == stench for c in cells])
+    count = bits.sum(axis=1)
+    weights = np.where(pit_ok, pit_prior ** count * (1 - pit_prior) ** (len(cells) - count), 0)
+    pit = (weights @ bits) / weights.sum()
+    wumpus = wumpus_ok / wumpus_ok.sum()
+    return dict(zip(cells, pit)), dict(zip(cells, wumpus))
+
+
+@pytest.mark.parametrize("count", [1, 3, 6])
+def test_posteriors_match_enumeration_of_every_world(count):
+    for seed in range(40):
+        observations = _observations(seed, count)
+        inference = FrontierInference(N)
+        for pos, breeze, stench in observations:
+            inference.observe(pos, breeze, stench)
+        pit, wumpus = _brute_force(observations, inference.pit_prior)
+        for cell, prob in inference.pit_posteriors().items():
+            assert prob == pytest.approx(pit[cell], abs=1e-9), (seed, cell)
+        for cell, prob in inference.wumpus_posteriors().items():
+            assert prob == pytest.approx(wumpus[cell], abs=1e-9), (seed, cell)
+
+
+def test_reset_forgets_observations():
+    inference = FrontierInference(N)
+    inference.observe((0, 0), True, True)
+    inference.kill_wumpus()
+    inference.reset()
+    inference.observe((0, 0), False, False)
+    assert inference.pit_posteriors() == {(0, 1): 0.0, (1, 0): 0.0}
+    assert inference.wumpus_posteriors() == {(0, 1): 0.0, (1, 0): 0.0}
+
+
+def test_incremental_components_match_a_fresh_solve():
+    for seed in range(40):
+        inference = FrontierInference(N)
+        for i, observation in enumerate(_observations(seed, 8), 1):
+            inference.observe(*observation)
+            fresh = FrontierInference(N)
+            for earlier in _observations(seed, 8)[:i]:
+                fresh.observe(*earlier)
+            assert inference.pit_posteriors() == fresh.pit_posteriors(), (seed, i)
+
+
+def test_component_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(inference_module, "CACHE_SIZE", 3)
+    inference = FrontierInference(N)
+    for seed in range(40):
+        inference.reset()
+        for observation in _observations(seed, 6):
+            inference.observe(*observation)
+        inference.pit_posteriors()
+        assert len(inference._cache) <= 3
@@ -0,0 +1,111 @@
+import itertools
+import random
+
+from agent import WumpusAgent
+from headless import apply_action
+from logic import ClauseStore
+from storage import PIT, WUMPUS
+from wumpus_world import WumpusWorld
+
+
+def _models(clauses, num_vars):
+    for values in itertools.product((False, True), repeat=num_vars):
+        if all(any(values[abs(lit) - 1] == (lit > 0) for lit in clause) for clause in clauses):
+            yield values
+
+
+def test_derived_literals_are_entailed():
+    rng = random.Random(0)
+    num_vars = 7
+    for _ in range(200):
+        store = ClauseStore()
+        clauses, derived = [], set()
+        for _ in range(rng.randrange(4, 14)):
+            clause = [rng.choice((1, -1)) * rng.randint(1, num_vars)
+                      for _ in range(rng.choice((1, 2, 2, 3)))]
+            clauses.append(clause)
+            derived.update(store.add_clause(clause))
+            models = list(_models(clauses, num_vars))
+            if not models:
+                break  # Everything is entailed; conflict may or may not have been noticed
+            assert not store.conflict
+            for var, value in store.value.items():
+                assert all(model[var - 1] == value for model in models)
+        assert derived == {var if value else -var for var, value in store.value.items()}
+
+
+def test_propagation_revisits_earlier_clauses():
+    store = ClauseStore()
+    assert store.add_clause([1, 2, 3]) == []
+    assert store.add_clause([-3, 4]) == []
+    assert store.add_clause([-1]) == [-1]
+    assert sorted(store.add_clause([-2])) == [-2, 3, 4]
+    assert store.add_clause([-4]) == [] and store.conflict
+
+
+def test_world_knowledge_is_true_of_the_layout():
+    for seed in range(30):
+        random.seed(seed)
+        world = WumpusWorld(6, seed=seed)
+        layout = world.layout()
+        agent = WumpusAgent(world)
+        agent.update_knowledge()
+        world.update_knowledge_base()
+        for _ in range(80):
+            apply_action(world, agent.decide_action())
+            if world.is_game_over() != "continue":
+                break
+            agent.update_knowledge()
+            world.update_knowledge_base()
+        assert not world.clauses.conflict
+        for (x, y), facts in world.knowledge_base.items():
+            if facts["pit"] != "unknown":
+                assert facts["pit"] == bool(layout[x, y] & PIT)
+            if facts["wumpus"] != "unknown" and world.wumpus_alive:
+                assert facts["wumpus"] == bool(layout[x, y] & WUMPUS)
+            if facts["safe"]:
+                assert not layout[x, y] & PIT
+
+
+def _local_rules_safe_cells(grid_size, observations):
+    """Safe cells the old per-cell rules derived from the same percepts"""
+    kb = {(x, y): {"pit": "unknown", "wumpus": "unknown", "safe": False}
+          for x in range(grid_size) for y in range(grid_size)}
+    safe = set()
+    for (x, y), breeze, stench in observations:
+        kb[(x, y)].update(safe=True, pit=False, wumpus=False)
+        safe.add((x, y))
+        neighbors = [(x + dx, y + dy) for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+                     if 0 <= x + dx < grid_size and 0 <= y + dy < grid_size]
+        for percept, key, other in ((breeze, "pit", "wumpus"), (stench, "wumpus", "pit")):
+            if percept:
+                unknown = [cell for cell in neighbors if kb[cell][key] == "unknown"]
+                if len(unknown) == 1:
+                    kb[unknown[0]][key] = True
+                    kb[unknown[0]]["safe"] = False
+                continue
+            for cell in neighbors:
+                kb[cell][key] = False
+                if kb[cell][other] is False:
+                    kb[cell]["safe"] = True
+                    safe.add(cell)
+    return safe
+
+
+def test_clauses_find_more_safe_cells_than_local_rules():
+    found = local = 0
+    for seed in range(400):
+        rng = random.Random(seed)
+        world = WumpusWorld(6, seed=seed)
+        observations = [((0, 0), world.percepts["breeze"], world.percepts["stench"])]
+        for _ in range(60):
+            apply_action(world, rng.choice(("forward", "forward", "turn_left", "turn_right")))
+            if world.is_game_over() != "continue":
+                break
+            observations.append((world.agent_pos, world.percepts["breeze"],
+                                 world.percepts["stench"]))
+        old = _local_rules_safe_cells(6, observations)
+        assert old <= world.safe_cells, seed
+        found += len(world.safe_cells)
+        local += len(old)
+    assert found > local
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from metrics import (EPISODE_COLUMNS, ColumnStore, Downsampler, QuantileSketch, RunningStats,
+                     TrainingMetrics, WindowedRate, load_columns)
+
+
+def test_running_stats_match_numpy():
+    values = np.random.default_rng(0).normal(3, 2, 1000)
+    one, many = RunningStats(), RunningStats()
+    for v in values:
+        one.update(v)
+    many.update_many(values[:300])
+    many.update_many(values[300:])
+    for stats in (one, many):
+        assert stats.count == len(values)
+        assert stats.mean == pytest.approx(values.mean())
+        assert stats.std == pytest.approx(values.std(ddof=1))
+        assert (stats.min, stats.max) == (values.min(), values.max())
+
+
+def test_quantile_sketch_is_within_its_relative_accuracy():
+    values = np.random.default_rng(1).lognormal(0, 2, 5000) * np.where(
+        np.arange(5000) % 3, 1, -1)
+    sketch = QuantileSketch(quantiles=(0.1, 0.5, 0.99), relative_accuracy=0.01)
+    for v in values:
+        sketch.update(v)
+    for q in (0.1, 0.5, 0.99):
+        exact = np.quantile(values, q, method='lower')
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.021)
+
+
+def test_windowed_rate_counts_the_last_window_only():
+    rate = WindowedRate(4)
+    for value in (1, 1, 1, 1, 0, 0):
+        rate.update(value)
+    assert rate.rate == 0.5
+
+
+def test_downsampler_keeps_envelope_and_mean():
+    values = np.random.default_rng(2).random(10_000)
+    sampler = Downsampler(64)
+    for v in values:
+        sampler.update(v)
+    x, mean, low, high = sampler.series()
+    assert len(x) <= 64
+    assert low.min() == values.min() and high.max() == values.max()
+    assert np.all((low <= mean) & (mean <= high))
+    assert mean.mean() == pytest.approx(values.mean(), abs=0.02)
+
+
+def test_column_store_reads_back_and_appends_to_an_existing_store(tmp_path):
+    rng = np.random.default_rng(3)
+    first = rng.random(10)
+    store = ColumnStore(tmp_path, {'a': np.float64, 'b': np.int32}, chunk_size=4)
+    store.extend(a=first, b=np.arange(10))
+    np.testing.assert_array_equal(store.read('a', 2, 9), first[2:9])
+    store.flush()
+
+    # Reopening must not wipe the rows already there
+    again = ColumnStore(tmp_path, {'a': np.float64, 'b': np.int32}, chunk_size=4)
+    assert len(again) == 10
+    again.append(a=0.5, b=10)
+    again.flush()
+    columns = load_columns(tmp_path)
+    np.testing.assert_array_equal(columns['a'], np.append(first, 0.5))
+    np.testing.assert_array_equal(columns['b'], np.arange(11))
+
+    assert len(ColumnStore(tmp_path, {'a': np.float64, 'b': np.int32}, reset=True)) == 0
+    with pytest.raises(ValueError):
+        ColumnStore(tmp_path, {'a': np.float32})
+
+
+def test_training_metrics_rows_count_from_the_start_of_the_run(tmp_path):
+    def run(rewards):
+        metrics = TrainingMetrics(4, directory=tmp_path, chunk_size=8)
+        n = len(rewards)
+        metrics.record_many(np.asarray(rewards, dtype=np.float32), np.ones(n, dtype=np.int32),
+                            np.zeros(n, dtype=np.uint8), np.zeros(n, dtype=np.uint8),
+                            np.zeros(n, dtype=np.float32))
+        metrics.flush()
+        return metrics
+
+    run([1, 2, 3])
+    second = run([4, 5, 6, 7])
+    np.testing.assert_array_equal(second.rows(1, 3)['reward'], [5, 6])
+    assert set(second.rows(0)) == set(EPISODE_COLUMNS)
+    np.testing.assert_array_equal(load_columns(tmp_path)['reward'], [1, 2, 3, 4, 5, 6, 7])
@@ -0,0 +1,92 @@
+import heapq
+import random
+
+from planner import DStarLitePlanner, frontier_search
+
+
+def _dijkstra(n, source, cost):
+    """Cheapest cost from source to every cell, paying cost(idx) on entering idx"""
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    while heap:
+        d, idx = heapq.heappop(heap)
+        if d > dist[idx]:
+            continue
+        x, y = divmod(idx, n)
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if 0 <= nx < n and 0 <= ny < n:
+                nidx = nx * n + ny
+                if d + cost(nidx) < dist.get(nidx, float('inf')):
+                    dist[nidx] = d + cost(nidx)
+                    heapq.heappush(heap, (dist[nidx], nidx))
+    return dist
+
+
+def _path_cost(n, start, path, cost):
+    steps = [start] + path
+    for (ax, ay), (bx, by) in zip(steps, steps[1:]):
+        assert abs(ax - bx) + abs(ay - by) == 1
+    return sum(cost(x * n + y) for x, y in path)
+
+
+def test_dstar_lite_repairs_match_a_fresh_search():
+    rng = random.Random(0)
+    n = 12
+    for _ in range(20):
+        costs = [1 + rng.choice((0, 0, 0, 0.5, 3, 8)) for _ in range(n * n)]
+        goal = (rng.randrange(n), rng.randrange(n))
+        planner = DStarLitePlanner(n, goal, costs.__getitem__)
+        start = (rng.randrange(n), rng.randrange(n))
+        for _ in range(30):
+            path = planner.plan(start)
+            best = _dijkstra(n, start[0] * n + start[1], costs.__getitem__)[goal[0] * n + goal[1]]
+            assert path[-1:] == ([goal] if start != goal else [])
+            assert _path_cost(n, start, path, costs.__getitem__) == best
+            # Move along the path and change the costs of a few cells
+            if path:
+                start = path[0]
+            changed = {(rng.randrange(n), rng.randrange(n)) for _ in range(rng.randrange(6))}
+            for x, y in changed:
+                costs[x * n + y] = 1 + rng.choice((0, 0.5, 3, 8))
+            planner.update_cells(changed)
+
+
+def test_dstar_lite_at_the_goal():
+    planner = DStarLitePlanner(4, (2, 2), lambda idx: 1)
+    assert planner.plan((2, 2)) == []
+    assert planner.plan((2, 0)) == [(2, 1), (2, 2)]
+
+
+def test_frontier_search_matches_dijkstra_per_target():
+    rng = random.Random(1)
+    n = 10
+    for _ in range(30):
+        costs = [1 + rng.choice((0, 0, 0.5, 3)) for _ in range(n * n)]
+        blocked = {rng.randrange(n * n) for _ in range(15)}
+        start = (rng.randrange(n), rng.randrange(n))
+        start_idx = start[0] * n + start[1]
+        blocked.discard(start_idx)
+        targets = {(rng.randrange(n), rng.randrange(n)) for _ in range(8)}
+
+        def cost(idx):
+            return float('inf') if idx in blocked else costs[idx]
+
+        found = frontier_search(start, targets, n, cost=costs.__getitem__,
+                                passable=lambda idx: idx not in blocked)
+        best = _dijkstra(n, start_idx, cost)
+        reachable = {t for t in targets if t != start
+                     and best.get(t[0] * n + t[1], float('inf')) < float('inf')}
+        assert set(found) == reachable
+        for (tx, ty), (distance, path_cost, first) in found.items():
+            target_idx = tx * n + ty
+            assert path_cost == best[target_idx]
+            assert distance >= abs(tx - start[0]) + abs(ty - start[1])
+            # The path really starts with first and continues at the same total cost
+            first_idx = first[0] * n + first[1]
+            assert abs(first[0] - start[0]) + abs(first[1] - start[1]) == 1
+            assert cost(first_idx) + _dijkstra(n, first_idx, cost)[target_idx] == path_cost
+
+
+def test_frontier_search_without_costs_counts_moves():
+    found = frontier_search((0, 0), {(3, 0), (0, 2), (0, 0)}, 4)
+    assert found == {(3, 0): (3, 3, (1, 0)), (0, 2): (2, 2, (0, 1))}
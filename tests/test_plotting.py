@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from metrics import TrainingMetrics
+from plotting import lttb, minmax_downsample, render_heatmap, render_progress
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    rng = np.random.default_rng(0)
+    x = np.arange(10_000, dtype=np.float64)
+    y = rng.normal(0, 0.1, len(x))
+    y[6_543] = 50.0
+    bx, by = lttb(x, y, 300)
+    assert len(bx) == 300
+    assert (bx[0], bx[-1]) == (x[0], x[-1])
+    assert (np.diff(bx) > 0).all()
+    np.testing.assert_array_equal(by, y[bx.astype(np.int64)])
+    assert 6_543 in bx
+
+
+def test_lttb_leaves_short_series_alone():
+    x, y = np.arange(5.0), np.arange(5.0) ** 2
+    assert lttb(x, y, 10) == (x, y)
+    assert lttb(x, y, 2) == (x, y)
+
+
+def test_minmax_downsample_keeps_each_bucket_envelope():
+    rng = np.random.default_rng(1)
+    x = np.arange(1_003, dtype=np.float64)
+    low = rng.normal(size=len(x))
+    high = low + rng.random(len(x))
+    bx, blow, bhigh = minmax_downsample(x, low, high, 10)
+    edges = np.linspace(0, len(x), 11).astype(np.int64)
+    for i, (start, stop) in enumerate(zip(edges[:-1], edges[1:])):
+        assert blow[i] == low[start:stop].min()
+        assert bhigh[i] == high[start:stop].max()
+        assert x[start] <= bx[i] <= x[stop - 1]
+    assert minmax_downsample(x, low, high, 2_000)[1] is low
+
+
+def test_renders_training_plots(tmp_path):
+    pytest.importorskip("matplotlib")
+    import matplotlib
+    matplotlib.use("Agg")
+
+    metrics = TrainingMetrics(4, plot_points=64)
+    rng = np.random.default_rng(2)
+    for _ in range(1_000):
+        metrics.record(float(rng.normal()), int(rng.integers(1, 100)), False,
+                       bool(rng.random() < 0.2), 0.3)
+    snapshot = {'series': {name: s.series() for name, s in metrics.series.items()},
+                'window': metrics.recent_success.window}
+    render_progress(snapshot, tmp_path, points=50)
+    render_heatmap(np.eye(4), tmp_path)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["exploration_heatmap.png",
+                                                          "training_progress.png"]
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+import vector_env
+from q_learning import QLearner, QTableAgent
+from state_encoding import ENCODING_VERSION, num_states, world_state
+from trainer_agent import WumpusAgentTrainer
+from vector_env import ACTIONS, LOSE, TIMEOUT, WIN
+from wumpus_world import WumpusWorld
+
+
+def _reference_update(q, learning_rate, discount, transitions):
+    """Mean-TD update, one (state, action) entry at a time"""
+    q = q.astype(np.float64)
+    errors = {}
+    for s, a, r, s2, done in transitions:
+        target = r + (0.0 if done else discount * q[s2].max())
+        errors.setdefault((s, a), []).append(target - q[s, a])
+    for (s, a), errs in errors.items():
+        q[s, a] += learning_rate * np.mean(errs)
+    return q
+
+
+def test_batch_update_moves_each_entry_by_its_mean_td_error():
+    rng = np.random.default_rng(0)
+    learner = QLearner(2, learning_rate=0.3, discount_factor=0.9, seed=0)
+    learner.q_table[:] = rng.normal(size=learner.q_table.shape)
+    # Few distinct states, so the batch has plenty of repeated pairs
+    states = rng.integers(0, 8, size=200)
+    actions = rng.integers(0, len(ACTIONS), size=200)
+    rewards = rng.normal(size=200)
+    next_states = rng.integers(0, 8, size=200)
+    dones = rng.random(200) < 0.2
+    expected = _reference_update(learner.q_table, 0.3, 0.9,
+                                 zip(states, actions, rewards, next_states, dones))
+    errors = learner.update(states, actions, rewards, next_states, dones)
+    assert errors.shape == (200,)
+    np.testing.assert_allclose(learner.q_table, expected, rtol=1e-5, atol=1e-5)
+
+
+def test_single_transition_is_one_td_step():
+    learner = QLearner(2, learning_rate=0.5, discount_factor=0.9)
+    learner.q_table[7] = [0, 4, 0, 0, 0, 0]
+    for _ in range(3):  # Copies of one transition count once
+        learner.update(np.array([3, 3, 3]), np.array([2, 2, 2]), np.array([1.0] * 3),
+                       np.array([7] * 3), np.array([False] * 3))
+    # 0 -> 2.3 -> 3.45 -> 4.025, each step half way to 1 + 0.9 * 4
+    assert learner.q_table[3, 2] == pytest.approx(4.025)
+    errors = learner.update(np.array([3]), np.array([2]), np.array([0.0]), np.array([0]),
+                             np.array([True]), weights=np.array([0.5]))
+    assert errors[0] == pytest.approx(-4.025)
+    assert learner.q_table[3, 2] == pytest.approx(4.025 - 0.5 * 0.5 * 4.025)
+
+
+def test_only_wins_and_deaths_are_terminal(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    statuses, terminals = [], []
+    step, update = vector_env.VectorWumpusWorld.step, QLearner.update
+
+    def record_step(env, actions):
+        env.max_steps = 10  # So that some episodes time out
+        result = step(env, actions)
+        statuses.append(result[3].copy())
+        return result
+
+    def record_update(learner, *transitions, weights=None):
+        terminals.append(transitions[4].copy())
+        return update(learner, *transitions, weights=weights)
+
+    monkeypatch.setattr(vector_env.VectorWumpusWorld, "step", record_step)
+    monkeypatch.setattr(QLearner, "update", record_update)
+    trainer = WumpusAgentTrainer(grid_size=4, num_episodes=60, seed=0, metrics_dir=None)
+    trainer.train_q_learning(num_envs=16, replay=False)
+    statuses, terminals = np.concatenate(statuses), np.concatenate(terminals)
+    assert (statuses == TIMEOUT).any()
+    np.testing.assert_array_equal(terminals, (statuses == WIN) | (statuses == LOSE))
+
+
+def test_act_is_greedy_without_exploration():
+    learner = QLearner(2, seed=0)
+    learner.q_table[:, 4] = 1.0
+    assert (learner.act(np.arange(20)) == 4).all()
+    explored = learner.act(np.zeros(2_000, dtype=np.int64), exploration_rate=1.0)
+    assert set(explored) == set(range(len(ACTIONS)))
+
+
+def test_saved_model_plays_its_table():
+    learner = QLearner(4)
+    model = learner.model()
+    assert model['state_encoding'] == ENCODING_VERSION
+    assert learner.q_table.shape == (num_states(4), len(ACTIONS))
+    world = WumpusWorld(4, seed=0)
+    learner.q_table[world_state(world), 1] = 1.0
+    assert QTableAgent(world, model).decide_action() == 'turn_left'
+    with pytest.raises(ValueError):
+        QTableAgent(WumpusWorld(5, seed=0), model)
+    with pytest.raises(ValueError):
+        QTableAgent(world, {**model, 'state_encoding': ENCODING_VERSION + 1})
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from replay_buffer import PrioritizedReplayBuffer, SumTree
+
+
+def test_sum_tree_finds_leaves_by_prefix_sum():
+    rng = np.random.default_rng(0)
+    tree = SumTree(100)
+    priorities = rng.random(100).astype(np.float32)
+    tree.update(np.arange(100), priorities)
+    tree.update([5, 5, 7], [9.0, 2.0, 0.0])  # The last write wins
+    priorities[5], priorities[7] = 2.0, 0.0
+    assert tree.total == pytest.approx(priorities.sum(), rel=1e-5)
+    values = rng.random(10_000) * float(tree.total)
+    expected = np.searchsorted(np.cumsum(priorities, dtype=np.float64), values, side='right')
+    found = tree.find(values)
+    # Float32 node sums may shift a value sitting right on a boundary by one leaf
+    assert (found == np.minimum(expected, 99)).mean() > 0.999
+    assert 7 not in found  # Zero priority is never sampled
+
+
+def _buffer(capacity, count, seed=0):
+    buffer = PrioritizedReplayBuffer(capacity, alpha=0.6, beta=0.4, seed=seed)
+    ids = np.arange(count)
+    buffer.add(ids, ids % 6, ids.astype(np.float32), ids + 1, ids % 7 == 0)
+    return buffer
+
+
+def test_sampling_follows_priorities():
+    buffer = _buffer(64, 64)
+    td_errors = np.random.default_rng(1).exponential(size=64)
+    buffer.update_priorities(np.arange(64), td_errors)
+    expected = (np.abs(td_errors) + buffer.epsilon) ** buffer.alpha
+    expected /= expected.sum()
+
+    counts = np.zeros(64)
+    for _ in range(400):
+        indices, weights, (states, actions, rewards, next_states, dones) = buffer.sample(256)
+        np.testing.assert_array_equal(states, indices)
+        np.testing.assert_array_equal(next_states, indices + 1)
+        probabilities = expected[indices]
+        reference = (64 * probabilities) ** -buffer.beta
+        np.testing.assert_allclose(weights, reference / reference.max(), rtol=1e-4)
+        counts += np.bincount(indices, minlength=64)
+    frequencies = counts / counts.sum()
+    np.testing.assert_allclose(frequencies, expected, rtol=0.05, atol=2e-4)
+
+
+def test_ring_keeps_the_newest_transitions():
+    buffer = _buffer(50, 30)
+    nbytes = buffer.nbytes
+    ids = np.arange(30, 130)
+    buffer.add(ids, ids % 6, ids.astype(np.float32), ids + 1, ids % 7 == 0)
+    assert len(buffer) == 50 and buffer.nbytes == nbytes
+    assert sorted(buffer.states) == list(range(80, 130))
+    indices, _, (states, *_) = buffer.sample(500)
+    assert states.min() >= 80
+
+
+def test_new_transitions_get_the_largest_priority():
+    buffer = _buffer(8, 4)
+    buffer.update_priorities(np.arange(4), np.array([10.0, 0.0, 0.0, 0.0]))
+    ids = np.array([4])
+    buffer.add(ids, ids, ids.astype(np.float32), ids, ids == 0)
+    leaves = buffer.tree.nodes[buffer.tree.leaves:]
+    assert leaves[4] == pytest.approx(leaves[0]) and leaves[4] == leaves.max()
+
+
+def test_empty_buffer_refuses_to_sample():
+    with pytest.raises(ValueError):
+        PrioritizedReplayBuffer(8).sample(4)
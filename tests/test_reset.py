@@ -0,0 +1,94 @@
+import random
+
+import numpy as np
+import pytest
+
+from agent import WumpusAgent
+from headless import apply_action, make_agent, reset_agent, run_episode
+from storage import STORAGE_ENGINES
+from world_bank import WorldBank, generate_bank
+from wumpus_world import WumpusWorld
+
+
+def _world_state(world):
+    return {
+        'layout': world.layout().tobytes(),
+        'agent': (world.agent_pos, world.agent_dir, world.has_gold, world.has_arrow,
+                  world.wumpus_alive),
+        'percepts': world.percepts,
+        'fields': (world.breeze_field.tobytes(), world.stench_field.tobytes()),
+        'sets': (world.visited, world.safe_cells, world.frontier, world.breezy_cells,
+                 world.stenchy_cells),
+        'knowledge': {pos: dict(world.knowledge_base[pos]) for pos in world.knowledge_base},
+        'clauses': dict(world.clauses.value),
+    }
+
+
+def _agent_state(agent):
+    return {
+        'sets': (agent.visited, agent.safe_cells, agent.frontier),
+        'knowledge': {pos: dict(agent.knowledge_base[pos]) for pos in agent.knowledge_base},
+        'metrics': {k: dict(v) if k == 'action_counts' else v for k, v in agent.metrics.items()},
+        'planned_path': agent.planned_path,
+        'history': agent.action_history,
+    }
+
+
+def _play(world, agent, steps=40):
+    agent.update_knowledge()
+    for _ in range(steps):
+        apply_action(world, agent.decide_action())
+        if world.is_game_over() != "continue":
+            break
+        agent.update_knowledge()
+        world.update_knowledge_base()
+
+
+@pytest.mark.parametrize("storage", STORAGE_ENGINES)
+def test_reset_matches_construction(storage):
+    random.seed(0)
+    world = WumpusWorld(5, storage=storage, seed=100)
+    agent = WumpusAgent(world)
+    for seed in range(15):
+        _play(world, agent)
+        world.reset(seed)
+        agent.reset()
+        fresh_world = WumpusWorld(5, storage=storage, seed=seed)
+        fresh_agent = WumpusAgent(fresh_world)
+        assert _world_state(world) == _world_state(fresh_world)
+        assert _agent_state(agent) == _agent_state(fresh_agent)
+        assert agent.conservatism == fresh_agent.conservatism
+
+
+def test_reset_from_a_world_bank(tmp_path):
+    path = tmp_path / "worlds.bank"
+    generate_bank(path, 10, grid_size=5, seed=0)
+    bank = WorldBank(path)
+    world = WumpusWorld.from_bank(bank, 0)
+    agent = WumpusAgent(world)
+    for i in range(1, 10):
+        _play(world, agent)
+        world.reset(cells=bank[i])
+        assert _world_state(world) == _world_state(WumpusWorld.from_bank(bank, i))
+        assert np.shares_memory(world.world.cells, bank.cells)
+
+
+def test_reused_world_and_agent_play_like_fresh_ones():
+    # run_headless resets one world and agent between episodes
+    random.seed(0)
+    world = agent = None
+    reused = []
+    for episode in range(20):
+        if world is None:
+            world = WumpusWorld(4, seed=(2, episode))
+            agent = make_agent(world)
+        else:
+            world.reset((2, episode))
+            reset_agent(agent)
+        reused.append(run_episode(world, agent, max_steps=60))
+    random.seed(0)
+    fresh = []
+    for episode in range(20):
+        world = WumpusWorld(4, seed=(2, episode))
+        fresh.append(run_episode(world, WumpusAgent(world), max_steps=60))
+    assert reused == fresh
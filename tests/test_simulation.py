@@ -0,0 +1,76 @@
+import random
+import threading
+import time
+
+from agent import WumpusAgent
+from headless import step_agent
+from simulation import Simulation, WorldSnapshot
+from wumpus_world import WumpusWorld
+
+
+def _game(seed):
+    random.seed(seed)
+    world = WumpusWorld(6, seed=seed)
+    agent = WumpusAgent(world)
+    agent.update_knowledge()
+    return world, lambda: step_agent(world, agent)
+
+
+def _wait(simulation, timeout=10):
+    simulation._thread.join(timeout)
+    assert not simulation.running
+
+
+def test_runs_like_stepping_directly():
+    for seed in range(5):
+        world, step = _game(seed)
+        simulation = Simulation(world, step, max_steps=40).start()
+        _wait(simulation)
+        snapshot = simulation.latest()
+
+        direct, step = _game(seed)
+        steps = 0
+        while direct.is_game_over() == "continue" and steps < 40:
+            step()
+            steps += 1
+        assert snapshot.step == simulation.steps == steps
+        assert (snapshot.agent_pos, snapshot.agent_dir, snapshot.status) == \
+            (direct.agent_pos, direct.agent_dir, direct.is_game_over())
+        assert snapshot.visited == direct.visited
+
+
+def test_rate_limits_steps():
+    world, step = _game(0)
+    simulation = Simulation(world, lambda: None, rate=200, max_steps=20)
+    start = time.perf_counter()
+    simulation.start()
+    _wait(simulation)
+    assert time.perf_counter() - start >= 19 / 200
+    assert simulation.steps == 20
+
+
+def test_submitted_actions_run_on_the_simulation_thread_while_paused():
+    world, step = _game(0)
+    simulation = Simulation(world, step, max_steps=1000)
+    simulation.paused = True
+    simulation.start()
+    threads = []
+    simulation.submit(lambda: threads.append(threading.current_thread().name))
+    simulation.submit(world.turn_right)
+    deadline = time.perf_counter() + 5
+    while simulation.latest().agent_dir != "down" and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    simulation.stop()
+    assert threads == ["simulation"]
+    assert simulation.steps == 0
+    assert simulation.latest().agent_dir == "down"
+
+
+def test_snapshots_are_frozen_copies():
+    world = WumpusWorld(4, seed=0)
+    snapshot = WorldSnapshot(world, 0)
+    world.turn_right()
+    world.visited.add((3, 3))
+    world.world[1][1]["gold"] = not snapshot.world[1][1]["gold"]
+    assert snapshot.agent_dir == "right" and (3, 3) not in snapshot.visited
+    assert snapshot.world[1][1]["gold"] != world.world[1][1]["gold"]
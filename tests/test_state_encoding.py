@@ -0,0 +1,54 @@
+import itertools
+
+import numpy as np
+
+from agent import WumpusAgent
+from headless import apply_action, step_agent
+from state_encoding import (PERCEPT_BITS, decode_state, encode_state, env_states, num_states,
+                            world_state)
+from vector_env import ACTIONS, CONTINUE, DIRECTIONS, VectorWumpusWorld
+from wumpus_world import WumpusWorld
+
+
+def test_encoding_is_dense_and_round_trips():
+    n = 3
+    seen = set()
+    for x, y, d, gold, arrow, bits in itertools.product(range(n), range(n), DIRECTIONS,
+                                                        (0, 1), (0, 1), range(32)):
+        index = encode_state(n, (x, y), d, gold, arrow, bits)
+        seen.add(index)
+        pos, direction, has_gold, has_arrow, percepts = decode_state(n, index)
+        assert (pos, direction, has_gold, has_arrow) == ((x, y), d, gold, arrow)
+        assert encode_state(n, pos, direction, has_gold, has_arrow,
+                            dict(zip(PERCEPT_BITS, percepts))) == index
+        assert encode_state(n, (x, y), d, gold, arrow, np.uint8(bits)) == index
+    assert seen == set(range(num_states(n)))
+
+
+def test_agent_state_index_decodes_to_its_representation():
+    for seed in range(20):
+        world = WumpusWorld(4, seed=seed)
+        agent = WumpusAgent(world)
+        for _ in range(40):
+            assert decode_state(4, agent.get_state_index()) == agent.get_state_representation()
+            if world.is_game_over() != "continue":
+                break
+            step_agent(world, agent)
+
+
+def test_world_and_vector_env_agree_on_state_indices():
+    # Same layouts, same random actions: every step must map to the same state
+    rng = np.random.default_rng(0)
+    env = VectorWumpusWorld(1, grid_size=4, auto_reset=False)
+    for seed in range(300):
+        world = WumpusWorld(4, seed=seed)
+        env.reset(cells=world.layout()[None])
+        assert world_state(world) == env_states(env)[0]
+        for action in rng.integers(0, len(ACTIONS), size=60):
+            apply_action(world, ACTIONS[action])
+            _, _, _, status = env.step([action])
+            assert world_state(world) == env_states(env)[0], (seed, ACTIONS[action])
+            if status[0] != CONTINUE:
+                assert world.is_game_over() != "continue"
+                break
+            assert world.is_game_over() == "continue"
@@ -0,0 +1,103 @@
+import random
+
+import numpy as np
+import pytest
+
+from agent import WumpusAgent
+from headless import apply_action
+from storage import (GOLD, WUMPUS, BitfieldGrid, SparseAgentKnowledge, SparseKnowledge,
+                     SparseWorldKnowledge, WorldKnowledgeArray)
+from wumpus_world import WumpusWorld
+
+
+def _played(storage, seed, steps=60):
+    random.seed(seed)
+    world = WumpusWorld(grid_size=8, storage=storage, seed=seed)
+    agent = WumpusAgent(world)
+    agent.update_knowledge()
+    world.update_knowledge_base()
+    for _ in range(steps):
+        apply_action(world, agent.decide_action())
+        agent.update_knowledge()
+        world.update_knowledge_base()
+    return world, agent
+
+
+def _cells(kb):
+    return {pos: dict(kb[pos]) for pos in kb}
+
+
+@pytest.mark.parametrize("storage", ["array", "sparse"])
+def test_knowledge_matches_dict(storage):
+    for seed in range(10):
+        world, agent = _played(storage, seed)
+        dict_world, dict_agent = _played("dict", seed)
+        assert _cells(world.knowledge_base) == _cells(dict_world.knowledge_base)
+        beliefs, dict_beliefs = _cells(agent.knowledge_base), _cells(dict_agent.knowledge_base)
+        assert beliefs.keys() == dict_beliefs.keys()
+        for pos, cell in dict_beliefs.items():
+            # The array engine stores float32 probabilities
+            assert beliefs[pos]['visited'] == cell['visited']
+            assert beliefs[pos]['pit_prob'] == pytest.approx(cell['pit_prob'], abs=1e-6)
+            assert beliefs[pos]['wumpus_prob'] == pytest.approx(cell['wumpus_prob'], abs=1e-6)
+
+
+def test_bitfield_grid_reads_and_writes_like_dicts():
+    for seed in range(20):
+        grid = WumpusWorld(6, storage="array", seed=seed).world
+        assert isinstance(grid, BitfieldGrid)
+        assert grid.to_dicts() == WumpusWorld(6, storage="dict", seed=seed).world
+        np.testing.assert_array_equal(grid.pits, [[c["pit"] for c in col] for col in grid])
+    grid = BitfieldGrid.empty(3)
+    grid[1][2]["gold"] = True
+    grid[1][2]["pit"] = True
+    grid[1][2]["pit"] = False
+    assert dict(grid[1][2]) == {"pit": False, "wumpus": False, "gold": True}
+    assert grid.cells[1, 2] == GOLD
+    with pytest.raises(IndexError):
+        grid[3]
+
+
+def test_bitfield_grid_copies_read_only_cells_on_write():
+    cells = np.zeros((3, 3), dtype=np.uint8)
+    cells.flags.writeable = False
+    grid = BitfieldGrid(cells)
+    grid[0][1]["wumpus"] = True
+    assert grid.cells[0, 1] == WUMPUS and cells[0, 1] == 0
+
+
+def test_world_knowledge_array_facts():
+    kb = WorldKnowledgeArray(4)
+    cell = kb[(2, 3)]
+    assert dict(cell) == {"pit": "unknown", "wumpus": "unknown", "safe": False}
+    cell["pit"] = False
+    cell["wumpus"] = True
+    cell["safe"] = True
+    assert dict(kb[(2, 3)]) == {"pit": False, "wumpus": True, "safe": True}
+    cell["wumpus"] = "unknown"
+    assert kb[(2, 3)]["wumpus"] == "unknown" and kb[(2, 3)]["pit"] is False
+    with pytest.raises(KeyError):
+        kb[(4, 0)]
+
+
+def test_sparse_knowledge_stores_only_cells_with_evidence():
+    kb = SparseAgentKnowledge(1024)
+    assert len(kb) == 1024 * 1024 and not kb.cells
+    assert kb[(5, 7)]['pit_prob'] == pytest.approx(0.2)
+    assert kb[(0, 0)]['wumpus_prob'] == 0.0
+    assert not kb.cells  # Reads don't store anything
+    kb[(5, 7)]['visited'] = True
+    assert list(kb.cells) == [(5, 7)]
+    assert dict(kb[(5, 7)]) == {'pit_prob': 0.2, 'wumpus_prob': kb.wumpus_prior, 'visited': True}
+    assert kb.risk((5, 7)) == kb.risk((5, 8))
+    with pytest.raises(KeyError):
+        kb[(1024, 0)]
+    kb.clear()
+    assert not kb.cells
+
+
+def test_sparse_knowledge_needs_a_prior():
+    with pytest.raises(TypeError):
+        SparseKnowledge(4)
+    assert dict(SparseWorldKnowledge(4)[(1, 1)]) == {"pit": "unknown", "wumpus": "unknown",
+                                                     "safe": False}
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from trainer_agent import WumpusAgentTrainer, _train_shard
+
+
+@pytest.fixture
+def trainer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return WumpusAgentTrainer(grid_size=4, num_episodes=40, seed=5, metrics_dir=None)
+
+
+def _shard_task(trainer, first_episode, num_episodes, seed_seq):
+    return (trainer.grid_size, dict(trainer.hyperparams), trainer.seed, None, first_episode,
+            0.3, num_episodes, seed_seq, False)
+
+
+def test_shards_are_reproducible(trainer):
+    seeds = np.random.SeedSequence(5).spawn(2)
+    first = _train_shard(_shard_task(trainer, 0, 20, seeds[0]))
+    again = _train_shard(_shard_task(trainer, 0, 20, seeds[0]))
+    other = _train_shard(_shard_task(trainer, 20, 20, seeds[1]))
+    for key in ('rewards', 'steps', 'wins', 'gold', 'exploration', 'heatmap'):
+        np.testing.assert_array_equal(first[key], again[key])
+    assert (first['pit_deaths'], first['wumpus_deaths']) == \
+        (again['pit_deaths'], again['wumpus_deaths'])
+    assert not np.array_equal(first['rewards'], other['rewards'])
+
+
+def test_merged_shards_match_their_episodes(trainer):
+    seeds = np.random.SeedSequence(5).spawn(2)
+    shards = [_train_shard(_shard_task(trainer, 20 * i, 20, seeds[i])) for i in range(2)]
+    for shard in shards:
+        trainer._merge_shard(shard)
+    metrics = trainer.metrics
+    rewards = np.concatenate([s['rewards'] for s in shards]).astype(np.float64)
+    assert metrics.episodes == 40
+    assert metrics.stats['reward'].mean == pytest.approx(rewards.mean())
+    assert metrics.successes == sum(int(s['wins'].sum()) for s in shards)
+    assert metrics.pit_deaths + metrics.wumpus_deaths == \
+        sum(s['pit_deaths'] + s['wumpus_deaths'] for s in shards)
+    np.testing.assert_array_equal(metrics.heatmap, shards[0]['heatmap'] + shards[1]['heatmap'])
+    assert trainer._agent_from_shard(shards[1]).knowledge_base is shards[1]['knowledge_base']
+
+
+def test_parallel_exploration_follows_the_serial_schedule(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def exploration(workers):
+        trainer = WumpusAgentTrainer(grid_size=4, num_episodes=400, seed=5,
+                                     metrics_dir=f"metrics_{workers}")
+        trainer.train(workers=workers)
+        trainer.metrics.flush()
+        return trainer.metrics.rows(0)['exploration'].reshape(4, 100)
+
+    serial, parallel = exploration(1), exploration(4)
+    # The first shard runs the serial schedule itself, on other random
+    # episodes; the later ones must pick up where it left off
+    assert parallel[0, 0] == pytest.approx(serial[0, 0], abs=0.01)
+    np.testing.assert_allclose(parallel[1:].mean(axis=1), serial[1:].mean(axis=1), atol=0.005)
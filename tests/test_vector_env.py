@@ -0,0 +1,72 @@
+import numpy as np
+
+from vector_env import (ACTIONS, CONTINUE, LOSE, TIMEOUT, TURN_LEFT, WIN, VectorWumpusWorld,
+                        percepts_to_dict)
+from wumpus_world import WumpusWorld
+
+
+def _world_step(world, action, visited):
+    """Reward of one WumpusWorld step under the vector env's reward rules"""
+    reward = -1.0
+    if action == 'forward':
+        moved = world.move_forward()
+        reward = -0.2 if moved else -2.0
+        if moved and world.agent_pos not in visited:
+            visited.add(world.agent_pos)
+            reward += 5.0
+    elif action in ('turn_left', 'turn_right'):
+        getattr(world, action)()
+        reward = -0.1
+    elif action == 'grab':
+        reward = 300.0 if world.grab_gold() else -5.0
+    elif action == 'shoot':
+        reward = 100.0 if world.shoot_arrow() else -20.0
+    else:
+        world.climb()
+    if world.is_game_over() == 'win':
+        reward += 1000.0
+    return reward
+
+
+def test_rewards_and_status_match_wumpus_world():
+    rng = np.random.default_rng(1)
+    env = VectorWumpusWorld(1, grid_size=4, auto_reset=False)
+    outcomes = set()
+    for seed in range(200):
+        world = WumpusWorld(4, seed=seed)
+        env.reset(cells=world.layout()[None])
+        visited = {(0, 0)}
+        for action in rng.choice(len(ACTIONS), size=80, p=[.4, .15, .15, .1, .1, .1]):
+            expected = _world_step(world, ACTIONS[action], visited)
+            percepts, rewards, dones, status = env.step([action])
+            assert rewards[0] == expected
+            assert percepts_to_dict(percepts[0]) == world.percepts
+            outcome = world.is_game_over()
+            assert status[0] == {'continue': CONTINUE, 'win': WIN, 'lose': LOSE}[outcome]
+            if dones[0]:
+                outcomes.add(outcome)
+                break
+    assert outcomes == {'win', 'lose'}
+
+
+def test_finished_worlds_reset_in_place():
+    env = VectorWumpusWorld(64, grid_size=4, max_steps=5, seed=0)
+    for _ in range(4):
+        _, _, dones, _ = env.step(np.full(64, TURN_LEFT))
+        assert not dones.any()
+    pits = env.pits.copy()
+    percepts, rewards, dones, status = env.step(np.full(64, TURN_LEFT))
+    assert dones.all() and (status == TIMEOUT).all()
+    assert (rewards == -0.1).all()
+    assert (env.steps == 0).all() and (env.agent_dir == 0).all() and env.has_arrow.all()
+    assert not np.array_equal(env.pits, pits)  # Fresh layouts
+    assert not env.pits[:, 0, 0].any() and not env.wumpus[:, 0, 0].any()
+    assert (env.wumpus.reshape(64, -1).sum(axis=1) == 1).all()
+    np.testing.assert_array_equal(percepts, env._observe(env._env_ids))
+
+
+def test_seed_gives_the_same_worlds():
+    a = VectorWumpusWorld(32, grid_size=6, seed=7)
+    b = VectorWumpusWorld(32, grid_size=6, seed=7)
+    for name in ('pits', 'wumpus', 'gold', 'breeze', 'stench'):
+        np.testing.assert_array_equal(getattr(a, name), getattr(b, name))
@@ -0,0 +1,46 @@
+import os
+import random
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from agent import WumpusAgent  # noqa: E402
+from headless import apply_action  # noqa: E402
+from visualization import GameVisualization  # noqa: E402
+from wumpus_world import WumpusWorld  # noqa: E402
+
+
+def _pixels(surface):
+    return pygame.image.tobytes(surface, "RGB")
+
+
+def _full_redraw(world):
+    view = GameVisualization(world)
+    view.draw_world()
+    return _pixels(view.screen)
+
+
+def test_dirty_regions_match_a_full_redraw():
+    for seed in range(3):
+        random.seed(seed)
+        world = WumpusWorld(4, seed=seed)
+        agent = WumpusAgent(world)
+        view = GameVisualization(world)
+        view.draw_world()
+        for step in range(25):
+            agent.update_knowledge()
+            world.update_knowledge_base()
+            apply_action(world, agent.decide_action())
+            if step % 3 == 0:
+                # Overlays must be uncovered again by the next frame
+                view.draw_world(present=False)
+                view.draw_metrics({'step': step})
+                view.present()
+            view.draw_world()
+            frame = _pixels(view.screen)
+            assert frame == _full_redraw(world), (seed, step)
+            if world.is_game_over() != "continue":
+                break
+    pygame.quit()
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from storage import GOLD, PIT, STORAGE_ENGINES, WUMPUS
+from world_bank import WorldBank, generate_bank, random_cells
+from wumpus_world import WumpusWorld
+
+
+def test_seed_gives_the_same_layout_on_every_engine():
+    for seed in range(20):
+        layouts = [WumpusWorld(5, storage=s, seed=seed).layout() for s in STORAGE_ENGINES]
+        for layout in layouts[1:]:
+            np.testing.assert_array_equal(layout, layouts[0])
+    assert len({WumpusWorld(5, seed=s).layout().tobytes() for s in range(20)}) > 15
+
+
+def test_random_cells_are_valid_worlds():
+    cells = random_cells(np.random.default_rng(0), 6, count=500)
+    assert not cells[:, 0, 0].any()
+    assert ((cells & WUMPUS).reshape(500, -1).astype(bool).sum(axis=1) == 1).all()
+    assert ((cells & GOLD).reshape(500, -1).astype(bool).sum(axis=1) == 1).all()
+    assert 0.15 < (cells & PIT).astype(bool)[:, 1:, 1:].mean() < 0.25
+
+
+def test_bank_round_trips(tmp_path):
+    path = tmp_path / "worlds.bank"
+    generate_bank(path, 10, grid_size=5, seed=3, chunk=4)
+    rng = np.random.default_rng(3)
+    expected = np.concatenate([random_cells(rng, 5, count) for count in (4, 4, 2)])
+    bank = WorldBank(path)
+    assert (len(bank), bank.grid_size) == (10, 5)
+    np.testing.assert_array_equal(bank.cells, expected)
+    for i in range(10):
+        np.testing.assert_array_equal(WumpusWorld.from_bank(bank, i).layout(), bank[i])
+        np.testing.assert_array_equal(WumpusWorld.from_bank(bank, i, "dict").layout(), bank[i])
+
+
+def test_bank_worlds_copy_on_write(tmp_path):
+    path = tmp_path / "worlds.bank"
+    generate_bank(path, 1, grid_size=4, seed=0)
+    bank = WorldBank(path)
+    world = WumpusWorld.from_bank(bank, 0)
+    assert np.shares_memory(world.world.cells, bank.cells)
+    x, y = map(int, np.argwhere(bank[0] & GOLD)[0])
+    world.agent_pos = (x, y)
+    assert world.grab_gold()
+    assert bank[0][x, y] & GOLD and not world.layout()[x, y] & GOLD
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not.bank"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        WorldBank(path)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from storage import STORAGE_ENGINES, neighbour_field
+from wumpus_world import WumpusWorld
+
+
+def _brute_force_percepts(world, x, y):
+    stench = breeze = False
+    for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+        if 0 <= nx < world.grid_size and 0 <= ny < world.grid_size:
+            breeze |= world.world[nx][ny]["pit"]
+            stench |= world.world[nx][ny]["wumpus"] and world.wumpus_alive
+    return stench, breeze
+
+
+@pytest.mark.parametrize("storage", STORAGE_ENGINES)
+def test_percept_fields_match_neighbour_scan(storage):
+    for seed in range(20):
+        world = WumpusWorld(6, storage=storage, seed=seed)
+        for x in range(6):
+            for y in range(6):
+                world.agent_pos = (x, y)
+                percepts = world.get_percepts()
+                assert (percepts["stench"], percepts["breeze"]) == \
+                    _brute_force_percepts(world, x, y)
+                assert percepts["glitter"] == world.world[x][y]["gold"]
+
+
+def test_stench_goes_with_the_wumpus():
+    # A Wumpus along the bottom row dies to the first arrow, shot facing right
+    seed = next(s for s in range(1000)
+                if any(WumpusWorld(4, seed=s).world[x][0]["wumpus"] for x in range(1, 4)))
+    world = WumpusWorld(4, seed=seed)
+    assert world.stench_field.any()
+    assert world.shoot_arrow()
+    assert world.percepts["scream"]
+    assert not world.stench_field.any()
+    for x in range(4):
+        for y in range(4):
+            world.agent_pos = (x, y)
+            assert not world.get_percepts()["stench"]
+
+
+def test_neighbour_field_matches_brute_force():
+    rng = np.random.default_rng(0)
+    mask = rng.random((5, 7, 7)) < 0.2
+    expected = np.zeros_like(mask)
+    for e, x, y in zip(*np.nonzero(mask)):
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if 0 <= nx < 7 and 0 <= ny < 7:
+                expected[e, nx, ny] = True
+    np.testing.assert_array_equal(neighbour_field(mask), expected)
@@ -1,29 +1,37 @@
 import numpy as np
-import matplotlib.pyplot as plt
 from collections import defaultdict, deque
 import random
-import pickle
+import copy
+import io
 import os
-from tqdm import tqdm
 from agent import WumpusAgent
+from checkpoint import CheckpointWriter
+from episode_trace import TraceWriter
+from metrics import TrainingMetrics
+from plotting import PlotWorker
+from q_learning import QLearner
+from replay_buffer import PrioritizedReplayBuffer
+from state_encoding import env_states, num_states
+from world_bank import WorldBank
 from wumpus_world import WumpusWorld
 
 class WumpusAgentTrainer:
-    def __init__(self, grid_size=4, num_episodes=1000):
+    def __init__(self, grid_size=4, num_episodes=1000, seed=None, world_bank=None,
+                 trace_path=None, metrics_dir="training_metrics"):
+        self.world_bank = WorldBank(world_bank) if world_bank else None
+        if self.world_bank is not None:
+            grid_size = self.world_bank.grid_size
         self.grid_size = grid_size
         self.num_episodes = num_episodes
+        self.seed = seed
+        self.trace_path = trace_path  # Episode trace file every episode is appended to
+        self._checkpoint_writer = None  # Started by the first checkpoint
+        self._checkpointed_episodes = 0
+        self._plot_worker = None  # Started by the first plot
         
-        # Training metrics storage
-        self.metrics = {
-            'episode_rewards': [],
-            'steps_per_episode': [],
-            'success_rate': [],
-            'exploration_rate': [],
-            'gold_retrieval_rate': [],
-            'pit_deaths': 0,
-            'wumpus_deaths': 0,
-            'heatmap': np.zeros((grid_size, grid_size))
-        }
+        # Training metrics: streaming aggregates, plot series and, under
+        # metrics_dir, the raw per-episode rows
+        self.metrics = TrainingMetrics(grid_size, directory=metrics_dir)
         
         # Hyperparameters
         self.hyperparams = {
@@ -32,6 +40,11 @@ class WumpusAgentTrainer:
             'exploration_decay': 0.9995,
             'learning_rate': 0.1,
             'discount_factor': 0.95,
+            # Prioritised replay for Q-learning
+            'replay_capacity': 1_000_000,
+            'replay_batch': 1024,
+            'replay_alpha': 0.6,
+            'replay_beta': 0.4,
             'conservatism': 0.7  # Risk aversion factor
         }
         
@@ -39,68 +52,324 @@ class WumpusAgentTrainer:
         os.makedirs("saved_models", exist_ok=True)
         os.makedirs("training_plots", exist_ok=True)
 
-    def train(self):
+    def train(self, workers=1):
+        if workers > 1:
+            return self._train_parallel(workers)
+
+        from tqdm import tqdm
+
         exploration_rate = self.hyperparams['initial_exploration']
-        successful_episodes = 0
+        trace = TraceWriter(self.trace_path) if self.trace_path else None
         
+        world = agent = None
         for episode in tqdm(range(self.num_episodes), desc="Training Agent"):
-            world = WumpusWorld(grid_size=self.grid_size)
-            agent = WumpusAgent(world)
-            agent.conservatism = self.hyperparams['conservatism']
-            
-            episode_reward = 0
-            steps = 0
-            gold_grabbed = False
-            done = False
-            
-            while not done and steps < 200:  # Max steps per episode
-                # Exploration vs Exploitation
-                if random.random() < exploration_rate:
-                    action = random.choice(['forward', 'turn_left', 'turn_right'])
-                else:
-                    action = agent.decide_action()
-                
-                # Execute action and get reward
-                reward, action_executed = self._execute_action(world, agent, action)
-                episode_reward += reward
-                steps += 1
-                
-                # Update heatmap
-                self.metrics['heatmap'][world.agent_pos] += 1
-                
-                # Check for gold collection
-                if action == 'grab' and world.has_gold:
-                    gold_grabbed = True
-                
-                # Check termination conditions
-                status = world.is_game_over()
-                if status != "continue":
-                    if status == "win":
-                        successful_episodes += 1
-                        reward += 1000  # Final success bonus
-                    done = True
-                
-                # Update agent knowledge
-                agent.update_knowledge()
-                
-                # Decrease exploration rate
-                exploration_rate = max(self.hyperparams['final_exploration'],
-                                    exploration_rate * self.hyperparams['exploration_decay'])
+            world, agent = self._episode_objects(episode, world, agent)
+
+            if trace is not None:
+                trace.begin_episode(world, episode, self.seed)
+            episode_reward, steps, gold_grabbed, status, exploration_rate = \
+                self._run_episode(world, agent, exploration_rate, self.metrics.heatmap, trace)
+            if trace is not None:
+                trace.end_episode(status)
             
             # Store episode metrics
-            self._update_metrics(world,episode_reward, steps, gold_grabbed, 
-                               successful_episodes, episode, status)
+            self._update_metrics(world, episode_reward, steps, gold_grabbed, status,
+                                 exploration_rate)
             
             # Save model periodically
             if (episode + 1) % 100 == 0:
                 self._save_model(agent, episode + 1)
                 self._generate_intermediate_plots()
         
+        if trace is not None:
+            trace.close()
+
         # Final training outputs
         self._save_final_model(agent)
         self._generate_final_report()
         return agent
 
+    def train_q_learning(self, num_envs=4096, replay=True):
+        """Tabular Q-learning on a VectorWumpusWorld of num_envs worlds.
+
+        Every world sees the serial exploration schedule: the rate decays once
+        per vectorised step, i.e. once per step of each world. Episodes are
+        recorded in the order they finish, and training stops once
+        num_episodes have finished. Returns the QLearner; its table is the
+        saved model.
+
+        With replay, every transition also goes to a PrioritizedReplayBuffer
+        and each step learns from one prioritised minibatch of it as well,
+        with beta annealed to 1 over the run.
+
+        Each step costs a fixed Python overhead plus the minibatch, whatever
+        the number of worlds, so throughput comes from a wide batch: a few
+        thousand worlds keep both small next to the env step itself.
+        """
+        from tqdm import tqdm
+        from vector_env import LOSE, VectorWumpusWorld, WIN
+
+        hp = self.hyperparams
+        env = VectorWumpusWorld(num_envs, grid_size=self.grid_size, seed=self.seed,
+                                auto_reset=False)
+        learner = QLearner(self.grid_size, hp['learning_rate'], hp['discount_factor'],
+                           seed=self.seed)
+        buffer = None
+        if replay:
+            buffer = PrioritizedReplayBuffer(
+                hp['replay_capacity'], hp['replay_alpha'], hp['replay_beta'],
+                state_dtype=np.min_scalar_type(num_states(self.grid_size) - 1), seed=self.seed)
+        exploration_rate = hp['initial_exploration']
+        episode_rewards = np.zeros(num_envs)
+        envs = np.arange(num_envs)
+        states = env_states(env)
+        done_episodes = 0
+
+        with tqdm(total=self.num_episodes, desc="Training Q-table") as progress:
+            while done_episodes < self.num_episodes:
+                actions = learner.act(states, exploration_rate)
+                _, rewards, dones, status = env.step(actions)
+                next_states = env_states(env)
+                # A timeout ends the episode but not the game, so it still bootstraps
+                terminal = (status == WIN) | (status == LOSE)
+                learner.update(states, actions, rewards, next_states, terminal)
+                if buffer is not None:
+                    buffer.add(states, actions, rewards, next_states, terminal)
+                    buffer.beta = hp['replay_beta'] + (1 - hp['replay_beta']) * \
+                        done_episodes / self.num_episodes
+                    indices, weights, batch = buffer.sample(hp['replay_batch'])
+                    buffer.update_priorities(indices, learner.update(*batch, weights=weights))
+                episode_rewards += rewards
+                np.add.at(self.metrics.heatmap, (env.agent_x, env.agent_y), 1)
+                exploration_rate = max(hp['final_exploration'],
+                                       exploration_rate * hp['exploration_decay'])
+
+                if dones.any():
+                    finished = envs[dones][:self.num_episodes - done_episodes]
+                    lost = finished[status[finished] == LOSE]
+                    pits = env.pits[lost, env.agent_x[lost], env.agent_y[lost]]
+                    self.metrics.pit_deaths += int(pits.sum())
+                    self.metrics.wumpus_deaths += int(len(lost) - pits.sum())
+                    self.metrics.record_many(episode_rewards[finished], env.steps[finished],
+                                             env.has_gold[finished], status[finished] == WIN,
+                                             np.full(len(finished), exploration_rate))
+                    previous = done_episodes
+                    done_episodes += len(finished)
+                    progress.update(len(finished))
+                    episode_rewards[dones] = 0
+                    env.reset(dones)
+                    next_states[dones] = env_states(env)[dones]
+
+                    # Save model whenever a multiple of 100 episodes was crossed
+                    if done_episodes // 100 > previous // 100:
+                        self._save_model(learner, done_episodes)
+                        self._generate_intermediate_plots()
+                states = next_states
+
+        self._save_final_model(learner)
+        self._generate_final_report()
+        return learner
+
+    def _make_world(self, episode):
+        """World for an episode: from the world bank if there is one, else
+        generated (reproducibly per episode when the trainer has a seed)"""
+        if self.world_bank is not None:
+            return WumpusWorld.from_bank(self.world_bank, episode % len(self.world_bank))
+        return WumpusWorld(grid_size=self.grid_size, seed=self._episode_seed(episode))
+
+    def _episode_seed(self, episode):
+        return None if self.seed is None else (self.seed, episode)
+
+    def _episode_objects(self, episode, world=None, agent=None):
+        """World and agent for an episode, reset in place when the previous
+        episode's are given rather than built again"""
+        if world is None:
+            world = self._make_world(episode)
+            agent = WumpusAgent(world)
+            agent.conservatism = self.hyperparams['conservatism']
+            return world, agent
+        if self.world_bank is not None:
+            world.reset(cells=self.world_bank[episode % len(self.world_bank)])
+        else:
+            world.reset(self._episode_seed(episode))
+        agent.reset()
+        return world, agent
+
+    def _run_episode(self, world, agent, exploration_rate, heatmap, trace=None):
+        """Play one episode; returns (reward, steps, gold_grabbed, status, exploration_rate).
+        Every step is recorded to `trace` (a TraceWriter) when one is given."""
+        episode_reward = 0
+        steps = 0
+        gold_grabbed = False
+        done = False
+        status = "continue"
+
+        while not done and steps < 200:  # Max steps per episode
+            # Exploration vs Exploitation
+            if random.random() < exploration_rate:
+                action = random.choice(['forward', 'turn_left', 'turn_right'])
+            else:
+                action = agent.decide_action()
+            
+            # Execute action and get reward
+            reward, action_executed = self._execute_action(world, agent, action)
+            episode_reward += reward
+            steps += 1
+            if trace is not None:
+                trace.record(world, action)
+            
+            # Update heatmap
+            heatmap[world.agent_pos] += 1
+            
+            # Check for gold collection
+            if action == 'grab' and world.has_gold:
+                gold_grabbed = True
+            
+            # Check termination conditions
+            status = world.is_game_over()
+            if status != "continue":
+                if status == "win":
+                    reward += 1000  # Final success bonus
+                done = True
+            
+            # Update agent knowledge
+            agent.update_knowledge()
+            
+            # Decrease exploration rate
+            exploration_rate = max(self.hyperparams['final_exploration'],
+                                exploration_rate * self.hyperparams['exploration_decay'])
+
+        return episode_reward, steps, gold_grabbed, status, exploration_rate
+
+    def _train_parallel(self, workers, shard_size=None):
+        """Shard episodes over a process pool and merge the per-shard aggregates.
+
+        Every shard gets its own seed from one SeedSequence, so a run is
+        reproducible for a given seed and shard size. A few shards per worker
+        are kept in flight and merged in episode order, so metrics have the
+        same layout as a serial run.
+
+        Exploration follows the serial schedule (one decay per step): a shard
+        starts from the rate the last merged shard ended at, decayed over the
+        episodes in between at the mean episode length so far. The first shard
+        runs alone as a pilot, so no shard starts from a guessed length.
+        """
+        import multiprocessing
+        from tqdm import tqdm
+
+        if shard_size is None:
+            shard_size = max(100, min(10000, self.num_episodes // (workers * 4) or 1))
+        starts = list(range(0, self.num_episodes, shard_size))
+        seeds = np.random.SeedSequence(self.seed).spawn(len(starts))
+        hp = self.hyperparams
+
+        def submit(pool, i):
+            exploration_rate = chained_rate
+            if starts[i] > done_episodes:
+                gap = (starts[i] - done_episodes) * self.metrics.stats['steps'].mean
+                exploration_rate = max(hp['final_exploration'],
+                                       exploration_rate * hp['exploration_decay'] ** gap)
+            task = (self.grid_size, dict(hp), self.seed, self.world_bank and self.world_bank.path,
+                    starts[i], exploration_rate,
+                    min(shard_size, self.num_episodes - starts[i]), seeds[i],
+                    trace is not None)
+            return pool.apply_async(_train_shard, (task,))
+
+        done_episodes = 0
+        chained_rate = hp['initial_exploration']
+        last = None
+        trace = TraceWriter(self.trace_path) if self.trace_path else None
+        with multiprocessing.Pool(workers) as pool, \
+                tqdm(total=self.num_episodes, desc="Training Agent") as progress:
+            in_flight = deque([submit(pool, 0)])
+            next_shard = 1
+            while in_flight:
+                shard = in_flight.popleft().get()
+                self._merge_shard(shard)
+                if trace is not None:
+                    trace.write_raw(shard['trace'])
+                previous = done_episodes
+                done_episodes += len(shard['rewards'])
+                chained_rate = float(shard['exploration'][-1])
+                last = shard
+                progress.update(len(shard['rewards']))
+                while next_shard < len(starts) and len(in_flight) < 2 * workers:
+                    in_flight.append(submit(pool, next_shard))
+                    next_shard += 1
+
+                # Save model whenever a multiple of 100 episodes was crossed
+                if done_episodes // 100 > previous // 100:
+                    self._save_model(self._agent_from_shard(last), done_episodes)
+                    self._generate_intermediate_plots()
+
+        if trace is not None:
+            trace.close()
+
+        agent = self._agent_from_shard(last)
+        self._save_final_model(agent)
+        self._generate_final_report()
+        return agent
+
+    def _merge_shard(self, shard):
+        """Fold one shard's aggregates into self.metrics"""
+        self.metrics.record_many(shard['rewards'], shard['steps'], shard['gold'], shard['wins'],
+                                 shard['exploration'])
+        self.metrics.pit_deaths += shard['pit_deaths']
+        self.metrics.wumpus_deaths += shard['wumpus_deaths']
+        self.metrics.heatmap += shard['heatmap']
+
+    def _agent_from_shard(self, shard):
+        """Rebuild a WumpusAgent around the knowledge a worker sent back"""
+        agent = WumpusAgent(WumpusWorld(grid_size=self.grid_size))
+        agent.knowledge_base = shard['knowledge_base']
+        agent.metrics = shard['agent_metrics']
+        agent.conservatism = self.hyperparams['conservatism']
+        return agent
+
+    def _run_shard(self, first_episode, exploration_rate, num_episodes, trace=None):
+        """Play a block of episodes and return compact aggregates only"""
+        hp = self.hyperparams
+        heatmap = np.zeros((self.grid_size, self.grid_size))
+        rewards = np.zeros(num_episodes, dtype=np.float32)
+        steps = np.zeros(num_episodes, dtype=np.int32)
+        wins = np.zeros(num_episodes, dtype=np.uint8)
+        gold = np.zeros(num_episodes, dtype=np.uint8)
+        exploration = np.zeros(num_episodes, dtype=np.float32)
+        pit_deaths = wumpus_deaths = 0
+
+        world = agent = None
+        for i in range(num_episodes):
+            world, agent = self._episode_objects(first_episode + i, world, agent)
+            if trace is not None:
+                trace.begin_episode(world, first_episode + i, self.seed)
+            reward, steps[i], gold_grabbed, status, exploration_rate = \
+                self._run_episode(world, agent, exploration_rate, heatmap, trace)
+            if trace is not None:
+                trace.end_episode(status)
+            rewards[i] = reward
+            exploration[i] = exploration_rate
+            wins[i] = status == "win"
+            gold[i] = gold_grabbed
+            if status == "lose":
+                x, y = world.agent_pos
+                if world.world[x][y]["pit"]:
+                    pit_deaths += 1
+                else:
+                    wumpus_deaths += 1
+
+        return {
+            'rewards': rewards,
+            'steps': steps,
+            'wins': wins,
+            'gold': gold,
+            'exploration': exploration,
+            'pit_deaths': pit_deaths,
+            'wumpus_deaths': wumpus_deaths,
+            'heatmap': heatmap,
+            'knowledge_base': agent.knowledge_base,
+            'agent_metrics': agent.metrics,
+        }
+
     def _execute_action(self, world, agent, action):
         """Execute action and return appropriate reward"""
         reward = -1  # Default step penalty
@@ -132,6 +401,8 @@ class WumpusAgentTrainer:
                 action_executed = True
             else:
                 reward = -20  # Missed shot penalty
+        elif action == "climb":
+            world.climb()
         
         # Additional reward shaping
         if action_executed:
@@ -146,104 +417,117 @@ class WumpusAgentTrainer:
         
         return reward, action_executed
 
-    def _update_metrics(self, world,reward, steps, gold_grabbed, successes, episode, status):
+    def _update_metrics(self, world, reward, steps, gold_grabbed, status, exploration_rate):
         """Store all training metrics"""
-        self.metrics['episode_rewards'].append(reward)
-        self.metrics['steps_per_episode'].append(steps)
-        self.metrics['success_rate'].append(successes / (episode + 1))
-        self.metrics['gold_retrieval_rate'].append(int(gold_grabbed))
+        self.metrics.record(reward, steps, gold_grabbed, status == "win", exploration_rate)
         
         if status == "lose":
             x, y = world.agent_pos
             if world.world[x][y]["pit"]:
-                self.metrics['pit_deaths'] += 1
+                self.metrics.pit_deaths += 1
             else:
-                self.metrics['wumpus_deaths'] += 1
+                self.metrics.wumpus_deaths += 1
+
+    def _checkpoints(self):
+        if self._checkpoint_writer is None:
+            self._checkpoint_writer = CheckpointWriter()
+        return self._checkpoint_writer
+
+    def _model_payload(self, agent):
+        """The trained model: a Q-table for Q-learning, else the agent's knowledge.
+        Copied, since training goes on changing them while the checkpoint is written."""
+        if isinstance(agent, QLearner):
+            return {**agent.model(), 'q_table': agent.q_table.copy()}
+        return {'knowledge_base': copy.deepcopy(agent.knowledge_base),
+                'metrics': copy.deepcopy(agent.metrics)}
 
     def _save_model(self, agent, episode):
-        """Save agent state periodically"""
-        filename = f"saved_models/agent_episode_{episode}.pkl"
-        with open(filename, 'wb') as f:
-            pickle.dump({
-                'knowledge_base': agent.knowledge_base,
-                'metrics': agent.metrics,
-                'hyperparameters': self.hyperparams,
-                'training_metrics': self.metrics
-            }, f)
+        """Queue a checkpoint holding the agent and the episode rows added since
+        the previous one; checkpoint.load_training_metrics chains them back"""
+        start = self._checkpointed_episodes
+        self._checkpoints().save(f"saved_models/agent_episode_{episode}.pkl", {
+            'episode': episode,
+            'first_episode': start,
+            **self._model_payload(agent),
+            'hyperparameters': dict(self.hyperparams),
+            'training_metrics_delta': self.metrics.rows(start, episode),
+            'training_summary': self.metrics.summary(),
+            'heatmap': self.metrics.heatmap.copy(),
+        })
+        self._checkpointed_episodes = episode
 
     def _save_final_model(self, agent):
-        """Save final trained agent"""
-        with open("saved_models/final_agent.pkl", 'wb') as f:
-            pickle.dump({
-                'knowledge_base': agent.knowledge_base,
-                'metrics': agent.metrics,
-                'hyperparameters': self.hyperparams,
-                'training_metrics': self.metrics
-            }, f)
+        """Save final trained agent, then wait for all checkpoints to be written"""
+        writer = self._checkpoints()
+        writer.save("saved_models/final_agent.pkl", {
+            **self._model_payload(agent),
+            'hyperparameters': self.hyperparams,
+            'training_metrics': self.metrics.summary(),
+            'heatmap': self.metrics.heatmap.copy(),
+        })
+        writer.close()
+        self.metrics.flush()
+        self._checkpoint_writer = None
+
+    def _plot_snapshot(self, final=False):
+        """Downsampled series (and the heatmap for the final report) for the plot worker"""
+        return {
+            'series': {name: series.series() for name, series in self.metrics.series.items()},
+            'window': self.metrics.recent_success.window,
+            'heatmap': self.metrics.heatmap.copy() if final else None,
+        }
 
     def _generate_intermediate_plots(self):
-        """Generate periodic training plots"""
-        plt.figure(figsize=(15, 10))
-        
-        # Reward tracking
-        plt.subplot(2, 2, 1)
-        plt.plot(self.metrics['episode_rewards'])
-        plt.title("Episode Rewards")
-        plt.xlabel("Episode")
-        plt.ylabel("Total Reward")
-        
-        # Success rate
-        plt.subplot(2, 2, 2)
-        plt.plot(self.metrics['success_rate'])
-        plt.title("Success Rate")
-        plt.xlabel("Episode")
-        plt.ylabel("Win Percentage")
-        plt.ylim(0, 1)
-        
-        # Steps per episode
-        plt.subplot(2, 2, 3)
-        plt.plot(self.metrics['steps_per_episode'])
-        plt.title("Steps per Episode")
-        plt.xlabel("Episode")
-        plt.ylabel("Steps")
-        
-        # Exploration rate
-        plt.subplot(2, 2, 4)
-        plt.plot(self.metrics['exploration_rate'])
-        plt.title("Exploration Rate")
-        plt.xlabel("Episode")
-        plt.ylabel("Rate")
-        
-        plt.tight_layout()
-        plt.savefig(f"training_plots/training_progress.png")
-        plt.close()
+        """Hand a snapshot to the background plot worker; dropped if it is still busy"""
+        if self._plot_worker is None:
+            self._plot_worker = PlotWorker("training_plots")
+        self._plot_worker.submit(self._plot_snapshot())
 
     def _generate_final_report(self):
         """Generate comprehensive final report"""
-        # Training curves
-        self._generate_intermediate_plots()
-        
-        # Heatmap visualization
-        plt.figure(figsize=(8, 8))
-        plt.imshow(self.metrics['heatmap'], cmap='hot', interpolation='nearest')
-        plt.title("Exploration Heatmap")
-        plt.colorbar()
-        plt.savefig("training_plots/exploration_heatmap.png")
-        plt.close()
+        # Training curves and heatmap, waiting for them to be drawn
+        if self._plot_worker is None:
+            self._plot_worker = PlotWorker("training_plots")
+        self._plot_worker.close(self._plot_snapshot(final=True))
+        self._plot_worker = None
         
         # Text summary
         with open("training_plots/summary.txt", "w") as f:
             f.write(f"Training Summary ({self.num_episodes} episodes)\n")
             f.write("="*50 + "\n")
-            f.write(f"Final Success Rate: {self.metrics['success_rate'][-1]:.2%}\n")
-            f.write(f"Gold Retrieval Rate: {np.mean(self.metrics['gold_retrieval_rate']):.2%}\n")
-            f.write(f"Average Steps per Episode: {np.mean(self.metrics['steps_per_episode']):.1f}\n")
-            f.write(f"Pit Deaths: {self.metrics['pit_deaths']}\n")
-            f.write(f"Wumpus Deaths: {self.metrics['wumpus_deaths']}\n\n")
+            summary = self.metrics.summary()
+            reward, steps = summary['reward'], summary['steps']
+            f.write(f"Final Success Rate: {summary['success_rate']:.2%}\n")
+            f.write(f"Success Rate (last {self.metrics.recent_success.window}): "
+                    f"{summary['recent_success_rate']:.2%}\n")
+            f.write(f"Gold Retrieval Rate: {summary['gold_retrieval_rate']:.2%}\n")
+            f.write(f"Average Steps per Episode: {steps['mean']:.1f} "
+                    f"(std {steps['std']:.1f}, p50 {steps['p50']:.0f}, p99 {steps['p99']:.0f})\n")
+            f.write(f"Average Reward: {reward['mean']:.1f} "
+                    f"(std {reward['std']:.1f}, p50 {reward['p50']:.1f}, p99 {reward['p99']:.1f})\n")
+            f.write(f"Pit Deaths: {summary['pit_deaths']}\n")
+            f.write(f"Wumpus Deaths: {summary['wumpus_deaths']}\n\n")
             f.write("Hyperparameters:\n")
             for k, v in self.hyperparams.items():
                 f.write(f"{k}: {v}\n")
 
+def _train_shard(task):
+    """Process-pool entry point: run one shard with its own RNG streams"""
+    (grid_size, hyperparams, seed, world_bank, first_episode, exploration_rate,
+     num_episodes, seed_seq, record_trace) = task
+    random.seed(int(seed_seq.generate_state(1)[0]))
+    np.random.seed(seed_seq.generate_state(1, dtype=np.uint32)[0])
+    trainer = WumpusAgentTrainer(grid_size=grid_size, seed=seed, world_bank=world_bank,
+                                 metrics_dir=None)
+    trainer.hyperparams = hyperparams
+    # Episodes are traced into memory and appended to the file by the parent, in order
+    buffer = io.BytesIO() if record_trace else None
+    trace = TraceWriter(buffer) if record_trace else None
+    shard = trainer._run_shard(first_episode, exploration_rate, num_episodes, trace)
+    if trace is not None:
+        shard['trace'] = buffer.getvalue()
+    return shard
+
 if __name__ == "__main__":
     trainer = WumpusAgentTrainer(num_episodes=1000)
     trained_agent = trainer.train()
\ No newline at end of file
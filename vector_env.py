@@ -0,0 +1,213 @@
+import numpy as np
+
+from storage import GOLD, PIT, WUMPUS, neighbour_field
+
+# Action ids shared by every batched component
+ACTIONS = ['forward', 'turn_left', 'turn_right', 'grab', 'shoot', 'climb']
+FORWARD, TURN_LEFT, TURN_RIGHT, GRAB, SHOOT, CLIMB = range(len(ACTIONS))
+ACTION_IDS = {name: i for i, name in enumerate(ACTIONS)}
+
+# Directions in clockwise order, so turning right is +1 and left is -1
+DIRECTIONS = ['right', 'down', 'left', 'up']
+DIRECTION_IDS = {name: i for i, name in enumerate(DIRECTIONS)}
+DX = np.array([1, 0, -1, 0], dtype=np.int64)
+DY = np.array([0, 1, 0, -1], dtype=np.int64)
+
+# Percept bits, in the same order as WumpusWorld.percepts
+STENCH, BREEZE, GLITTER, BUMP, SCREAM = 1, 2, 4, 8, 16
+PERCEPT_BITS = {'stench': STENCH, 'breeze': BREEZE, 'glitter': GLITTER,
+                'bump': BUMP, 'scream': SCREAM}
+
+# Episode status codes
+CONTINUE, WIN, LOSE, TIMEOUT = 0, 1, 2, 3
+
+
+def percepts_to_dict(bits):
+    """Expand one percept bitmask into the dict used by WumpusWorld"""
+    bits = int(bits)
+    return {name: bool(bits & bit) for name, bit in PERCEPT_BITS.items()}
+
+
+class VectorWumpusWorld:
+    """N independent Wumpus worlds stepped together as stacked NumPy arrays.
+
+    World contents live in (N, grid_size, grid_size) boolean masks indexed
+    [env, x, y] like WumpusWorld.world[x][y]. Rewards follow
+    WumpusAgentTrainer._execute_action, plus the +5 bonus for entering a new
+    cell and the +1000 bonus for reaching (0, 0) with the gold. Finished
+    worlds are regenerated in place on the next step when auto_reset is set.
+    """
+
+    def __init__(self, num_envs, grid_size=4, max_steps=200, pit_prob=0.2,
+                 seed=None, auto_reset=True):
+        self.num_envs = num_envs
+        self.grid_size = grid_size
+        self.max_steps = max_steps
+        self.pit_prob = pit_prob
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+
+        shape = (num_envs, grid_size, grid_size)
+        self.pits = np.zeros(shape, dtype=bool)
+        self.wumpus = np.zeros(shape, dtype=bool)
+        self.gold = np.zeros(shape, dtype=bool)
+        self.breeze = np.zeros(shape, dtype=bool)
+        self.stench = np.zeros(shape, dtype=bool)
+        self.visited = np.zeros(shape, dtype=bool)
+
+        self.wumpus_pos = np.zeros((num_envs, 2), dtype=np.int64)
+        self.agent_x = np.zeros(num_envs, dtype=np.int64)
+        self.agent_y = np.zeros(num_envs, dtype=np.int64)
+        self.agent_dir = np.zeros(num_envs, dtype=np.int64)
+        self.has_gold = np.zeros(num_envs, dtype=bool)
+        self.has_arrow = np.ones(num_envs, dtype=bool)
+        self.wumpus_alive = np.ones(num_envs, dtype=bool)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self.percepts = np.zeros(num_envs, dtype=np.uint8)
+        self._env_ids = np.arange(num_envs)
+
+        self.reset()
+
+    def reset(self, mask=None, cells=None):
+        """Regenerate the selected worlds (all by default) in place.
+
+        cells, a (count, grid_size, grid_size) array of PIT | WUMPUS | GOLD
+        bitfields such as WumpusWorld.layout() or WorldBank entries, gives
+        the selected worlds those layouts instead of random ones.
+        """
+        if mask is None:
+            envs = self._env_ids
+        else:
+            envs = self._env_ids[np.asarray(mask, dtype=bool)]
+        count = len(envs)
+        if count == 0:
+            return self.percepts
+
+        n = self.grid_size
+        if cells is None:
+            pits = self.rng.random((count, n, n)) < self.pit_prob
+            pits[:, 0, 0] = False
+
+            # Uniform over every cell except the start, no rejection loop needed
+            wumpus_idx = self.rng.integers(1, n * n, size=count)
+            gold_idx = self.rng.integers(1, n * n, size=count)
+
+            self.pits[envs] = pits
+            self.wumpus[envs] = False
+            self.gold[envs] = False
+            self.wumpus[envs, wumpus_idx // n, wumpus_idx % n] = True
+            self.gold[envs, gold_idx // n, gold_idx % n] = True
+        else:
+            cells = np.asarray(cells, dtype=np.uint8).reshape(count, n, n)
+            self.pits[envs] = (cells & PIT).astype(bool)
+            self.wumpus[envs] = (cells & WUMPUS).astype(bool)
+            self.gold[envs] = (cells & GOLD).astype(bool)
+            wumpus_idx = self.wumpus[envs].reshape(count, -1).argmax(axis=1)
+        self.wumpus_pos[envs, 0] = wumpus_idx // n
+        self.wumpus_pos[envs, 1] = wumpus_idx % n
+
+        self.breeze[envs] = neighbour_field(self.pits[envs])
+        self.stench[envs] = neighbour_field(self.wumpus[envs])
+
+        self.visited[envs] = False
+        self.visited[envs, 0, 0] = True
+        self.agent_x[envs] = 0
+        self.agent_y[envs] = 0
+        self.agent_dir[envs] = DIRECTION_IDS['right']
+        self.has_gold[envs] = False
+        self.has_arrow[envs] = True
+        self.wumpus_alive[envs] = True
+        self.steps[envs] = 0
+        self.percepts[envs] = self._observe(envs)
+        return self.percepts
+
+    def _observe(self, envs):
+        x, y = self.agent_x[envs], self.agent_y[envs]
+        bits = np.zeros(len(envs), dtype=np.uint8)
+        bits |= np.where(self.stench[envs, x, y], STENCH, 0).astype(np.uint8)
+        bits |= np.where(self.breeze[envs, x, y], BREEZE, 0).astype(np.uint8)
+        bits |= np.where(self.gold[envs, x, y], GLITTER, 0).astype(np.uint8)
+        return bits
+
+    def step(self, actions):
+        """Apply one action per world.
+
+        Returns (percepts, rewards, dones, status) arrays of length num_envs.
+        When auto_reset is on, percepts of finished worlds describe the fresh
+        world that replaced them, while rewards and status describe the
+        episode that just ended.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        envs = self._env_ids
+        n = self.grid_size
+        x, y, d = self.agent_x, self.agent_y, self.agent_dir
+
+        # Forward moves and bumps
+        forward = actions == FORWARD
+        nx = x + DX[d]
+        ny = y + DY[d]
+        in_bounds = (nx >= 0) & (nx < n) & (ny >= 0) & (ny < n)
+        moved = forward & in_bounds
+        bumped = forward & ~in_bounds
+        np.copyto(x, nx, where=moved)
+        np.copyto(y, ny, where=moved)
+        new_cell = moved & ~self.visited[envs, x, y]
+        self.visited[envs, x, y] |= moved
+
+        # Turns
+        d += (actions == TURN_RIGHT).astype(np.int64)
+        d -= (actions == TURN_LEFT).astype(np.int64)
+        d %= 4
+
+        # Grab
+        grabbed = (actions == GRAB) & self.gold[envs, x, y]
+        self.gold[envs, x, y] &= ~grabbed
+        self.has_gold |= grabbed
+
+        # Shoot: the arrow flies along the facing row/column
+        shot = (actions == SHOOT) & self.has_arrow
+        self.has_arrow &= ~shot
+        wx, wy = self.wumpus_pos[:, 0], self.wumpus_pos[:, 1]
+        in_line = np.select(
+            [d == 0, d == 1, d == 2, d == 3],
+            [(wy == y) & (wx > x), (wx == x) & (wy > y),
+             (wy == y) & (wx < x), (wx == x) & (wy < y)], default=False)
+        killed = shot & self.wumpus_alive & in_line
+        if killed.any():
+            self.wumpus_alive &= ~killed
+            self.wumpus[killed] = False
+            self.stench[killed] = False
+
+        rewards = np.full(self.num_envs, -1.0)
+        rewards[forward] = np.where(moved[forward], -0.2, -2.0)
+        rewards[(actions == TURN_LEFT) | (actions == TURN_RIGHT)] = -0.1
+        is_grab = actions == GRAB
+        rewards[is_grab] = np.where(grabbed[is_grab], 300.0, -5.0)
+        is_shoot = actions == SHOOT
+        rewards[is_shoot] = np.where(killed[is_shoot], 100.0, -20.0)
+        rewards[new_cell] += 5.0
+
+        self.steps += 1
+        lose = self.pits[envs, x, y] | (self.wumpus[envs, x, y] & self.wumpus_alive)
+        win = ~lose & self.has_gold & (x == 0) & (y == 0)
+        timeout = ~lose & ~win & (self.steps >= self.max_steps)
+        rewards[win] += 1000.0
+
+        status = np.full(self.num_envs, CONTINUE, dtype=np.int8)
+        status[win] = WIN
+        status[lose] = LOSE
+        status[timeout] = TIMEOUT
+        dones = status != CONTINUE
+
+        percepts = self._observe(envs)
+        percepts |= np.where(bumped, BUMP, 0).astype(np.uint8)
+        percepts |= np.where(killed, SCREAM, 0).astype(np.uint8)
+        self.percepts = percepts
+
+        if self.auto_reset and dones.any():
+            self.reset(dones)
+        return self.percepts, rewards, dones, status
+
+    def step_named(self, actions):
+        """Same as step, with action names instead of ids"""
+        return self.step([ACTION_IDS[a] for a in actions])
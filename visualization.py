@@ -26,6 +26,14 @@ LAVENDER = (230, 230, 250)
 GRAY = (200, 200, 200)
 
 class GameVisualization:
+    """Pygame view of a WumpusWorld with dirty-region rendering.
+
+    The frame is composed on an off-screen scene surface: the static grid is
+    drawn once, each cell is a cached tile that is only re-blitted when that
+    cell's state changes, and status text is re-rendered only when it
+    changes. Only the regions that changed are pushed to the display.
+    """
+
     def __init__(self, world):
         pygame.init()  
         pygame.display.init() 
@@ -55,122 +63,144 @@ class GameVisualization:
         self.last_update = 0
         self.update_interval = 0.5  # seconds
 
+        # Render caches
+        self.scene = pygame.Surface((self.screen_width, self.screen_height))
+        self.scene.fill(WHITE)
+        self._tiles = {}  # cell state -> rendered tile
+        self._texts = {}  # (font, text, color) -> rendered text
+        self._cell_state = {}  # (x, y) -> state the scene currently shows
+        self._status_state = None
+        self._overlay_rects = []  # Screen areas covered by the last overlays
+        self._dirty = []
+        self._full_redraw = True
+
+    def render_text(self, font, text, color):
+        """font.render, memoised on (font, text, color)"""
+        key = (id(font), text, color)
+        surface = self._texts.get(key)
+        if surface is None:
+            if len(self._texts) > 512:
+                self._texts.clear()
+            surface = self._texts[key] = font.render(text, True, color)
+        return surface
+
     def draw_metrics(self, metrics):
-        """Display real-time agent metrics"""
+        """Display real-time agent metrics as an overlay on the next frame"""
         if not self.font:  # Ensure font exists
             return
         y_offset = 10
         for metric, value in metrics.items():
-            text = f"{metric}: {value}"
-            text_surface = self.font.render(text, True, (0, 0, 0))
-            self.screen.blit(text_surface, (10, y_offset))
+            text_surface = self.render_text(self.font, f"{metric}: {value}", BLACK)
+            rect = self.screen.blit(text_surface, (10, y_offset))
+            self._overlay_rects.append(rect)
+            self._dirty.append(rect)
             y_offset += 20
-    
-    
 
-    def draw_world(self):
-        """Render the Wumpus world"""
-        self.screen.fill(WHITE)
-        
-        # Draw grid cells
+    def draw_world(self, present=True):
+        """Bring the screen up to date with the world.
+
+        With present=False the changes are only queued, so overlays such as
+        draw_metrics can be added before a single present().
+        """
+        # Uncover whatever the previous frame's overlays were drawn over
+        for rect in self._overlay_rects:
+            self.screen.blit(self.scene, rect, rect)
+            self._dirty.append(rect)
+        self._overlay_rects = []
+
         for x in range(self.grid_size):
             for y in range(self.grid_size):
-                rect = pygame.Rect(
-                    MARGIN + x * CELL_SIZE,
-                    MARGIN + y * CELL_SIZE,
-                    CELL_SIZE,
-                    CELL_SIZE
-                )
-                
-                # Cell background color
-                if (x, y) in self.world.visited:
-                    color = LAVENDER
-                elif (x, y) in self.world.safe_cells:
-                    color = LIGHT_GREEN
-                else:
-                    color = WHITE
-                
-                pygame.draw.rect(self.screen, color, rect)
-                pygame.draw.rect(self.screen, GRAY, rect, 1)
-                
-                # Draw cell contents
-                self.draw_cell_contents(x, y)
-        
-        # Draw agent
-        self.draw_agent()
-        
-        # Draw status panel
+                state = self._cell_key(x, y)
+                if self._cell_state.get((x, y)) != state:
+                    self._cell_state[(x, y)] = state
+                    self._blit_scene(self._tile(state),
+                                     (MARGIN + x * CELL_SIZE, MARGIN + y * CELL_SIZE))
+
         self.draw_status()
-        
-        pygame.display.flip()
+        if self._full_redraw:
+            self.screen.blit(self.scene, (0, 0))
+        if present:
+            self.present()
 
-    def draw_cell_contents(self, x, y):
-        """Draw pits, Wumpus, gold, and indicators"""
-        center_x = MARGIN + x * CELL_SIZE + CELL_SIZE // 2
-        center_y = MARGIN + y * CELL_SIZE + CELL_SIZE // 2
-        cell = self.world.world[x][y]
-        
-        # Draw pit
-        if cell["pit"]:
-            pygame.draw.circle(self.screen, BLACK, (center_x, center_y), 20)
-        
-        # Draw Wumpus
-        if cell.get("wumpus", False) and self.world.wumpus_alive:
-            pygame.draw.polygon(self.screen, RED, [
+    def present(self):
+        """Push the regions changed since the last present to the display"""
+        if self._full_redraw:
+            pygame.display.flip()
+            self._full_redraw = False
+        elif self._dirty:
+            pygame.display.update(self._dirty)
+        self._dirty = []
+
+    def _blit_scene(self, surface, pos):
+        """Draw onto the scene and copy the changed area to the screen"""
+        rect = self.scene.blit(surface, pos)
+        self.screen.blit(self.scene, rect, rect)
+        self._dirty.append(rect)
+
+    def _cell_key(self, x, y):
+        """Everything that affects how a cell looks"""
+        world = self.world
+        pos = (x, y)
+        cell = world.world[x][y]
+        if pos in world.visited:
+            color = LAVENDER
+        elif pos in world.safe_cells:
+            color = LIGHT_GREEN
+        else:
+            color = WHITE
+        return (color,
+                bool(cell["pit"]),
+                bool(cell.get("wumpus", False) and world.wumpus_alive),
+                bool(cell["gold"]),
+                pos in world.stenchy_cells,
+                pos in world.breezy_cells,
+                world.agent_dir if world.agent_pos == pos else None)
+
+    def _tile(self, state):
+        tile = self._tiles.get(state)
+        if tile is None:
+            tile = self._tiles[state] = self._render_tile(state)
+        return tile
+
+    def _render_tile(self, state):
+        """Draw one cell: background, pits, Wumpus, gold, indicators and agent"""
+        color, pit, wumpus, gold, stench, breeze, agent_dir = state
+        tile = pygame.Surface((CELL_SIZE, CELL_SIZE))
+        tile.fill(color)
+        pygame.draw.rect(tile, GRAY, tile.get_rect(), 1)
+        center_x = center_y = CELL_SIZE // 2
+
+        if pit:
+            pygame.draw.circle(tile, BLACK, (center_x, center_y), 20)
+        if wumpus:
+            pygame.draw.polygon(tile, RED, [
                 (center_x, center_y - 20),
                 (center_x + 20, center_y + 20),
                 (center_x - 20, center_y + 20)
             ])
-        
-        # Draw gold
-        if cell["gold"]:
-            pygame.draw.circle(self.screen, GOLD, (center_x, center_y), 15)
-        
-        # Draw stench indicator
-        if (x, y) in self.world.stenchy_cells:
-            stench_rect = pygame.Rect(
-                MARGIN + x * CELL_SIZE + 5,
-                MARGIN + y * CELL_SIZE + 5,
-                10, 10
-            )
-            pygame.draw.rect(self.screen, LIGHT_PINK, stench_rect)
-        
-        # Draw breeze indicator
-        if (x, y) in self.world.breezy_cells:
-            breeze_rect = pygame.Rect(
-                MARGIN + x * CELL_SIZE + CELL_SIZE - 15,
-                MARGIN + y * CELL_SIZE + 5,
-                10, 10
-            )
-            pygame.draw.rect(self.screen, LIGHT_BLUE, breeze_rect)
-
-    def draw_agent(self):
-        """Draw the agent with direction indicator"""
-        x, y = self.world.agent_pos
-        center_x = MARGIN + x * CELL_SIZE + CELL_SIZE // 2
-        center_y = MARGIN + y * CELL_SIZE + CELL_SIZE // 2
-        
-        # Draw agent
-        pygame.draw.circle(self.screen, BLUE, (center_x, center_y), 15)
-        
-        # Draw direction indicator
-        indicator_length = 20
-        if self.world.agent_dir == "up":
-            end_pos = (center_x, center_y - indicator_length)
-        elif self.world.agent_dir == "down":
-            end_pos = (center_x, center_y + indicator_length)
-        elif self.world.agent_dir == "left":
-            end_pos = (center_x - indicator_length, center_y)
-        else:  # right
-            end_pos = (center_x + indicator_length, center_y)
-        
-        pygame.draw.line(self.screen, WHITE, (center_x, center_y), end_pos, 3)
+        if gold:
+            pygame.draw.circle(tile, GOLD, (center_x, center_y), 15)
+        if stench:
+            pygame.draw.rect(tile, LIGHT_PINK, pygame.Rect(5, 5, 10, 10))
+        if breeze:
+            pygame.draw.rect(tile, LIGHT_BLUE, pygame.Rect(CELL_SIZE - 15, 5, 10, 10))
+
+        if agent_dir is not None:
+            pygame.draw.circle(tile, BLUE, (center_x, center_y), 15)
+            indicator_length = 20
+            if agent_dir == "up":
+                end_pos = (center_x, center_y - indicator_length)
+            elif agent_dir == "down":
+                end_pos = (center_x, center_y + indicator_length)
+            elif agent_dir == "left":
+                end_pos = (center_x - indicator_length, center_y)
+            else:  # right
+                end_pos = (center_x + indicator_length, center_y)
+            pygame.draw.line(tile, WHITE, (center_x, center_y), end_pos, 3)
+        return tile
 
     def draw_status(self):
-        """Draw game status information"""
-        status_y = MARGIN + self.grid_size * CELL_SIZE + 10
-        
-        # Agent status
+        """Draw game status information when it has changed"""
         status_text = (
             f"Position: {self.world.agent_pos} | "
             f"Direction: {self.world.agent_dir} | "
@@ -178,43 +208,40 @@ class GameVisualization:
             f"Arrow: {'Yes' if self.world.has_arrow else 'No'} | "
             f"Wumpus: {'Alive' if self.world.wumpus_alive else 'Dead'}"
         )
-        status_surface = self.font.render(status_text, True, BLACK)
-        self.screen.blit(status_surface, (MARGIN, status_y))
-        
-        # Percepts
-        percepts_y = status_y + 25
         percepts_text = "Percepts: "
-        if self.world.percepts["stench"]:
-            percepts_text += "Stench "
-        if self.world.percepts["breeze"]:
-            percepts_text += "Breeze "
-        if self.world.percepts["glitter"]:
-            percepts_text += "Glitter "
-        if self.world.percepts["bump"]:
-            percepts_text += "Bump "
-        if self.world.percepts["scream"]:
-            percepts_text += "Scream "
-        
-        percepts_surface = self.font.render(percepts_text, True, BLACK)
-        self.screen.blit(percepts_surface, (MARGIN, percepts_y))
-        
-        # Controls info
+        for percept in ("stench", "breeze", "glitter", "bump", "scream"):
+            if self.world.percepts[percept]:
+                percepts_text += percept.capitalize() + " "
+        game_status = self.world.is_game_over()
+        state = (status_text, percepts_text, game_status)
+        if state == self._status_state:
+            return
+        self._status_state = state
+
+        status_y = MARGIN + self.grid_size * CELL_SIZE + 10
+        panel = pygame.Rect(0, status_y, self.screen_width, self.screen_height - status_y)
+        self.scene.fill(WHITE, panel)
+
+        self.scene.blit(self.render_text(self.font, status_text, BLACK), (MARGIN, status_y))
+        percepts_y = status_y + 25
+        self.scene.blit(self.render_text(self.font, percepts_text, BLACK), (MARGIN, percepts_y))
         controls_y = percepts_y +25
         controls_text = (
             "Controls: Arrows to move/turn | SPACE to toggle auto-play | "
             "G to grab gold | S to shoot"
         )
-        controls_surface = self.font.render(controls_text, True, BLACK)
-        self.screen.blit(controls_surface, (MARGIN, controls_y))
-        
+        self.scene.blit(self.render_text(self.font, controls_text, BLACK), (MARGIN, controls_y))
+
         # Game over message
-        game_status = self.world.is_game_over()
         if game_status != "continue":
             message = "You Win!" if game_status == "win" else "Game Over!"
-            message_surface = self.title_font.render(message, True, RED)
+            message_surface = self.render_text(self.title_font, message, RED)
             message_rect = message_surface.get_rect(
                 center=(self.screen_width // 2, self.screen_height - 50))
-            self.screen.blit(message_surface, message_rect)
+            self.scene.blit(message_surface, message_rect)
+
+        self.screen.blit(self.scene, panel, panel)
+        self._dirty.append(panel)
 
     def handle_events(self):
         """Handle keyboard and window events"""
@@ -241,12 +268,16 @@ class GameVisualization:
                         self.world.shoot_arrow()
 
     def auto_play_step(self):
-        """Execute one step of autonomous agent logic"""
+        """Execute one step of autonomous agent logic, at most once per update_interval"""
         current_time = time.time()
         if current_time - self.last_update < self.update_interval:
             return
         
         self.last_update = current_time
+        self.autopilot_step()
+
+    def autopilot_step(self):
+        """One step of the built-in autonomous logic, without any rate limit"""
         game_status = self.world.is_game_over()
         if game_status != "continue":
             return
@@ -302,8 +333,124 @@ class GameVisualization:
                     elif action == "right":
                         self.world.turn_right()
 
-    def run(self):
-        """Main game loop"""
+    def run_simulation(self, simulation, fps=60):
+        """Draw a Simulation live until it finishes or the window is closed.
+
+        The simulation steps on its own thread at its own rate; each frame
+        draws the newest snapshot it has published, so intermediate states
+        are skipped rather than slowing the agent down. SPACE pauses and
+        resumes it, and while paused the arrow/G/S keys act on the world.
+        Returns the game status of the last snapshot drawn.
+        """
+        manual_keys = {
+            K_UP: "move_forward",
+            K_LEFT: "turn_left",
+            K_RIGHT: "turn_right",
+            K_g: "grab_gold",
+            K_s: "shoot_arrow",
+        }
+        live_world = simulation.world
+        shown = None
+        simulation.start()
+        try:
+            while True:
+                for event in pygame.event.get():
+                    if event.type == QUIT or (event.type == KEYDOWN and event.key == K_ESCAPE):
+                        return shown.status if shown else "continue"
+                    if event.type == KEYDOWN:
+                        if event.key == K_SPACE:
+                            simulation.paused = not simulation.paused
+                        elif simulation.paused and event.key in manual_keys:
+                            simulation.submit(getattr(live_world, manual_keys[event.key]))
+
+                snapshot = simulation.latest()
+                if snapshot is not shown:
+                    shown = snapshot
+                    self.world = snapshot
+                    self.draw_world(present=False)
+                    self.draw_metrics({
+                        'Mode': 'PAUSED' if simulation.paused else 'AUTO',
+                        'Step': snapshot.step,
+                        **snapshot.metrics,
+                    })
+                    self.present()
+                elif not simulation.running:
+                    return shown.status
+
+                self.clock.tick(fps)
+        finally:
+            simulation.stop()
+            self.world = live_world
+
+    def replay(self, episode, speed=5.0, start=0, fps=60):
+        """Play back a recorded episode (an episode_trace.TraceEpisode).
+
+        Nothing is simulated: each frame is rebuilt from the trace, so any
+        step can be shown directly. `speed` is in steps per second. SPACE
+        pauses, LEFT/RIGHT step back/forward, UP/DOWN double/halve the speed
+        and HOME/END jump to the first/last step.
+        """
+        live_world = self.world
+        last = len(episode) - 1
+        position = float(max(0, min(start, last)))
+        playing = True
+        shown = None
+        try:
+            while True:
+                elapsed = self.clock.tick(fps) / 1000.0
+                for event in pygame.event.get():
+                    if event.type == QUIT or (event.type == KEYDOWN and event.key == K_ESCAPE):
+                        return
+                    if event.type != KEYDOWN:
+                        continue
+                    if event.key == K_SPACE:
+                        playing = not playing
+                    elif event.key == K_LEFT:
+                        playing = False
+                        position = max(0, int(position) - 1)
+                    elif event.key == K_RIGHT:
+                        playing = False
+                        position = min(last, int(position) + 1)
+                    elif event.key == K_UP:
+                        speed *= 2
+                    elif event.key == K_DOWN:
+                        speed /= 2
+                    elif event.key == K_HOME:
+                        position = 0
+                    elif event.key == K_END:
+                        position = last
+
+                if playing:
+                    position = min(last, position + elapsed * speed)
+                step = int(position)
+                state = (step, speed, playing)
+                if state != shown:
+                    shown = state
+                    self.world = episode.frame(step)
+                    self.draw_world(present=False)
+                    self.draw_metrics({
+                        'Episode': episode.episode,
+                        'Step': f"{step}/{last}",
+                        'Speed': f"{speed:g} steps/s" + ("" if playing else " (paused)"),
+                    })
+                    self.present()
+        finally:
+            self.world = live_world
+
+    def run(self, sim_rate=None):
+        """Main game loop.
+
+        With sim_rate set, auto-play runs on a simulation thread at that many
+        steps per second (0 for unlimited) and the window is drawn
+        independently at 60 FPS.
+        """
+        if sim_rate is not None:
+            from simulation import Simulation
+
+            self.auto_play = True
+            simulation = Simulation(self.world, self.autopilot_step, rate=sim_rate or None)
+            return self.run_simulation(simulation)
+
         while True:
             self.handle_events()
             
@@ -311,7 +458,7 @@ class GameVisualization:
                 self.auto_play_step()
             
             self.draw_world()
-            self.clock.tick(30)
+            self.clock.tick(60)
 
 
     
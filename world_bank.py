@@ -0,0 +1,82 @@
+import argparse
+import os
+
+import numpy as np
+
+from storage import PIT, WUMPUS, GOLD
+
+MAGIC = b"WUMPBANK"
+HEADER = np.dtype([("magic", "S8"), ("version", "<u4"), ("grid_size", "<u4")])
+VERSION = 1
+
+
+def random_cells(rng, grid_size, count=None, pit_prob=0.2):
+    """Random world bitfields drawn from a NumPy Generator.
+
+    Pits appear with pit_prob per cell, and the Wumpus and the gold are each
+    placed uniformly on a cell other than (0, 0). Returns a
+    (grid_size, grid_size) uint8 array, or (count, grid_size, grid_size)
+    when count is given.
+    """
+    n = grid_size
+    batch = 1 if count is None else count
+    cells = np.where(rng.random((batch, n, n)) < pit_prob, PIT, 0).astype(np.uint8)
+    cells[:, 0, 0] = 0
+    envs = np.arange(batch)
+    wumpus_idx = rng.integers(1, n * n, size=batch)
+    gold_idx = rng.integers(1, n * n, size=batch)
+    cells[envs, wumpus_idx // n, wumpus_idx % n] |= WUMPUS
+    cells[envs, gold_idx // n, gold_idx % n] |= GOLD
+    return cells[0] if count is None else cells
+
+
+def generate_bank(path, count, grid_size=4, seed=None, chunk=1 << 16):
+    """Write `count` seeded worlds to a flat binary file, one bitfield per cell"""
+    rng = np.random.default_rng(seed)
+    header = np.array([(MAGIC, VERSION, grid_size)], dtype=HEADER)
+    with open(path, "wb") as f:
+        f.write(header.tobytes())
+        for start in range(0, count, chunk):
+            f.write(random_cells(rng, grid_size, min(chunk, count - start)).tobytes())
+
+
+class WorldBank:
+    """Read-only, memory-mapped view of a file written by generate_bank.
+
+    bank[i] is a (grid_size, grid_size) uint8 view straight into the page
+    cache; nothing is copied until a world built from it is modified.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        header = np.fromfile(path, dtype=HEADER, count=1)
+        if len(header) != 1 or header["magic"][0] != MAGIC:
+            raise ValueError(f"{path} is not a world bank")
+        if header["version"][0] != VERSION:
+            raise ValueError(f"Unsupported world bank version: {header['version'][0]}")
+        self.grid_size = int(header["grid_size"][0])
+        world_bytes = self.grid_size * self.grid_size
+        count = (os.path.getsize(path) - HEADER.itemsize) // world_bytes
+        self.cells = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER.itemsize,
+                               shape=(count, self.grid_size, self.grid_size))
+
+    def __len__(self):
+        return self.cells.shape[0]
+
+    def __getitem__(self, index):
+        return self.cells[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate a bank of Wumpus worlds")
+    parser.add_argument("path")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--grid-size", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    generate_bank(args.path, args.count, args.grid_size, args.seed)
+    print(f"Wrote {args.count} {args.grid_size}x{args.grid_size} worlds to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,108 @@
-import random
 from collections import deque
 
+import numpy as np
+
+from logic import ClauseStore
+from planner import frontier_search
+from storage import (BitfieldGrid, SparseWorldKnowledge, WorldKnowledgeArray, STORAGE_ENGINES,
+                     PIT, WUMPUS, GOLD, neighbour_field)
+from world_bank import random_cells
+
 class WumpusWorld:
-    def __init__(self, grid_size=4):
+    def __init__(self, grid_size=4, storage="dict", seed=None, cells=None):
+        if storage not in STORAGE_ENGINES:
+            raise ValueError(f"Unknown storage engine: {storage}")
         self.grid_size = grid_size
+        self.storage = storage
+        self.rng = np.random.default_rng(seed)
         self.agent_pos = (0, 0)  # Starting position (top-left)
         self.agent_dir = "right"  # Initial direction
         self.has_gold = False
         self.has_arrow = True
         self.wumpus_alive = True
-        self.world = self.generate_world()
+        self.world = self.generate_world() if cells is None else self._world_from_cells(cells)
+        self._build_percept_fields()
         self.visited = set([(0, 0)])
         self.safe_cells = set([(0, 0)])
+        self.frontier = set()  # Safe cells not visited yet
         self.breezy_cells = set()
         self.stenchy_cells = set()
         self.knowledge_base = {}
         self.initialize_knowledge_base()
+        self.clauses = ClauseStore()
+        self._wumpus_candidates = set()  # Cells named by some stench clause
+        self._pit_free = set()
+        self.percepts = self.get_percepts()
+        self.update_knowledge_base()
+
+    def reset(self, seed=None, cells=None):
+        """Start a new episode in this object, reusing its containers.
+
+        reset(seed) gives the same world as WumpusWorld(grid_size, storage, seed);
+        without a seed the next world comes from the current random stream.
+        cells (e.g. a WorldBank entry) sets the layout instead.
+        """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        if cells is None:
+            cells = random_cells(self.rng, self.grid_size)
+        self.agent_pos = (0, 0)
+        self.agent_dir = "right"
+        self.has_gold = False
+        self.has_arrow = True
+        self.wumpus_alive = True
+        self._load_cells(cells)
+        self._build_percept_fields()
+        self.visited.clear()
+        self.visited.add((0, 0))
+        self.safe_cells.clear()
+        self.safe_cells.add((0, 0))
+        self.frontier.clear()
+        self.breezy_cells.clear()
+        self.stenchy_cells.clear()
+        self._reset_knowledge_base()
+        self.clauses.clear()
+        self._wumpus_candidates.clear()
+        self._pit_free.clear()
         self.percepts = self.get_percepts()
+        self.update_knowledge_base()
+        return self
+
+    def _load_cells(self, cells):
+        """Overwrite the world contents in place with a bitfield layout"""
+        if isinstance(self.world, BitfieldGrid):
+            self.world.cells = cells  # Zero-copy, as in from_bank
+            return
+        for x, column in enumerate(self.world):
+            for y, cell in enumerate(column):
+                bits = int(cells[x, y])
+                cell["pit"] = bool(bits & PIT)
+                cell["wumpus"] = bool(bits & WUMPUS)
+                cell["gold"] = bool(bits & GOLD)
+
+    def _reset_knowledge_base(self):
+        if self.storage == "array":
+            self.knowledge_base.flags.fill(0)
+        elif self.storage == "sparse":
+            self.knowledge_base.clear()
+        else:
+            for facts in self.knowledge_base.values():
+                facts["pit"] = "unknown"
+                facts["wumpus"] = "unknown"
+                facts["safe"] = False
+        self.knowledge_base[(0, 0)]["safe"] = True
 
     def initialize_knowledge_base(self):
         """Initialize knowledge about each cell"""
+        if self.storage == "array":
+            self.knowledge_base = WorldKnowledgeArray(self.grid_size)
+            self.knowledge_base[(0, 0)]["safe"] = True
+            return
+        if self.storage == "sparse":
+            # Only cells with evidence are stored (the start cell included)
+            self.knowledge_base = SparseWorldKnowledge(self.grid_size)
+            self.knowledge_base[(0, 0)]["safe"] = True
+            return
         for i in range(self.grid_size):
             for j in range(self.grid_size):
                 self.knowledge_base[(i, j)] = {
@@ -30,64 +113,74 @@ class WumpusWorld:
         # Starting cell is safe
         self.knowledge_base[(0, 0)]["safe"] = True
 
+    @classmethod
+    def from_bank(cls, bank, index, storage="array"):
+        """World number `index` of a WorldBank; zero-copy with array storage"""
+        return cls(grid_size=bank.grid_size, storage=storage, cells=bank[index])
+
     def generate_world(self):
         """Generate random world with pits, Wumpus, and gold"""
-        world = [[{"pit": False, "wumpus": False, "gold": False} 
-                for _ in range(self.grid_size)] for _ in range(self.grid_size)]
-        
-        # Place pits (20% chance per cell, except start)
-        for i in range(self.grid_size):
-            for j in range(self.grid_size):
-                if (i, j) != (0, 0) and random.random() < 0.2:
-                    world[i][j]["pit"] = True
-        
-        # Place Wumpus (random, not at start)
-        wumpus_pos = (random.randint(0, self.grid_size-1), 
-                     random.randint(0, self.grid_size-1))
-        while wumpus_pos == (0, 0):
-            wumpus_pos = (random.randint(0, self.grid_size-1), 
-                         random.randint(0, self.grid_size-1))
-        world[wumpus_pos[0]][wumpus_pos[1]]["wumpus"] = True
-        
-        # Place gold (random, not at start)
-        gold_pos = (random.randint(0, self.grid_size-1), 
-                   random.randint(0, self.grid_size-1))
-        while gold_pos == (0, 0):
-            gold_pos = (random.randint(0, self.grid_size-1), 
-                       random.randint(0, self.grid_size-1))
-        world[gold_pos[0]][gold_pos[1]]["gold"] = True
-        
-        return world
+        # 20% pits except at the start; Wumpus and gold anywhere but the start
+        return self._world_from_cells(random_cells(self.rng, self.grid_size))
+
+    def _world_from_cells(self, cells):
+        grid = BitfieldGrid(cells)
+        if self.storage != "dict":
+            return grid
+        return grid.to_dicts()
+
+    def layout(self):
+        """Current cell contents as a (grid_size, grid_size) uint8 bitfield of
+        PIT | WUMPUS | GOLD, the format BitfieldGrid and WorldBank use"""
+        if isinstance(self.world, BitfieldGrid):
+            return np.array(self.world.cells, dtype=np.uint8)
+        cells = np.zeros((self.grid_size, self.grid_size), dtype=np.uint8)
+        for key, bit in (("pit", PIT), ("wumpus", WUMPUS), ("gold", GOLD)):
+            cells[self._content_mask(key)] |= bit
+        return cells
+
+    def _content_mask(self, key):
+        """Boolean (grid_size, grid_size) mask of one kind of cell content"""
+        if isinstance(self.world, BitfieldGrid):
+            return self.world.mask({"pit": PIT, "wumpus": WUMPUS, "gold": GOLD}[key])
+        return np.array([[cell.get(key, False) for cell in column] for column in self.world],
+                        dtype=bool)
+
+    def _build_percept_fields(self):
+        """Precompute breeze/stench for every cell from the pit/wumpus masks.
+        Call again after editing self.world by hand."""
+        self.breeze_field = neighbour_field(self._content_mask("pit"))
+        self._build_stench_field()
+
+    def _build_stench_field(self):
+        if self.wumpus_alive:
+            self.stench_field = neighbour_field(self._content_mask("wumpus"))
+        else:
+            self.stench_field = np.zeros((self.grid_size, self.grid_size), dtype=bool)
 
     def get_percepts(self):
         """Get current percepts based on agent position"""
         x, y = self.agent_pos
-        cell = self.world[x][y]
         percepts = {
-            "stench": False,
-            "breeze": False,
-            "glitter": False,
+            "stench": bool(self.stench_field[x, y]),
+            "breeze": bool(self.breeze_field[x, y]),
+            "glitter": self.world[x][y]["gold"],
             "bump": False,
             "scream": False
         }
-        
-        # Check adjacent cells for Wumpus (stench) and pits (breeze)
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.grid_size and 0 <= ny < self.grid_size:
-                if self.world[nx][ny].get("wumpus", False) and self.wumpus_alive:
-                    percepts["stench"] = True
-                    self.stenchy_cells.add((x, y))
-                if self.world[nx][ny]["pit"]:
-                    percepts["breeze"] = True
-                    self.breezy_cells.add((x, y))
-        
-        # Current cell percepts
-        if cell["gold"]:
-            percepts["glitter"] = True
-        
+        if percepts["stench"]:
+            self.stenchy_cells.add((x, y))
+        if percepts["breeze"]:
+            self.breezy_cells.add((x, y))
         return percepts
 
+    def _sense(self, bump=False, scream=False):
+        """Percepts after an action: bump and scream last a single step, like
+        every percept of VectorWumpusWorld.step"""
+        self.percepts = self.get_percepts()
+        self.percepts["bump"] = bump
+        self.percepts["scream"] = scream
+
     def move_forward(self):
         """Move agent forward based on current direction"""
         x, y = self.agent_pos
@@ -106,11 +199,12 @@ class WumpusWorld:
         if 0 <= new_x < self.grid_size and 0 <= new_y < self.grid_size:
             self.agent_pos = (new_x, new_y)
             self.visited.add((new_x, new_y))
+            self.frontier.discard((new_x, new_y))
+            self._sense()
             self.update_knowledge_base()
-            self.percepts = self.get_percepts()
             return True
         else:
-            self.percepts["bump"] = True
+            self._sense(bump=True)
             return False
 
     def turn_left(self):
@@ -118,18 +212,19 @@ class WumpusWorld:
         dirs = ["up", "left", "down", "right"]
         idx = dirs.index(self.agent_dir)
         self.agent_dir = dirs[(idx + 1) % 4]
-        self.percepts = self.get_percepts()
+        self._sense()
 
     def turn_right(self):
         """Turn agent 90 degrees right"""
         dirs = ["up", "right", "down", "left"]
         idx = dirs.index(self.agent_dir)
         self.agent_dir = dirs[(idx + 1) % 4]
-        self.percepts = self.get_percepts()
+        self._sense()
 
     def shoot_arrow(self):
         """Shoot arrow in current direction"""
         if not self.has_arrow:
+            self._sense()
             return False
         
         self.has_arrow = False
@@ -164,14 +259,20 @@ class WumpusWorld:
         
         if wumpus_killed:
             self.wumpus_alive = False
-            self.percepts["scream"] = True
+            self._build_stench_field()
+            self._sense(scream=True)
             # Update KB - all cells with stench are now safe
             for cell in self.stenchy_cells:
                 self.knowledge_base[cell]["wumpus"] = False
                 self.knowledge_base[cell]["safe"] = True
-                self.safe_cells.add(cell)
+                self._mark_safe(cell)
+            # With no live Wumpus, every pit-free cell is safe
+            for cell in self._pit_free:
+                self.knowledge_base[cell]["safe"] = True
+                self._mark_safe(cell)
             return True
         
+        self._sense()
         return False
 
     def grab_gold(self):
@@ -180,91 +281,102 @@ class WumpusWorld:
         if self.world[x][y]["gold"]:
             self.has_gold = True
             self.world[x][y]["gold"] = False
-            self.percepts["glitter"] = False
+            self._sense()
             return True
+        self._sense()
         return False
 
+    def climb(self):
+        """Climbing changes nothing (reaching (0, 0) with the gold is already a
+        win), but it takes a step, so percepts are refreshed"""
+        self._sense()
+
+    def _pit_var(self, cell):
+        return 2 * (cell[0] * self.grid_size + cell[1]) + 1
+
+    def _wumpus_var(self, cell):
+        return 2 * (cell[0] * self.grid_size + cell[1]) + 2
+
     def update_knowledge_base(self):
-        """Update knowledge based on current percepts"""
+        """Add the current percepts as clauses and record what they entail.
+
+        Unit propagation revisits older clauses that the new facts touch, so a
+        breeze seen earlier can pin down a pit once its other neighbours are
+        cleared from elsewhere.
+        """
         x, y = self.agent_pos
-        
+        neighbors = [(x + dx, y + dy) for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+                     if 0 <= x + dx < self.grid_size and 0 <= y + dy < self.grid_size]
+        add = self.clauses.add_clause
+        derived = []
+
         # Current cell is safe
+        derived += add([-self._pit_var((x, y))])
+        if self.wumpus_alive:
+            derived += add([-self._wumpus_var((x, y))])
+        else:
+            self.knowledge_base[(x, y)]["wumpus"] = False
         self.knowledge_base[(x, y)]["safe"] = True
-        self.knowledge_base[(x, y)]["pit"] = False
-        self.knowledge_base[(x, y)]["wumpus"] = False
-        self.safe_cells.add((x, y))
-        
-        # If no breeze, adjacent cells are pit-free
-        if not self.percepts["breeze"]:
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.grid_size and 0 <= ny < self.grid_size:
-                    self.knowledge_base[(nx, ny)]["pit"] = False
-                    if self.knowledge_base[(nx, ny)]["wumpus"] == False:
-                        self.knowledge_base[(nx, ny)]["safe"] = True
-                        self.safe_cells.add((nx, ny))
-        
-        # If no stench, adjacent cells are wumpus-free
-        if not self.percepts["stench"]:
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.grid_size and 0 <= ny < self.grid_size:
-                    self.knowledge_base[(nx, ny)]["wumpus"] = False
-                    if self.knowledge_base[(nx, ny)]["pit"] == False:
-                        self.knowledge_base[(nx, ny)]["safe"] = True
-                        self.safe_cells.add((nx, ny))
-        
-        # If breeze, at least one adjacent cell has a pit
+        self._mark_safe((x, y))
+
+        # Breeze: some neighbour has a pit; no breeze: none does
         if self.percepts["breeze"]:
-            adjacent_unknown = []
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.grid_size and 0 <= ny < self.grid_size:
-                    if self.knowledge_base[(nx, ny)]["pit"] == "unknown":
-                        adjacent_unknown.append((nx, ny))
-            
-            # If only one unknown adjacent cell, it must have a pit
-            if len(adjacent_unknown) == 1:
-                pit_cell = adjacent_unknown[0]
-                self.knowledge_base[pit_cell]["pit"] = True
-                self.knowledge_base[pit_cell]["safe"] = False
-        
-        # If stench, at least one adjacent cell has a wumpus
-        if self.percepts["stench"] and self.wumpus_alive:
-            adjacent_unknown = []
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.grid_size and 0 <= ny < self.grid_size:
-                    if self.knowledge_base[(nx, ny)]["wumpus"] == "unknown":
-                        adjacent_unknown.append((nx, ny))
-            
-            # If only one unknown adjacent cell, it must have a wumpus
-            if len(adjacent_unknown) == 1:
-                wumpus_cell = adjacent_unknown[0]
-                self.knowledge_base[wumpus_cell]["wumpus"] = True
-                self.knowledge_base[wumpus_cell]["safe"] = False
+            derived += add([self._pit_var(cell) for cell in neighbors])
+        else:
+            for cell in neighbors:
+                derived += add([-self._pit_var(cell)])
+
+        # Stench: some neighbour has the Wumpus, and there is only one Wumpus
+        if self.wumpus_alive:
+            if self.percepts["stench"]:
+                for cell in neighbors:
+                    if cell in self._wumpus_candidates:
+                        continue
+                    for other in self._wumpus_candidates:
+                        derived += add([-self._wumpus_var(cell), -self._wumpus_var(other)])
+                    self._wumpus_candidates.add(cell)
+                derived += add([self._wumpus_var(cell) for cell in neighbors])
+            else:
+                for cell in neighbors:
+                    derived += add([-self._wumpus_var(cell)])
+
+        for lit in derived:
+            self._record(lit)
+
+    def _record(self, lit):
+        """Copy one derived literal into the knowledge base dict"""
+        idx, kind = divmod(abs(lit) - 1, 2)
+        cell = divmod(idx, self.grid_size)
+        facts = self.knowledge_base[cell]
+        facts["wumpus" if kind else "pit"] = lit > 0
+        if lit > 0:
+            facts["safe"] = False
+            return
+        if not kind:
+            self._pit_free.add(cell)
+        if facts["pit"] is False and (facts["wumpus"] is False or not self.wumpus_alive):
+            facts["safe"] = True
+            self._mark_safe(cell)
+
+    def _mark_safe(self, cell):
+        self.safe_cells.add(cell)
+        if cell not in self.visited:
+            self.frontier.add(cell)
 
     def get_safe_move(self):
-        """Find the next safe move using BFS"""
-        x, y = self.agent_pos
-        possible_moves = []
-        
-        # Check adjacent safe, unvisited cells first
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.grid_size and 0 <= ny < self.grid_size:
-                if (nx, ny) in self.safe_cells and (nx, ny) not in self.visited:
-                    possible_moves.append((nx, ny))
-        
-        if not possible_moves:
-            # No adjacent safe moves, find nearest safe unvisited cell
-            for safe_cell in self.safe_cells:
-                if safe_cell not in self.visited:
-                    path = self.find_path((x, y), safe_cell)
-                    if path:
-                        return path[1] if len(path) > 1 else path[0]
-        
-        return possible_moves[0] if possible_moves else None
+        """Find the next safe move toward the nearest safe unvisited cell"""
+        if not self.frontier:
+            return None
+
+        # One BFS over safe cells reaches every frontier cell, instead of one per cell
+        n = self.grid_size
+        safe_cells = self.safe_cells
+        reachable = frontier_search(self.agent_pos, self.frontier, n,
+                                    passable=lambda idx: divmod(idx, n) in safe_cells)
+        if not reachable:
+            return None
+        distance, _, first_step = min(reachable.values())
+        return first_step
 
     def find_path(self, start, goal):
         """BFS pathfinding avoiding unsafe cells"""